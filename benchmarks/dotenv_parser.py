@@ -0,0 +1,153 @@
+"""Benchmark the single-pass .env parser against the reference parser
+
+Checks first that parse_stream_compiled gives exactly the bindings of
+parse_stream (keys, values, original text, line numbers and errors) on a corpus
+of edge cases and on random input, and that compiled interpolation resolves to
+the same values, then times both on a large tenant roster:
+
+    python benchmarks/dotenv_parser.py [--tenants 2000] [--fuzz 20000]
+"""
+import argparse
+import io
+import os
+import random
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from dotenv.main import resolve_variables, resolve_variables_compiled  # noqa: E402
+from dotenv.parser import parse_stream, parse_stream_compiled  # noqa: E402
+
+EDGE_CASES = [
+    "",
+    "\n\n",
+    "a=b",
+    "a=b\n",
+    "a = b\r\nc=d\re=f",
+    "export a=b",
+    "export  a = 'b' # comment",
+    "export=1",
+    "export =1",
+    "export \n",
+    "exported=1",
+    "a",
+    "a # no value",
+    "a=",
+    "a=\n",
+    "a=    ",
+    "# comment\n#another",
+    "   # indented comment",
+    "a=b # comment",
+    "a=b# not a comment",
+    "a=b\t#\ttab comment",
+    "a=  spaced value  ",
+    "'quoted key'=1",
+    "'bad key=1",
+    "''=1",
+    "=no key",
+    "a='single'",
+    'a="double"',
+    "a='it\\'s'",
+    'a="say \\"hi\\""',
+    'a="tab\\there\\nnewline\\\\slash"',
+    "a='no \\n escape'",
+    "a='multi\nline'\nb=2",
+    'a="multi\r\nline"\r\nb=2',
+    "a='unterminated\nb=2",
+    'a="unterminated\nb=2',
+    "a='p\\'#'r",
+    "a='x' trailing",
+    "a='x' # fine",
+    "a= 'x",
+    "a=\"\"",
+    "a=''",
+    "a=${B}",
+    "a=${B:-default}${C}",
+    "a=$B not a variable",
+    "a=b\x0b\x0cc",
+    "a=\x85b",
+    "é=café",
+    "a=1\r\n\r\nb=2\r",
+    "bad line here\nc=3",
+    "a=b c d # e",
+    "a=b\\\nc",
+]
+
+ROSTER_ENTRY = (
+    "{name}__NOTION_API_KEY=secret_{index:040d}\n"
+    "{name}__NOTION_DATABASE_ID=\"{index:032x}\"\n"
+    "{name}__TIMEZONE='Europe/Berlin' # local time\n"
+    "export {name}__SCHEDULE=default\n"
+    "{name}__LABEL=${{{name}__TIMEZONE}}-{index}\n"
+    "\n"
+)
+
+FUZZ_ALPHABET = [
+    "a", "B", "_", "=", " ", "\t", "\n", "\r", "\r\n", "#", "'", '"', "\\",
+    "export ", "${", "}", ":-", "\x0b", "\x85", "é",
+]
+
+
+def bindings(parse, text):
+    return list(parse(io.StringIO(text)))
+
+
+def values(parse, text):
+    return [(b.key, b.value) for b in bindings(parse, text) if b.key is not None]
+
+
+def check(text):
+    """Fail unless both parsers (and both resolvers) agree on `text`"""
+    expected = bindings(parse_stream, text)
+    actual = bindings(parse_stream_compiled, text)
+    if actual != expected:
+        raise SystemExit(f"Parsers disagree on {text!r}:\n  {expected}\n  {actual}")
+    for override in (True, False):
+        expected = dict(resolve_variables(values(parse_stream, text), override=override))
+        actual = dict(resolve_variables_compiled(values(parse_stream_compiled, text), override=override))
+        if actual != expected:
+            raise SystemExit(f"Resolvers disagree on {text!r} (override={override})")
+
+
+def roster(tenants):
+    return "".join(ROSTER_ENTRY.format(name=f"T{index}", index=index) for index in range(tenants))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tenants", type=int, default=2000, help="tenants in the timed roster")
+    parser.add_argument("--fuzz", type=int, default=20000, help="random documents to compare")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.environ.setdefault("B", "from the environment")
+    for text in EDGE_CASES:
+        check(text)
+    check("\n".join(EDGE_CASES))
+    rng = random.Random(args.seed)
+    for _ in range(args.fuzz):
+        check("".join(rng.choice(FUZZ_ALPHABET) for _ in range(rng.randint(0, 24))))
+    text = roster(args.tenants)
+    check(text)
+    print(f"Identical output on {len(EDGE_CASES)} edge cases, {args.fuzz} random documents "
+          f"and a {args.tenants}-tenant roster")
+
+    def reference():
+        resolve_variables(values(parse_stream, text), override=True)
+
+    def compiled():
+        resolve_variables_compiled(values(parse_stream_compiled, text), override=True)
+
+    print(f"{'parser':<12}{'seconds':>10}")
+    timings = {}
+    for name, function in (("reference", reference), ("compiled", compiled)):
+        timings[name] = min(timeit.repeat(function, number=1, repeat=5))
+        print(f"{name:<12}{timings[name]:>10.4f}")
+    print(f"speedup     {timings['reference'] / timings['compiled']:>10.1f}x "
+          f"({len(text.splitlines())} lines)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""Benchmark h11's ReceiveBuffer on header-heavy and body-heavy responses
+
+Parses the same responses with h11, once with the current ReceiveBuffer and once
+with the previous bytearray-based one (copied below), checks both produce the
+same events, and reports the parse time of each. Bodies parse about 2x faster
+(1.2x when chunked), as they are no longer copied. Headers parse at 0.9-1.0x
+of the bytearray buffer: lines still get joined into one piece, and keeping
+track of the pieces costs a little on every read:
+
+    python benchmarks/h11_receivebuffer.py [--repeat 9]
+"""
+import argparse
+import os
+import re
+import sys
+import timeit
+from typing import List, Optional, Union
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import h11  # noqa: E402
+from h11 import _connection  # noqa: E402
+from h11._receivebuffer import ReceiveBuffer  # noqa: E402
+
+blank_line_regex = re.compile(b"\n\r?\n", re.MULTILINE)
+
+
+class BytearrayReceiveBuffer:
+    """The ReceiveBuffer h11 0.16.0 ships: copies every extraction out of a bytearray"""
+
+    def __init__(self) -> None:
+        self._data = bytearray()
+        self._next_line_search = 0
+        self._multiple_lines_search = 0
+
+    def __iadd__(self, byteslike: Union[bytes, bytearray]) -> "BytearrayReceiveBuffer":
+        self._data += byteslike
+        return self
+
+    def __bool__(self) -> bool:
+        return bool(len(self))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __bytes__(self) -> bytes:
+        return bytes(self._data)
+
+    def _extract(self, count: int) -> bytearray:
+        out = self._data[:count]
+        del self._data[:count]
+        self._next_line_search = 0
+        self._multiple_lines_search = 0
+        return out
+
+    def maybe_extract_at_most(self, count: int) -> Optional[bytearray]:
+        out = self._data[:count]
+        if not out:
+            return None
+        return self._extract(count)
+
+    def maybe_extract_next_line(self) -> Optional[bytearray]:
+        search_start_index = max(0, self._next_line_search - 1)
+        partial_idx = self._data.find(b"\r\n", search_start_index)
+        if partial_idx == -1:
+            self._next_line_search = len(self._data)
+            return None
+        return self._extract(partial_idx + 2)
+
+    def maybe_extract_lines(self) -> Optional[List[bytearray]]:
+        if self._data[:1] == b"\n":
+            self._extract(1)
+            return []
+        if self._data[:2] == b"\r\n":
+            self._extract(2)
+            return []
+        match = blank_line_regex.search(self._data, self._multiple_lines_search)
+        if match is None:
+            self._multiple_lines_search = max(0, len(self._data) - 2)
+            return None
+        out = self._extract(match.span(0)[-1])
+        lines = out.split(b"\n")
+        for line in lines:
+            if line.endswith(b"\r"):
+                del line[-1]
+        del lines[-2:]
+        return lines
+
+    def is_next_line_obviously_invalid_request_line(self) -> bool:
+        try:
+            return self._data[0] < 0x21
+        except IndexError:
+            return False
+
+
+def split(data, size):
+    """Cut `data` into the pieces a socket reading `size` bytes at a time returns"""
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+def header_heavy():
+    # Many small responses with lots of headers, arriving in small reads
+    headers = b"".join(b"X-Header-%d: %s\r\n" % (i, b"v" * 40) for i in range(40))
+    response = b"HTTP/1.1 200 OK\r\n" + headers + b"Content-Length: 2\r\n\r\n{}"
+    return [split(response, 512) for _ in range(200)]
+
+
+def fragmented_headers():
+    # Responses with a large header block, trickling in 64 byte reads
+    headers = b"".join(b"X-Header-%d: %s\r\n" % (i, b"v" * 40) for i in range(200))
+    response = b"HTTP/1.1 200 OK\r\n" + headers + b"Content-Length: 2\r\n\r\n{}"
+    return [split(response, 64) for _ in range(20)]
+
+
+def body_heavy():
+    # One paginated query result of 4 MB, in 64 KB reads
+    body = b'{"object": "page", "properties": {}},' * (4 * 1024 * 1024 // 37)
+    response = b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % len(body) + body
+    return [split(response, 65536)]
+
+
+def chunked_body_heavy():
+    # The same body sent with chunked transfer encoding, 16 KB per chunk
+    body = b'{"object": "page", "properties": {}},' * (4 * 1024 * 1024 // 37)
+    chunks = b"".join(b"%x\r\n%s\r\n" % (len(piece), piece) for piece in split(body, 16384))
+    response = b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n" + chunks + b"0\r\n\r\n"
+    return [split(response, 65536)]
+
+
+def parse(responses):
+    """Run every response through a client connection and return the events"""
+    events = []
+    for pieces in responses:
+        connection = h11.Connection(h11.CLIENT)
+        connection.send(h11.Request(method="GET", target="/", headers=[("Host", "api.notion.com")]))
+        connection.send(h11.EndOfMessage())
+        for piece in pieces:
+            connection.receive_data(piece)
+            while True:
+                event = connection.next_event()
+                if event is h11.NEED_DATA:
+                    break
+                events.append(event)
+    return events
+
+
+def summary(events):
+    return [
+        (type(event).__name__, bytes(event.data)) if isinstance(event, h11.Data) else event
+        for event in events
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=9)
+    args = parser.parse_args()
+
+    print(f"{'workload':<22}{'bytearray':>12}{'memoryview':>12}{'speedup':>10}")
+    for name, make in (
+        ("header-heavy", header_heavy),
+        ("fragmented headers", fragmented_headers),
+        ("body-heavy", body_heavy),
+        ("chunked body-heavy", chunked_body_heavy),
+    ):
+        responses = make()
+        buffers = (("bytearray", BytearrayReceiveBuffer), ("memoryview", ReceiveBuffer))
+        timings = {label: float("inf") for label, _ in buffers}
+        results = {}
+        try:
+            # Alternate between the buffers, so that noise affects both alike
+            for _ in range(args.repeat):
+                for label, buffer_class in buffers:
+                    _connection.ReceiveBuffer = buffer_class
+                    results[label] = summary(parse(responses))
+                    elapsed = timeit.timeit(lambda: parse(responses), number=1)
+                    timings[label] = min(timings[label], elapsed)
+        finally:
+            _connection.ReceiveBuffer = ReceiveBuffer
+        if results["bytearray"] != results["memoryview"]:
+            raise SystemExit(f"{name}: the buffers produced different events")
+        print(
+            f"{name:<22}{timings['bytearray'] * 1e3:>10.2f}ms{timings['memoryview'] * 1e3:>10.2f}ms"
+            f"{timings['bytearray'] / timings['memoryview']:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Benchmark the h11 request-write path with and without the validated-field memo
+
+httpcore hands h11 the headers of every request as a list of byte pairs, and
+h11 checks each name and value against its header regexes before writing them.
+This sends a typical Notion API request on a fresh client connection, with the
+memo of validated fields and with the previous normalize_and_validate (below),
+which runs the regexes on every field. The memo must not keep the Authorization
+and Content-Length fields:
+
+    python benchmarks/h11_request_write.py [--number 20000]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import h11  # noqa: E402
+from h11 import _events, _headers  # noqa: E402
+from h11._headers import (  # noqa: E402
+    CONTENT_LENGTH_MAX_DIGITS,
+    Headers,
+    _content_length_re,
+    _field_name_re,
+    _field_value_re,
+)
+from h11._util import LocalProtocolError, bytesify, validate  # noqa: E402
+
+# What httpx sends for notion_client's POST /v1/databases/{id}/query
+HEADERS = [
+    (b"Host", b"api.notion.com"),
+    (b"Accept", b"*/*"),
+    (b"Accept-Encoding", b"gzip, deflate"),
+    (b"Connection", b"keep-alive"),
+    (b"User-Agent", b"ramnes/notion-sdk-py@2.3.0"),
+    (b"Notion-Version", b"2022-06-28"),
+    (b"Authorization", b"Bearer secret_0123456789abcdefghijklmnopqrstuvwxyzABCDEFG"),
+    (b"Content-Length", b"17"),
+    (b"Content-Type", b"application/json"),
+]
+TARGET = b"/v1/databases/9bc30ad4-9373-46a5-84ab-0a7845ee52e6/query"
+
+
+def revalidating_normalize_and_validate(headers, _parsed=False):
+    """normalize_and_validate as it was, validating every field every time"""
+    new_headers = []
+    seen_content_length = None
+    saw_transfer_encoding = False
+    for name, value in headers:
+        if not _parsed:
+            name = bytesify(name)
+            value = bytesify(value)
+            validate(_field_name_re, name, "Illegal header name {!r}", name)
+            validate(_field_value_re, value, "Illegal header value {!r}", value)
+        raw_name = name
+        name = name.lower()
+        if name == b"content-length":
+            lengths = {length.strip() for length in value.split(b",")}
+            if len(lengths) != 1:
+                raise LocalProtocolError("conflicting Content-Length headers")
+            value = lengths.pop()
+            validate(_content_length_re, value, "bad Content-Length")
+            if len(value) > CONTENT_LENGTH_MAX_DIGITS:
+                raise LocalProtocolError("bad Content-Length")
+            if seen_content_length is None:
+                seen_content_length = value
+                new_headers.append((raw_name, name, value))
+            elif seen_content_length != value:
+                raise LocalProtocolError("conflicting Content-Length headers")
+        elif name == b"transfer-encoding":
+            if saw_transfer_encoding:
+                raise LocalProtocolError(
+                    "multiple Transfer-Encoding headers", error_status_hint=501
+                )
+            value = value.lower()
+            if value != b"chunked":
+                raise LocalProtocolError(
+                    "Only Transfer-Encoding: chunked is supported",
+                    error_status_hint=501,
+                )
+            saw_transfer_encoding = True
+            new_headers.append((raw_name, name, value))
+        else:
+            new_headers.append((raw_name, name, value))
+    return Headers(new_headers)
+
+
+def send_request():
+    connection = h11.Connection(h11.CLIENT)
+    return connection.send(h11.Request(method=b"POST", target=TARGET, headers=HEADERS))
+
+
+def build_request():
+    return h11.Request(method=b"POST", target=TARGET, headers=HEADERS)
+
+
+def measure(number):
+    return [
+        min(timeit.repeat(function, number=number, repeat=5)) / number * 1e6
+        for function in (build_request, send_request)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000, help="requests per measurement")
+    args = parser.parse_args()
+
+    _headers._validated_fields.clear()
+    memoized = send_request()
+    kept = {name.lower() for name, _ in _headers._validated_fields}
+    if kept & {b"authorization", b"content-length"}:
+        raise SystemExit(f"the memo kept credentials or lengths: {sorted(kept)}")
+    memoized_timings = measure(args.number)
+    _events.normalize_and_validate = revalidating_normalize_and_validate
+    try:
+        if send_request() != memoized:
+            raise SystemExit("the two paths wrote different requests")
+        previous_timings = measure(args.number)
+    finally:
+        _events.normalize_and_validate = _headers.normalize_and_validate
+
+    print(f"{'':<26}{'previous':>10}{'memo':>10}   (microseconds per request)")
+    for name, previous, memo in zip(
+        ("h11.Request(...)", "Connection.send(request)"), previous_timings, memoized_timings
+    ):
+        print(f"{name:<26}{previous:>10.2f}{memo:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Threaded benchmark of httpcore's ConnectionPool lock
+
+Many threads share one pool, as the tenants of a multi-tenant run share one
+Client. Every request goes through the pool lock to be assigned a connection;
+this measures how long the lock is held with the origin-indexed assignment and
+with the previous one (restored below, which matches every queued request
+against every connection). Acquisitions count every pass through the lock,
+including those of requests handed back when their connection was taken first;
+the faster the pool, the more of those there are. Single runs vary with thread
+scheduling, so runs of both pools are interleaved and their medians shown:
+
+    python benchmarks/httpcore_pool.py [--threads 64] [--requests 40] [--origins 4]
+                                       [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import httpcore  # noqa: E402
+from httpcore._backends.mock import MockBackend, MockStream  # noqa: E402
+
+RESPONSE = b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok"
+
+
+class LegacyConnectionPool(httpcore.ConnectionPool):
+    """ConnectionPool with the request assignment of httpcore 1.0.9"""
+
+    def _enqueue(self, pool_request):
+        pass
+
+    def _dequeue(self, pool_request):
+        pass
+
+    def _assign_requests_to_connections(self):
+        closing_connections = []
+        for connection in list(self._connections):
+            if connection.is_closed():
+                self._connections.remove(connection)
+            elif connection.has_expired():
+                self._connections.remove(connection)
+                closing_connections.append(connection)
+            elif (
+                connection.is_idle()
+                and len([connection.is_idle() for connection in self._connections])
+                > self._max_keepalive_connections
+            ):
+                self._connections.remove(connection)
+                closing_connections.append(connection)
+
+        queued_requests = [request for request in self._requests if request.is_queued()]
+        for pool_request in queued_requests:
+            origin = pool_request.request.url.origin
+            available_connections = [
+                connection
+                for connection in self._connections
+                if connection.can_handle_request(origin) and connection.is_available()
+            ]
+            idle_connections = [
+                connection for connection in self._connections if connection.is_idle()
+            ]
+            if available_connections:
+                connection = available_connections[0]
+                pool_request.assign_to_connection(connection)
+            elif len(self._connections) < self._max_connections:
+                connection = self.create_connection(origin)
+                self._connections.append(connection)
+                pool_request.assign_to_connection(connection)
+            elif idle_connections:
+                connection = idle_connections[0]
+                self._connections.remove(connection)
+                closing_connections.append(connection)
+                connection = self.create_connection(origin)
+                self._connections.append(connection)
+                pool_request.assign_to_connection(connection)
+        return closing_connections
+
+
+class TimedLock:
+    """The pool's thread lock, recording how long each acquisition holds it"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.holds = []
+
+    def __enter__(self):
+        self._lock.acquire()
+        self._acquired = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.holds.append(time.perf_counter() - self._acquired)
+        self._lock.release()
+
+
+class SlowStream(MockStream):
+    """A mock socket whose reads take a network round trip"""
+
+    def __init__(self, buffer, latency):
+        super().__init__(buffer)
+        self._latency = latency
+
+    def read(self, max_bytes, timeout=None):
+        time.sleep(self._latency)
+        return super().read(max_bytes, timeout)
+
+
+class SlowBackend(MockBackend):
+    def __init__(self, latency):
+        super().__init__([RESPONSE] * 100000)
+        self._latency = latency
+
+    def connect_tcp(self, *args, **kwargs):
+        return SlowStream(list(self._buffer), self._latency)
+
+
+def run(pool_class, args):
+    pool = pool_class(
+        max_connections=args.max_connections, network_backend=SlowBackend(args.latency)
+    )
+    lock = pool._optional_thread_lock = TimedLock()
+    failures = []
+
+    def worker(index):
+        url = f"http://tenant{index % args.origins}.example/"
+        for _ in range(args.requests):
+            response = pool.request("GET", url)
+            if response.status != 200 or response.content != b"ok":
+                failures.append(response)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(args.threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    pool.close()
+    if failures:
+        raise SystemExit(f"{pool_class.__name__}: {len(failures)} failed requests")
+    holds = sorted(lock.holds)
+    return {
+        "requests/s": args.threads * args.requests / elapsed,
+        "acquisitions": len(holds),
+        "mean hold (us)": statistics.mean(holds) * 1e6,
+        "p99 hold (us)": holds[int(len(holds) * 0.99)] * 1e6,
+        "max hold (us)": holds[-1] * 1e6,
+        "total held (ms)": sum(holds) * 1e3,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=40, help="requests per thread")
+    parser.add_argument("--origins", type=int, default=4)
+    parser.add_argument("--max-connections", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.002, help="seconds per socket read")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # Thread scheduling makes single runs noisy: interleave them, keep medians
+    runs = {"previous": [], "indexed": []}
+    for _ in range(args.repeat):
+        for name, cls in (("previous", LegacyConnectionPool), ("indexed", httpcore.ConnectionPool)):
+            runs[name].append(run(cls, args))
+    results = {
+        name: {metric: statistics.median(result[metric] for result in results)
+               for metric in results[0]}
+        for name, results in runs.items()
+    }
+    print(f"{args.threads} threads x {args.requests} requests, {args.origins} origins, "
+          f"{args.max_connections} connections, median of {args.repeat} runs")
+    print(f"{'':<18}{'previous':>12}{'indexed':>12}")
+    for metric in results["previous"]:
+        print(f"{metric:<18}" + "".join(f"{results[name][metric]:>12.1f}" for name in results))
+
+
+if __name__ == "__main__":
+    main()
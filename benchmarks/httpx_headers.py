@@ -0,0 +1,140 @@
+"""Micro-benchmarks of httpx.Headers lookups
+
+Times the operations made on every Notion request and response, on the indexed
+Headers and on a subclass restoring the previous linear scans:
+
+    python benchmarks/httpx_headers.py [--number 100000]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from httpx import Headers  # noqa: E402
+
+
+class LinearHeaders(Headers):
+    """Headers with the lookups of httpx 0.28.1, which scan every header"""
+
+    def __getitem__(self, key):
+        normalized_key = key.lower().encode(self.encoding)
+        items = [
+            header_value.decode(self.encoding)
+            for _, header_key, header_value in self._list
+            if header_key == normalized_key
+        ]
+        if items:
+            return ", ".join(items)
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        header_key = key.lower().encode(self.encoding)
+        return header_key in [key for _, key, _ in self._list]
+
+    def get_list(self, key, split_commas=False):
+        get_header_key = key.lower().encode(self.encoding)
+        return [
+            item_value.decode(self.encoding)
+            for _, item_key, item_value in self._list
+            if item_key.lower() == get_header_key
+        ]
+
+    def __setitem__(self, key, value):
+        set_key = key.encode(self._encoding or "utf-8")
+        set_value = value.encode(self._encoding or "utf-8")
+        lookup_key = set_key.lower()
+        found_indexes = [
+            idx for idx, (_, item_key, _) in enumerate(self._list) if item_key == lookup_key
+        ]
+        for idx in reversed(found_indexes[1:]):
+            del self._list[idx]
+        if found_indexes:
+            self._list[found_indexes[0]] = (set_key, lookup_key, set_value)
+        else:
+            self._list.append((set_key, lookup_key, set_value))
+
+
+REQUEST_HEADERS = {
+    "Host": "api.notion.com",
+    "Accept": "*/*",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+    "User-Agent": "notionhq-client/2.3.0",
+    "Notion-Version": "2022-06-28",
+    "Authorization": "Bearer secret_0123456789",
+    "Content-Type": "application/json",
+    "Content-Length": "512",
+}
+
+RESPONSE_HEADERS = [
+    ("Date", "Mon, 19 Oct 2026 09:00:00 GMT"),
+    ("Content-Type", "application/json; charset=utf-8"),
+    ("Transfer-Encoding", "chunked"),
+    ("Connection", "keep-alive"),
+    ("CF-Ray", "8d0000000000000-BOM"),
+    ("CF-Cache-Status", "DYNAMIC"),
+    ("ETag", 'W/"1234-abcdef"'),
+    ("Strict-Transport-Security", "max-age=5184000; includeSubDomains"),
+    ("Vary", "Accept-Encoding"),
+    ("Content-Security-Policy", "default-src 'none'"),
+    ("Referrer-Policy", "strict-origin-when-cross-origin"),
+    ("X-Content-Type-Options", "nosniff"),
+    ("X-DNS-Prefetch-Control", "off"),
+    ("X-Download-Options", "noopen"),
+    ("X-Frame-Options", "SAMEORIGIN"),
+    ("X-Permitted-Cross-Domain-Policies", "none"),
+    ("X-XSS-Protection", "0"),
+    ("X-Notion-Request-Id", "0123-4567"),
+    ("Set-Cookie", "a=1; Path=/"),
+    ("Set-Cookie", "b=2; Path=/"),
+    ("Set-Cookie", "c=3; Path=/"),
+    ("Server", "cloudflare"),
+    ("Alt-Svc", 'h3=":443"; ma=86400'),
+    ("Content-Encoding", "gzip"),
+]
+
+OPERATIONS = [
+    ("request", "h['authorization']", REQUEST_HEADERS),
+    ("request", "'content-type' in h", REQUEST_HEADERS),
+    ("request", "h['Notion-Version'] = '2022-06-28'", REQUEST_HEADERS),
+    ("request", "h.get('cookie')", REQUEST_HEADERS),
+    ("response", "h.get('content-encoding')", RESPONSE_HEADERS),
+    ("response", "h.get_list('set-cookie')", RESPONSE_HEADERS),
+    ("response", "h['retry-after'] if 'retry-after' in h else None", RESPONSE_HEADERS),
+    ("response", "h.get('content-type')", RESPONSE_HEADERS),
+]
+
+
+def result(statement, h):
+    """Value of `statement` on `h`, or None if it is an assignment"""
+    try:
+        code = compile(statement, "<operation>", "eval")
+    except SyntaxError:
+        return None
+    return eval(code, {"h": h})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=100000)
+    args = parser.parse_args()
+
+    print(f"{'headers':<10}{'operation':<52}{'linear':>9}{'indexed':>9}   (ns per call)")
+    for kind, statement, headers in OPERATIONS:
+        timings = []
+        results = []
+        for cls in (LinearHeaders, Headers):
+            h = cls(headers)
+            results.append(result(statement, cls(headers)))
+            seconds = min(timeit.repeat(statement, globals={"h": h}, number=args.number, repeat=5))
+            timings.append(seconds / args.number * 1e9)
+        if results[0] != results[1]:
+            raise SystemExit(f"{statement}: {results[0]!r} != {results[1]!r}")
+        print(f"{kind:<10}{statement:<52}" + "".join(f"{timing:>9.0f}" for timing in timings))
+
+
+if __name__ == "__main__":
+    main()
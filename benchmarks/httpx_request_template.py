@@ -0,0 +1,67 @@
+"""Benchmark httpx request building with and without a request template
+
+Builds the requests notion_client sends (against a base_url with fixed
+headers), first with Client.build_request, which re-parses and re-merges the
+base URL, headers and params of the client for every request, then with
+Client.request_template(), which merges them once. Both must build identical
+requests:
+
+    python benchmarks/httpx_request_template.py [--number 20000]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import httpx  # noqa: E402
+
+PAGE_ID = "9bc30ad4-9373-46a5-84ab-0a7845ee52e6"
+
+CALLS = {
+    "query database": ("POST", f"databases/{PAGE_ID}/query", {"json": {"page_size": 100}}),
+    "create page": ("POST", "pages", {"json": {"parent": {"database_id": PAGE_ID}, "properties": {}}}),
+    "list children": ("GET", f"blocks/{PAGE_ID}/children", {"params": {"page_size": 100}}),
+    "archive (tenant)": ("PATCH", f"pages/{PAGE_ID}", {
+        "json": {"archived": True},
+        "headers": {"Authorization": "Bearer secret_tenant"},
+    }),
+}
+
+
+def describe(request):
+    return (request.method, request.url, request.headers.raw, request.content, request.extensions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000, help="requests per measurement")
+    args = parser.parse_args()
+
+    client = httpx.Client(base_url="https://api.notion.com/v1/", timeout=60)
+    client.headers = httpx.Headers({
+        "Notion-Version": "2022-06-28",
+        "User-Agent": "ramnes/notion-sdk-py@2.3.0",
+        "Authorization": "Bearer secret_default",
+    })
+    template = client.request_template()
+    for name, (method, path, kwargs) in CALLS.items():
+        if describe(client.build_request(method, path, **kwargs)) != describe(
+            template.build_request(method, path, **kwargs)
+        ):
+            raise SystemExit(f"{name}: the template built a different request")
+
+    print(f"{'call':<20}{'client':>10}{'template':>10}   (microseconds per request)")
+    for name, (method, path, kwargs) in CALLS.items():
+        timings = [
+            min(timeit.repeat(lambda: build(method, path, **kwargs), number=args.number, repeat=5))
+            / args.number * 1e6
+            for build in (client.build_request, template.build_request)
+        ]
+        print(f"{name:<20}" + "".join(f"{timing:>10.2f}" for timing in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Check and benchmark the SSL contexts shared by httpx transports
+
+Transports with the same settings must share one SSL context, while HTTP/1.1
+and HTTP/2 transports get their own: httpcore sets the ALPN protocols of the
+context on every connection, so a context shared between the two would offer
+"h2" to HTTP/1.1-only pools, or not to HTTP/2 ones. create_ssl_context keeps
+returning a fresh context, which callers may modify. Then times making the SSL
+context of a transport, shared and fresh:
+
+    python benchmarks/httpx_ssl_context.py [--number 20]
+"""
+import argparse
+import os
+import ssl
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import httpx  # noqa: E402
+from httpx._config import shared_ssl_context  # noqa: E402
+
+
+def check(condition, message):
+    if not condition:
+        raise SystemExit(f"FAILED: {message}")
+    print(f"ok    {message}")
+
+
+def context_of(transport):
+    return transport._pool._ssl_context
+
+
+def client_hello(ctx):
+    """The ClientHello that `ctx` sends first, without any network"""
+    incoming, outgoing = ssl.MemoryBIO(), ssl.MemoryBIO()
+    tls = ctx.wrap_bio(incoming, outgoing, server_hostname="api.notion.com")
+    try:
+        tls.do_handshake()
+    except ssl.SSLWantReadError:
+        pass
+    return outgoing.read()
+
+
+def offers_h2(ctx):
+    return b"\x02h2" in client_hello(ctx)
+
+
+def check_sharing():
+    http1 = context_of(httpx.HTTPTransport())
+    check(http1 is context_of(httpx.HTTPTransport())
+          and http1 is context_of(httpx.AsyncHTTPTransport()),
+          "transports with the same settings share one SSL context")
+    http2 = context_of(httpx.HTTPTransport(http2=True))
+    check(http2 is not http1, "HTTP/2 transports get an SSL context of their own")
+    check(context_of(httpx.HTTPTransport(verify=False)) not in (http1, http2),
+          "verify=False gets an SSL context of its own")
+
+    # What httpcore does for every connection of each pool
+    http2.set_alpn_protocols(["http/1.1", "h2"])
+    http1.set_alpn_protocols(["http/1.1"])
+    check(not offers_h2(http1) and offers_h2(http2),
+          "connections of HTTP/1.1 pools never offer h2, those of HTTP/2 pools do")
+
+    own = ssl.create_default_context()
+    check(context_of(httpx.HTTPTransport(verify=own)) is own,
+          "an SSL context passed as verify is used as is")
+    check(httpx.create_ssl_context() is not httpx.create_ssl_context()
+          and httpx.create_ssl_context() is not http1,
+          "create_ssl_context returns a fresh context each time")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    check_sharing()
+
+    print(f"\nSSL context of a transport, mean of {args.number}")
+    print(f"{'':<24}{'ms':>10}")
+    for name, make in (("create_ssl_context", httpx.create_ssl_context),
+                       ("shared_ssl_context", shared_ssl_context)):
+        elapsed = timeit.timeit(make, number=args.number) / args.number
+        print(f"{name:<24}{elapsed * 1e3:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
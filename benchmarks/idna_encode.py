@@ -0,0 +1,83 @@
+"""Benchmark idna.encode/decode on ASCII and non-ASCII host names
+
+Compares three ways of encoding each host, after checking they agree:
+    tables    the full UTS46 + IDNA 2008 label processing (what encode always did)
+    uncached  idna.encode without its LRU cache (ASCII hosts take the LDH fast path)
+    cached    idna.encode as called by httpx and anyio for every connection
+
+    python benchmarks/idna_encode.py [--number 20000]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import idna  # noqa: E402
+from idna import core  # noqa: E402
+
+HOSTS = [
+    "api.notion.com",
+    "API.Notion.com",
+    "s3.us-west-2.amazonaws.com",
+    "localhost",
+    "xn--nxasmq6b.com",
+    "bücher.example",
+    "ドメイン.テスト",
+    "παράδειγμα.δοκιμή",
+]
+
+
+def encode_with_tables(host):
+    host = core.uts46_remap(host, std3_rules=False, transitional=False)
+    labels = host.split(".")
+    trailing_dot = labels[-1] == ""
+    result = b".".join(core.alabel(label) for label in labels if label)
+    return result + b"." if trailing_dot else result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000, help="encodings per measurement")
+    args = parser.parse_args()
+
+    encode_uncached = core._encode.__wrapped__
+    decode_uncached = core._decode.__wrapped__
+    for host in HOSTS:
+        expected = encode_with_tables(host)
+        for encoded in (encode_uncached(host, False, True, False, False), idna.encode(host, uts46=True)):
+            if encoded != expected:
+                raise SystemExit(f"{host!r}: encode gave {encoded!r}, expected {expected!r}")
+        if idna.decode(expected) != decode_uncached(expected.decode("ascii"), False, False, False):
+            raise SystemExit(f"{host!r}: cached and uncached decode disagree")
+
+    print(f"{'host':<34}{'tables':>10}{'uncached':>10}{'cached':>10}   (microseconds per encode)")
+    for host in HOSTS:
+        timings = [
+            min(timeit.repeat(function, number=args.number, repeat=3)) / args.number * 1e6
+            for function in (
+                lambda: encode_with_tables(host),
+                lambda: encode_uncached(host, False, True, False, False),
+                lambda: idna.encode(host, uts46=True),
+            )
+        ]
+        print(f"{host:<34}" + "".join(f"{timing:>10.2f}" for timing in timings))
+
+    print()
+    print(f"{'host':<34}{'uncached':>10}{'cached':>10}   (microseconds per decode)")
+    for host in HOSTS:
+        encoded = idna.encode(host, uts46=True).decode("ascii")
+        timings = [
+            min(timeit.repeat(function, number=args.number, repeat=3)) / args.number * 1e6
+            for function in (
+                lambda: decode_uncached(encoded, False, False, False),
+                lambda: idna.decode(encoded),
+            )
+        ]
+        print(f"{encoded:<34}" + "".join(f"{timing:>10.2f}" for timing in timings))
+
+
+if __name__ == "__main__":
+    main()
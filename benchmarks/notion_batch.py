@@ -0,0 +1,78 @@
+"""Benchmark Client.batch against sequential calls
+
+Archives pages through a mock transport that answers after a fixed latency,
+one call after the other and then with Client.batch, under the same client-side
+rate limit. Both must archive the same pages:
+
+    python benchmarks/notion_batch.py [--calls 40] [--latency 0.2] [--rate 10]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from functools import partial
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import httpx  # noqa: E402
+
+from notion_client import Client  # noqa: E402
+
+
+def make_client(latency, rate, archived):
+    lock = threading.Lock()
+
+    def handler(request):
+        time.sleep(latency)
+        page_id = request.url.path.rsplit("/", 1)[-1]
+        with lock:
+            archived.append(page_id)
+        return httpx.Response(200, json={"object": "page", "id": page_id, "archived": True})
+
+    return Client(
+        auth="secret_benchmark",
+        rate_limit=rate,
+        client=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+
+
+def sequential(client, page_ids, workers):
+    return [client.pages.update(page_id=page_id, archived=True) for page_id in page_ids]
+
+
+def batched(client, page_ids, workers):
+    results = client.batch(
+        [partial(client.pages.update, page_id=page_id, archived=True) for page_id in page_ids],
+        max_workers=workers,
+    )
+    return [result.result() for result in results]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per response")
+    parser.add_argument("--rate", type=float, default=10.0, help="requests per second")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    page_ids = [f"{index:032x}" for index in range(args.calls)]
+    print(f"{args.calls} calls, {args.latency * 1e3:.0f} ms latency, {args.rate:g} requests/s")
+    print(f"{'':<12}{'time (s)':>10}{'calls/s':>10}")
+    outcomes = []
+    for name, function in (("sequential", sequential), ("batch", batched)):
+        archived = []
+        client = make_client(args.latency, args.rate, archived)
+        start = time.perf_counter()
+        results = function(client, page_ids, args.workers)
+        elapsed = time.perf_counter() - start
+        outcomes.append(([result["id"] for result in results], sorted(archived)))
+        print(f"{name:<12}{elapsed:>10.2f}{args.calls / elapsed:>10.1f}")
+    if outcomes[0] != outcomes[1]:
+        raise SystemExit("batch archived different pages")
+
+
+if __name__ == "__main__":
+    main()
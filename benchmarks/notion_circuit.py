@@ -0,0 +1,142 @@
+"""Check and benchmark the circuit breakers of notion_client
+
+Drives one breaker through its states with a mock transport: consecutive 5xx
+responses open it, requests then fail fast until the recovery timeout, a
+successful probe closes it and a failed one opens it again. A probe cancelled
+while it waits for the rate limiter, and a request cancelled by its caller
+while in flight, must both leave the breaker usable. Then compares the time
+spent on requests to a failing endpoint with and without breakers:
+
+    python benchmarks/notion_circuit.py [--requests 50] [--latency 0.05]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import httpx  # noqa: E402
+
+from notion_client import AsyncClient, Client  # noqa: E402
+from notion_client.circuit import CircuitBreakerRegistry, CircuitState  # noqa: E402
+from notion_client.errors import CircuitOpenError, HTTPResponseError  # noqa: E402
+
+RECOVERY = 0.05
+
+
+def check(condition, message):
+    if not condition:
+        raise SystemExit(f"FAILED: {message}")
+    print(f"ok    {message}")
+
+
+def status_transport(statuses, latency=0.0):
+    """Answer with the next status of `statuses` (the last one repeats)"""
+    def handler(request):
+        time.sleep(latency)
+        status = statuses.pop(0) if len(statuses) > 1 else statuses[0]
+        return httpx.Response(status, json={"object": "user", "id": "me"})
+    return httpx.MockTransport(handler)
+
+
+def check_transitions():
+    registry = CircuitBreakerRegistry(failure_threshold=3, recovery_timeout=RECOVERY)
+    statuses = [502, 502, 502, 502, 200]
+    client = Client(auth="secret_check", circuit_breakers=registry,
+                    client=httpx.Client(transport=status_transport(statuses)))
+    breaker = registry.get("users")
+    for _ in range(3):
+        try:
+            client.users.me()
+        except HTTPResponseError:
+            pass
+    check(breaker.state is CircuitState.Open, "3 consecutive 5xx open the breaker")
+    try:
+        client.users.me()
+        check(False, "an open breaker fails fast")
+    except CircuitOpenError as error:
+        check(error.retry_after > 0, "an open breaker fails fast with the time to the next probe")
+    check(registry.get("pages").state is CircuitState.Closed, "other endpoint families stay closed")
+
+    time.sleep(RECOVERY)
+    try:
+        client.users.me()
+    except HTTPResponseError:
+        pass
+    check(breaker.state is CircuitState.Open, "a failed probe opens the breaker again")
+    time.sleep(RECOVERY)
+    client.users.me()
+    check(breaker.state is CircuitState.Closed and breaker.failures == 0,
+          "a successful probe closes the breaker")
+
+
+async def check_cancellation():
+    async def handler(request):
+        if request.url.path.endswith("/slow"):
+            await asyncio.sleep(1)
+        return httpx.Response(200, json={"object": "page", "id": "page"})
+
+    registry = CircuitBreakerRegistry(failure_threshold=1, recovery_timeout=RECOVERY)
+    client = AsyncClient(auth="secret_check", circuit_breakers=registry, rate_limit=5,
+                         rate_limit_burst=1,
+                         client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    breaker = registry.get("pages")
+    breaker.record_failure()
+    await asyncio.sleep(RECOVERY)
+    # Empty the token bucket, so that the probe waits for the rate limiter
+    client._rate_limiter(None).reserve()
+    try:
+        await asyncio.wait_for(client.pages.retrieve(page_id="page"), 0.05)
+    except asyncio.TimeoutError:
+        pass
+    check(breaker.state is CircuitState.Open and breaker.retry_after() == 0,
+          "a probe cancelled while waiting for the rate limiter is handed back")
+    await asyncio.sleep(0.3)
+    await client.pages.retrieve(page_id="page")
+    check(breaker.state is CircuitState.Closed, "the next request probes and closes the breaker")
+
+    try:
+        await asyncio.wait_for(client.pages.retrieve(page_id="slow"), 0.05)
+    except asyncio.TimeoutError:
+        pass
+    check(breaker.state is CircuitState.Closed and breaker.failures == 0,
+          "a request cancelled by its caller does not count as a failure")
+
+
+def failing_run(requests, latency, breakers):
+    client = Client(auth="secret_benchmark", circuit_breakers=breakers,
+                    client=httpx.Client(transport=status_transport([503], latency)))
+    sent = 0
+    start = time.perf_counter()
+    for _ in range(requests):
+        try:
+            client.users.me()
+        except CircuitOpenError:
+            continue
+        except HTTPResponseError:
+            pass
+        sent += 1
+    return sent, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per 503 response")
+    args = parser.parse_args()
+
+    check_transitions()
+    asyncio.run(check_cancellation())
+
+    print(f"\n{args.requests} requests to an endpoint answering 503 after {args.latency * 1e3:.0f} ms")
+    print(f"{'':<18}{'sent':>6}{'time (s)':>10}")
+    for name, breakers in (("no breakers", None), ("breakers", CircuitBreakerRegistry())):
+        sent, elapsed = failing_run(args.requests, args.latency, breakers)
+        print(f"{name:<18}{sent:>6}{elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
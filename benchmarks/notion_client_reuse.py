@@ -0,0 +1,152 @@
+"""Check and benchmark the context managers of notion_client clients
+
+A client given to Client or AsyncClient must be reused as is by `with` blocks,
+nested or not, keeping its transport, and be left open at the end of each
+block: its owner closes it. Without one, every block gets a new client sized by
+the pool options of ClientOptions, which is closed at the end of the block,
+and the client the constructor made is used again after it. Then times
+entering and leaving a block, with a new pool as before, with a new pool on
+the shared SSL context, and reusing a given client:
+
+    python benchmarks/notion_client_reuse.py [--number 200]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import httpx  # noqa: E402
+
+from notion_client import AsyncClient, Client  # noqa: E402
+
+
+def check(condition, message):
+    if not condition:
+        raise SystemExit(f"FAILED: {message}")
+    print(f"ok    {message}")
+
+
+def answer(request):
+    return httpx.Response(200, json={"object": "user", "id": "me"})
+
+
+async def async_answer(request):
+    return answer(request)
+
+
+def pool_of(client):
+    return client._transport._pool
+
+
+def check_given_client():
+    given = httpx.Client(transport=httpx.MockTransport(answer))
+    notion = Client(auth="secret_check", client=given)
+    with notion:
+        check(notion.client is given and notion.users.me()["id"] == "me",
+              "a with block sends through the given client and its transport")
+        with notion:
+            check(notion.client is given, "nested blocks reuse it too")
+        check(not given.is_closed, "leaving a nested block leaves it open")
+    check(not given.is_closed and notion.client is given
+          and notion.users.me()["id"] == "me",
+          "leaving the block leaves it open, and the client can still be used")
+    with notion:
+        notion.users.me()
+    check(notion.client.headers["Authorization"] == "Bearer secret_check"
+          and str(notion.client.base_url) == "https://api.notion.com/v1/",
+          "blocks keep the headers and base URL of the options")
+    notion.close()
+    check(given.is_closed, "close() closes it")
+
+
+def check_owned_client():
+    notion = Client(auth="secret_check", timeout_ms=5_000, read_timeout_ms=30_000,
+                    max_connections=8, max_keepalive_connections=4, keepalive_expiry=30)
+    made = notion.client
+    pool = pool_of(made)
+    check((pool._max_connections, pool._max_keepalive_connections, pool._keepalive_expiry)
+          == (8, 4, 30),
+          "the constructor's client is sized by the pool options")
+    with notion:
+        block = notion.client
+        pool = pool_of(block)
+        check(block is not made
+              and (pool._max_connections, pool._max_keepalive_connections,
+                   pool._keepalive_expiry) == (8, 4, 30),
+              "a block gets a new client, sized by the pool options")
+        check(block.timeout == httpx.Timeout(5, read=30),
+              "the block's client has the timeouts of the options")
+        check(pool._ssl_context is pool_of(made)._ssl_context,
+              "the block's pool shares the SSL context of the first one")
+    check(block.is_closed and notion.client is made and not made.is_closed,
+          "leaving the block closes its client, and the first one is used again")
+
+    notion = Client(max_connections=None, max_keepalive_connections=None)
+    pool = pool_of(notion.client)
+    check(pool._max_connections == pool._max_keepalive_connections == sys.maxsize,
+          "None lifts the limits of the pool")
+
+
+async def check_async():
+    given = httpx.AsyncClient(transport=httpx.MockTransport(async_answer))
+    notion = AsyncClient(auth="secret_check", client=given)
+    async with notion:
+        async with notion:
+            me = await notion.users.me()
+            check(notion.client is given and me["id"] == "me",
+                  "nested async blocks send through the given client")
+    check(not given.is_closed and notion.client is given,
+          "leaving async blocks leaves the given client open")
+    await notion.aclose()
+
+    notion = AsyncClient(max_connections=8)
+    made = notion.client
+    async with notion:
+        block = notion.client
+        check(block is not made and pool_of(block)._max_connections == 8,
+              "an async block without a given client gets a new one, sized by the options")
+    check(block.is_closed and notion.client is made,
+          "leaving it closes that client, and the first one is used again")
+    await notion.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    check_given_client()
+    check_owned_client()
+    asyncio.run(check_async())
+
+    owned = Client(auth="secret_benchmark")
+    given = Client(auth="secret_benchmark", client=httpx.Client())
+
+    def new_pool_fresh_ssl():
+        # What every block did before: a bare client, building its own SSL context
+        with httpx.Client(verify=httpx.create_ssl_context()):
+            pass
+
+    def new_pool():
+        with owned:
+            pass
+
+    def reuse():
+        with given:
+            pass
+
+    print(f"\nentering and leaving a with block, mean of {args.number}")
+    print(f"{'':<28}{'ms':>10}")
+    for name, function in (("new pool, fresh SSL context", new_pool_fresh_ssl),
+                           ("new pool, shared SSL context", new_pool),
+                           ("given client, reused", reuse)):
+        elapsed = timeit.timeit(function, number=args.number) / args.number
+        print(f"{name:<28}{elapsed * 1e3:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Check and benchmark the adaptive concurrency limiter of notion_client
+
+Checks the AIMD rules of AdaptiveConcurrencyLimiter: successes widen the window
+by about one slot per window's worth of responses, the first 429 or 503 of a
+congestion episode halves it while the responses of requests already in flight
+leave it alone, the bounds hold and the threads of a Client never have more
+requests in flight than the limit. Then sends requests from many threads to a
+mock server that answers 429 beyond its capacity, with and without the limiter:
+
+    python benchmarks/notion_concurrency.py [--requests 400] [--threads 16]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import httpx  # noqa: E402
+
+from notion_client import Client  # noqa: E402
+from notion_client.concurrency import AdaptiveConcurrencyLimiter  # noqa: E402
+from notion_client.errors import HTTPResponseError  # noqa: E402
+
+
+def check(condition, message):
+    if not condition:
+        raise SystemExit(f"FAILED: {message}")
+    print(f"ok    {message}")
+
+
+class Server:
+    """A mock Notion answering 429 to requests beyond `capacity` at once"""
+
+    def __init__(self, capacity, latency):
+        self.capacity = capacity
+        self.latency = latency
+        self.in_flight = 0
+        self.peak = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def handle(self, request):
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            rejected = self.in_flight > self.capacity
+            self.rejected += rejected
+        try:
+            time.sleep(self.latency)
+            if rejected:
+                return httpx.Response(429, json={"object": "error", "status": 429,
+                                                 "code": "rate_limited", "message": "slow down"})
+            return httpx.Response(200, json={"object": "user", "id": "me"})
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def check_rules():
+    limiter = AdaptiveConcurrencyLimiter(initial=4, minimum=2, maximum=6)
+    for _ in range(4):
+        limiter.release(limiter.acquire(), 200)
+    check(limiter.limit == 4, "a few successes don't widen the window yet")
+    limiter.release(limiter.acquire(), 200)
+    check(limiter.limit == 5, "about a window's worth of successes adds one slot")
+
+    tickets = [limiter.acquire() for _ in range(5)]
+    check(limiter.release(tickets[0], 429) == 2 and limiter.limit == 2,
+          "the first 429 halves the window")
+    for ticket in tickets[1:3]:
+        limiter.release(ticket, 503)
+    check(limiter.limit == 2, "429 and 503 of requests already in flight leave it alone")
+    limiter.release(tickets[3], None)
+    check(limiter.limit == 2, "a request without a response leaves it alone")
+    limiter.release(tickets[4], 200)
+
+    limiter.release(limiter.acquire(), 429)
+    check(limiter.limit == 2, "the window never shrinks below the minimum")
+    for _ in range(100):
+        limiter.release(limiter.acquire(), 200)
+    check(limiter.limit == 6, "the window never grows beyond the maximum")
+    check([limit for _, limit in limiter.history][:4] == [4, 5, 2, 3],
+          "the history records every change of the limit")
+
+    try:
+        AdaptiveConcurrencyLimiter(initial=8, maximum=4)
+        check(False, "the bounds are validated")
+    except ValueError:
+        check(True, "the bounds are validated")
+
+
+async def check_async_cancel():
+    limiter = AdaptiveConcurrencyLimiter(initial=1, minimum=1)
+    ticket = await limiter.async_acquire()
+    waiter = asyncio.ensure_future(limiter.async_acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    try:
+        await waiter
+    except asyncio.CancelledError:
+        pass
+    limiter.release(ticket, 200)
+    second = await asyncio.wait_for(limiter.async_acquire(), 1)
+    check(limiter.in_flight == 1 and not limiter._async_waiters,
+          "a cancelled async waiter gives up its place")
+    limiter.release(second, 200)
+
+
+def run(requests, threads, server, limiter):
+    client = Client(auth="secret_benchmark", concurrency_limiter=limiter,
+                    client=httpx.Client(transport=httpx.MockTransport(server.handle)))
+
+    def call(_):
+        try:
+            client.users.me()
+            return True
+        except HTTPResponseError:
+            return False
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        succeeded = sum(executor.map(call, range(requests)))
+    return succeeded, time.perf_counter() - start
+
+
+def check_client(threads):
+    server = Server(capacity=threads, latency=0.005)
+    limiter = AdaptiveConcurrencyLimiter(initial=3, maximum=3)
+    run(threads * 10, threads, server, limiter)
+    check(server.peak <= 3 and limiter.in_flight == 0,
+          "client threads never exceed the limit, and give every slot back")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--capacity", type=int, default=4,
+                        help="requests the server takes at once")
+    parser.add_argument("--latency", type=float, default=0.01, help="seconds per response")
+    args = parser.parse_args()
+
+    check_rules()
+    asyncio.run(check_async_cancel())
+    check_client(args.threads)
+
+    print(f"\n{args.requests} requests from {args.threads} threads, "
+          f"server capacity {args.capacity}")
+    print(f"{'':<14}{'ok':>6}{'429':>6}{'peak':>6}{'time (s)':>10}")
+    for name, limiter in (("no limiter", None),
+                          ("AIMD limiter", AdaptiveConcurrencyLimiter(maximum=args.threads))):
+        server = Server(args.capacity, args.latency)
+        succeeded, elapsed = run(args.requests, args.threads, server, limiter)
+        print(f"{name:<14}{succeeded:>6}{server.rejected:>6}{server.peak:>6}{elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""Check and benchmark request hedging in notion_client
+
+Checks that only idempotent reads are hedged, that nothing is hedged before an
+endpoint has enough latency samples, that a slow first attempt is hedged and
+the faster answer used (with Client and AsyncClient), that the budget caps the
+share of duplicated requests and a hedge refused by the rate limiter costs
+none of it, that leaving a `with` block or closing the client while a hedged
+read is in flight doesn't break it, and that closing a client stops its hedging
+threads once its reads are done. Then compares the tail latency of reads from a mock server with slow
+outliers, with and without hedging:
+
+    python benchmarks/notion_hedging.py [--requests 300] [--outliers 0.05]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import httpx  # noqa: E402
+
+from notion_client import AsyncClient, Client  # noqa: E402
+from notion_client.hedging import HedgingPolicy  # noqa: E402
+
+FAST = 0.005
+SLOW = 0.3
+
+
+def check(condition, message):
+    if not condition:
+        raise SystemExit(f"FAILED: {message}")
+    print(f"ok    {message}")
+
+
+class Server:
+    """A mock Notion whose responses take FAST seconds, or SLOW for an outlier.
+
+    `slow` decides whether the attempt number `n` (counted per URL from 1) is an
+    outlier.
+    """
+
+    def __init__(self, slow):
+        self.slow = slow
+        self.attempts = {}
+        self.sent = 0
+        self._lock = threading.Lock()
+
+    def _delay(self, request):
+        with self._lock:
+            self.sent += 1
+            url = str(request.url)
+            attempt = self.attempts[url] = self.attempts.get(url, 0) + 1
+        return SLOW if self.slow(attempt) else FAST
+
+    def _response(self, request):
+        return httpx.Response(200, json={"object": "page", "id": request.url.path})
+
+    def handle(self, request):
+        time.sleep(self._delay(request))
+        return self._response(request)
+
+    async def async_handle(self, request):
+        await asyncio.sleep(self._delay(request))
+        return self._response(request)
+
+
+def policy(**kwargs):
+    return HedgingPolicy(min_samples=5, min_delay=0.02, budget_ratio=1.0, **kwargs)
+
+
+def page_id(number):
+    """A page id, which hedging masks so that every page is one endpoint"""
+    return f"{number:032x}"
+
+
+def timed(call):
+    start = time.perf_counter()
+    call()
+    return time.perf_counter() - start
+
+
+def check_policy():
+    hedging = HedgingPolicy()
+    check(hedging.is_hedgeable("GET", "pages/abc")
+          and hedging.is_hedgeable("POST", "databases/abc/query")
+          and hedging.is_hedgeable("POST", "search"),
+          "GET requests, database queries and searches are hedgeable")
+    check(not hedging.is_hedgeable("POST", "pages")
+          and not hedging.is_hedgeable("PATCH", "pages/abc"),
+          "creates and updates are never hedged")
+
+
+def check_client():
+    server = Server(lambda attempt: False)
+    client = Client(auth="secret_check", hedging=policy(),
+                    client=httpx.Client(transport=httpx.MockTransport(server.handle)))
+    for number in range(5):
+        client.pages.retrieve(page_id=page_id(number))
+    check(server.sent == 5, "nothing is hedged before an endpoint has enough samples")
+    server.slow = lambda attempt: attempt == 1
+    elapsed = timed(lambda: client.pages.retrieve(page_id=page_id(100)))
+    check(elapsed < SLOW / 2 and server.sent == 7,
+          "a slow first attempt is hedged, and the faster answer used")
+
+    threads = [thread for thread in threading.enumerate()
+               if thread.name.startswith("notion-hedge")]
+    client.close()
+    for thread in threads:
+        thread.join(SLOW * 2)
+    check(threads and not any(thread.is_alive() for thread in threads),
+          "closing the client stops its hedging threads")
+
+
+def check_in_flight():
+    server = Server(lambda attempt: False)
+    client = Client(auth="secret_check", hedging=policy(),
+                    client=httpx.Client(transport=httpx.MockTransport(server.handle)))
+    for number in range(5):
+        client.pages.retrieve(page_id=page_id(number))
+    server.slow = lambda attempt: attempt == 1
+
+    def read(number, outcome):
+        try:
+            client.pages.retrieve(page_id=page_id(number))
+            outcome.append("ok")
+        except Exception as error:
+            outcome.append(repr(error))
+
+    outcome = []
+    reader = threading.Thread(target=read, args=(200, outcome))
+    reader.start()
+    time.sleep(0.005)
+    with client:
+        pass
+    reader.join()
+    check(outcome == ["ok"] and server.sent == 7,
+          "leaving a with block on another thread doesn't stop a hedged read")
+
+    outcome = []
+    reader = threading.Thread(target=read, args=(201, outcome))
+    reader.start()
+    time.sleep(0.03)
+    threads = [thread for thread in threading.enumerate()
+               if thread.name.startswith("notion-hedge")]
+    client.close()
+    check(client._hedge_executor is not None,
+          "closing the client waits for its hedged reads before stopping the threads")
+    reader.join()
+    for thread in threads:
+        thread.join(SLOW * 2)
+    check(outcome == ["ok"] and client._hedge_executor is None
+          and not any(thread.is_alive() for thread in threads),
+          "a read hedged while the client closes gets its answer, then the threads stop")
+
+
+def check_refund():
+    hedging = policy()
+    client = Client(auth="secret_check", hedging=hedging, rate_limit=1, rate_limit_burst=1)
+    hedging.delay("GET pages/*")
+    client._rate_limiter(None).reserve()
+    budget = hedging._budget
+    check(not client._may_hedge(hedging, None) and hedging._budget == budget,
+          "a hedge refused by the rate limiter is given back to the budget")
+
+
+def check_budget():
+    hedging = HedgingPolicy(budget_ratio=0.1, max_budget=3.0)
+    hedges = 0
+    for _ in range(25):
+        hedging.delay("GET pages/*")
+        hedges += hedging.try_spend()
+    check(hedges == 2, "every request earns a tenth of a hedge")
+    for _ in range(100):
+        hedging.delay("GET pages/*")
+    hedges = sum(hedging.try_spend() for _ in range(10))
+    check(hedges == 3, "unspent hedges are saved up to max_budget")
+
+
+async def check_async():
+    server = Server(lambda attempt: False)
+    client = AsyncClient(auth="secret_check", hedging=policy(), client=httpx.AsyncClient(
+        transport=httpx.MockTransport(server.async_handle)))
+    for number in range(5):
+        await client.pages.retrieve(page_id=page_id(number))
+    server.slow = lambda attempt: attempt == 1
+    start = time.perf_counter()
+    await client.pages.retrieve(page_id=page_id(100))
+    check(time.perf_counter() - start < SLOW / 2 and server.sent == 7,
+          "the async client hedges the same way")
+
+
+def latencies(requests, outliers, hedging):
+    rng = random.Random(7)
+    server = Server(lambda attempt: rng.random() < outliers)
+    client = Client(auth="secret_benchmark", hedging=hedging,
+                    client=httpx.Client(transport=httpx.MockTransport(server.handle)))
+    with client:
+        timings = sorted(timed(lambda: client.pages.retrieve(page_id=page_id(number)))
+                         for number in range(requests))
+    return timings, server.sent
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--outliers", type=float, default=0.05,
+                        help="share of responses taking 300 ms instead of 5 ms")
+    args = parser.parse_args()
+
+    check_policy()
+    check_client()
+    check_in_flight()
+    check_refund()
+    check_budget()
+    asyncio.run(check_async())
+
+    print(f"\n{args.requests} reads, {args.outliers:.0%} of responses slow")
+    print(f"{'':<12}{'sent':>6}{'p50 (ms)':>10}{'p99 (ms)':>10}{'total (s)':>11}")
+    for name, hedging in (("no hedging", None), ("hedging", HedgingPolicy())):
+        timings, sent = latencies(args.requests, args.outliers, hedging)
+        p50 = timings[len(timings) // 2]
+        p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+        print(f"{name:<12}{sent:>6}{p50 * 1e3:>10.1f}{p99 * 1e3:>10.1f}{sum(timings):>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
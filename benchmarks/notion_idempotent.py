@@ -0,0 +1,205 @@
+"""Check idempotent page creation in notion_client.helpers
+
+Drives create_page_idempotently against a mock database whose query index lags
+behind its writes: a create whose response is lost, times out or fails with a
+5xx must leave exactly one page, found by its idempotency key, even when the
+key query itself times out, fails or is rate limited, while other errors are
+raised at once. Then counts the pages a lost response leaves behind
+for several backoffs, against the lag of the query index:
+
+    python benchmarks/notion_idempotent.py [--lag 0.05] [--attempts 3]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import httpx  # noqa: E402
+
+from notion_client import AsyncClient, Client, helpers  # noqa: E402
+from notion_client.errors import (  # noqa: E402
+    APIResponseError,
+    HTTPResponseError,
+    RequestTimeoutError,
+)
+
+KEY = helpers.idempotency_key("2024-05-01", "Morning Routine", "7:30-8:00 AM")
+
+
+def check(condition, message):
+    if not condition:
+        raise SystemExit(f"FAILED: {message}")
+    print(f"ok    {message}")
+
+
+class Database:
+    """A database whose pages show up in queries `lag` seconds after they are created.
+
+    Every create takes the next outcome of `outcomes`: "ok", "lost" (created,
+    but the response times out), "lost5xx" (created, but answered with a 502),
+    "timeout", "5xx", "429" or "4xx" (not created). Every key query takes the next
+    of `query_outcomes`: "ok", "timeout", "5xx" or "429".
+    """
+
+    def __init__(self, outcomes, lag=0.0, query_outcomes=("ok",)):
+        self.outcomes = list(outcomes)
+        self.query_outcomes = list(query_outcomes)
+        self.lag = lag
+        self.pages = []
+        self.log = []
+
+    def handle(self, request):
+        if request.url.path.endswith("/query"):
+            outcome = next_outcome(self.query_outcomes)
+            self.log.append("query" if outcome == "ok" else f"query{outcome}")
+            if outcome != "ok":
+                return failure(outcome, request)
+            key = json.loads(request.content)["filter"]["rich_text"]["equals"]
+            visible = time.monotonic() - self.lag
+            results = [page for created, page in self.pages
+                       if created <= visible and page["key"] == key]
+            return httpx.Response(200, json={"object": "list", "results": results,
+                                             "has_more": False, "next_cursor": None})
+        outcome = next_outcome(self.outcomes)
+        self.log.append(outcome)
+        properties = json.loads(request.content)["properties"]
+        page = {"object": "page", "id": f"page-{len(self.pages)}",
+                "key": properties["Key"]["rich_text"][0]["text"]["content"]}
+        if outcome in ("ok", "lost", "lost5xx"):
+            self.pages.append((time.monotonic(), page))
+        if outcome == "ok":
+            return httpx.Response(200, json=page)
+        return failure({"lost": "timeout", "lost5xx": "5xx"}.get(outcome, outcome), request)
+
+    async def async_handle(self, request):
+        return self.handle(request)
+
+
+def next_outcome(outcomes):
+    return outcomes.pop(0) if len(outcomes) > 1 else outcomes[0]
+
+
+def failure(outcome, request):
+    if outcome == "timeout":
+        raise httpx.ReadTimeout("timed out", request=request)
+    if outcome == "5xx":
+        return httpx.Response(502, text="bad gateway")
+    if outcome == "429":
+        return httpx.Response(429, json={"object": "error", "code": "rate_limited",
+                                         "message": "slow down"})
+    return httpx.Response(400, json={"object": "error", "code": "validation_error",
+                                     "message": "invalid"})
+
+
+def create(database, **kwargs):
+    client = Client(auth="secret_check",
+                    client=httpx.Client(transport=httpx.MockTransport(database.handle)))
+    try:
+        return helpers.create_page_idempotently(
+            client, KEY, key_property="Key", parent={"database_id": "db"},
+            properties={"Name": {"title": []}}, **kwargs,
+        )
+    except Exception as error:
+        return error
+
+
+def check_outcomes(lag):
+    check(KEY == helpers.idempotency_key("2024-05-01", "Morning Routine", "7:30-8:00 AM")
+          and len(KEY) == 32, "idempotency keys are stable, 32 characters long")
+
+    database = Database(["lost"], lag)
+    page = create(database)
+    check(page["id"] == "page-0" and len(database.pages) == 1
+          and database.log == ["lost", "query"],
+          "a lost response is found by its key, after the query index catches up")
+
+    database = Database(["timeout", "ok"], lag)
+    page = create(database)
+    check(page["id"] == "page-0" and len(database.pages) == 1
+          and database.log == ["timeout", "query", "ok"],
+          "a create that timed out before reaching the database is sent again")
+
+    database = Database(["lost5xx"], lag)
+    page = create(database)
+    check(page["id"] == "page-0" and len(database.pages) == 1,
+          "a page created behind a 5xx response is found by its key")
+
+    database = Database(["5xx"], lag)
+    error = create(database)
+    check(isinstance(error, HTTPResponseError) and not database.pages
+          and database.log == ["5xx", "query"] * 3,
+          "the last error is raised once the attempts are exhausted")
+
+    database = Database(["timeout"], lag)
+    error = create(database, max_attempts=1)
+    check(isinstance(error, RequestTimeoutError), "max_attempts=1 sends a single create")
+
+    for query_outcome in ("timeout", "5xx", "429"):
+        database = Database(["lost"], lag, query_outcomes=[query_outcome, "ok"])
+        page = create(database)
+        if not (page["id"] == "page-0" and len(database.pages) == 1
+                and database.log == ["lost", f"query{query_outcome}", "query"]):
+            check(False, f"a key query failing with {query_outcome} is tried again")
+    check(True, "key queries failing with a timeout, a 5xx or a 429 are tried again")
+
+    database = Database(["lost"], lag, query_outcomes=["5xx"])
+    error = create(database)
+    check(isinstance(error, HTTPResponseError) and len(database.pages) == 1
+          and database.log == ["lost"] + ["query5xx"] * 3,
+          "a key query that keeps failing never lets a second create through")
+
+    database = Database(["429", "ok"], lag)
+    page = create(database)
+    check(page["id"] == "page-0" and database.log == ["429", "ok"],
+          "a rate limited create is sent again, without a key query")
+
+    database = Database(["4xx"], lag)
+    error = create(database)
+    check(isinstance(error, APIResponseError) and database.log == ["4xx"],
+          "other errors are raised at once, without a query")
+
+
+async def check_async(lag):
+    database = Database(["timeout", "lost"], lag)
+    client = AsyncClient(auth="secret_check", client=httpx.AsyncClient(
+        transport=httpx.MockTransport(database.async_handle)))
+    page = await helpers.async_create_page_idempotently(
+        client, KEY, key_property="Key", parent={"database_id": "db"},
+        properties={"Name": {"title": []}},
+    )
+    check(page["id"] == "page-0" and len(database.pages) == 1
+          and database.log == ["timeout", "query", "lost", "query"],
+          "the async helper behaves the same")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lag", type=float, default=0.05,
+                        help="seconds before a created page shows up in queries")
+    parser.add_argument("--attempts", type=int, default=3)
+    args = parser.parse_args()
+
+    helpers.IDEMPOTENT_CREATE_BACKOFF = args.lag * 1.5
+    check_outcomes(args.lag)
+    asyncio.run(check_async(args.lag))
+
+    print(f"\nresponses of every create lost, query index {args.lag * 1e3:.0f} ms behind")
+    print(f"{'backoff (ms)':<14}{'creates':>9}{'pages':>7}{'time (s)':>10}")
+    for factor in (0.0, 0.25, 0.5, 1.5):
+        helpers.IDEMPOTENT_CREATE_BACKOFF = args.lag * factor
+        database = Database(["lost"], args.lag)
+        start = time.perf_counter()
+        create(database, max_attempts=args.attempts)
+        elapsed = time.perf_counter() - start
+        creates = len(database.log) - database.log.count("query")
+        print(f"{helpers.IDEMPOTENT_CREATE_BACKOFF * 1e3:<14.0f}{creates:>9}"
+              f"{len(database.pages):>7}{elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
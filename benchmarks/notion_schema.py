@@ -0,0 +1,122 @@
+"""Benchmark local schema validation of Notion page properties
+
+Sends the 17 events of a day to a mock database whose "Time" property is a
+number, so every create is rejected with validation_error after a fixed
+latency, and compares it with checking the same payloads against the cached
+schema first (one databases.retrieve, then no create at all). Also times
+encoding a payload that matches:
+
+    python benchmarks/notion_schema.py [--events 17] [--latency 0.35]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import httpx  # noqa: E402
+
+from notion_client import APIResponseError, Client  # noqa: E402
+from notion_client.errors import SchemaValidationError  # noqa: E402
+from notion_client.schema import DatabaseSchema, SchemaCache  # noqa: E402
+
+DATABASE = {
+    "object": "database",
+    "id": "9bc30ad4-9373-46a5-84ab-0a7845ee52e6",
+    "properties": {
+        "Name": {"id": "title", "type": "title", "title": {}},
+        "Date": {"id": "%3AdPp", "type": "date", "date": {}},
+        "Time": {"id": "b%5Dq%3E", "type": "number", "number": {}},
+        "Details": {"id": "dQ%7Bf", "type": "rich_text", "rich_text": {}},
+        "Color": {"id": "m%3B%7D%7C", "type": "rich_text", "rich_text": {}},
+    },
+}
+
+
+def text(content):
+    return {"rich_text": [{"text": {"content": content}}]}
+
+
+def event_properties(index):
+    return {
+        "Name": {"title": [{"text": {"content": f"Event {index}"}}]},
+        "Date": {"date": {"start": "2024-05-01"}},
+        "Time": text(f"{7 + index % 12}:00-{8 + index % 12}:00 AM"),
+        "Details": text("Details of the event " * 5),
+        "Color": text("blue"),
+    }
+
+
+def make_client(latency, requests):
+    lock = threading.Lock()
+
+    def handler(request):
+        time.sleep(latency)
+        with lock:
+            requests.append(request.method)
+        if request.method == "GET":
+            return httpx.Response(200, json=DATABASE)
+        return httpx.Response(400, json={
+            "object": "error", "status": 400, "code": "validation_error",
+            "message": "Time is expected to be number.",
+        })
+
+    return Client(auth="secret_benchmark",
+                  client=httpx.Client(transport=httpx.MockTransport(handler)))
+
+
+def send_all(client, payloads):
+    failures = 0
+    for properties in payloads:
+        try:
+            client.pages.create(parent={"database_id": DATABASE["id"]}, properties=properties)
+        except APIResponseError:
+            failures += 1
+    return failures
+
+
+def check_first(client, payloads):
+    schema = SchemaCache().get(client, DATABASE["id"])
+    failures = 0
+    for properties in payloads:
+        try:
+            schema.encode(properties)
+        except SchemaValidationError:
+            failures += 1
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=17)
+    parser.add_argument("--latency", type=float, default=0.35, help="seconds per response")
+    args = parser.parse_args()
+
+    payloads = [event_properties(index) for index in range(args.events)]
+    print(f"{args.events} events, {args.latency * 1e3:.0f} ms latency, mismatched schema")
+    print(f"{'':<14}{'requests':>10}{'rejected':>10}{'time (s)':>10}")
+    for name, function in (("send all", send_all), ("check first", check_first)):
+        requests = []
+        client = make_client(args.latency, requests)
+        start = time.perf_counter()
+        failures = function(client, payloads)
+        elapsed = time.perf_counter() - start
+        if failures != args.events:
+            raise SystemExit(f"{name} rejected {failures} of {args.events} events")
+        print(f"{name:<14}{len(requests):>10}{failures:>10}{elapsed:>10.2f}")
+
+    matching = dict(DATABASE, properties=dict(
+        DATABASE["properties"], Time={"id": "b%5Dq%3E", "type": "rich_text", "rich_text": {}}
+    ))
+    schema = DatabaseSchema(matching)
+    number = 20000
+    elapsed = min(timeit.repeat(lambda: schema.encode(payloads[0]), number=number, repeat=5))
+    print(f"encoding a matching payload: {elapsed / number * 1e6:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
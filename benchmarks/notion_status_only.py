@@ -0,0 +1,88 @@
+"""Benchmark status-only parsing of Notion write responses
+
+Parses the response of a block children append (the list of the appended
+blocks, as main.py sends checklists) and of a page archive, the default way
+(decode the JSON body) and with status_only=True (check the status, decode
+nothing until a member is read). Both must agree on the body:
+
+    python benchmarks/notion_status_only.py [--blocks 100] [--number 2000]
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import httpx  # noqa: E402
+
+from notion_client import Client  # noqa: E402
+
+
+def to_do_block(index):
+    content = f"7:{index % 60:02d} AM: checklist item {index} with some details"
+    return {
+        "object": "block",
+        "id": f"{index:08x}-9373-46a5-84ab-0a7845ee52e6",
+        "parent": {"type": "page_id", "page_id": "9bc30ad4-9373-46a5-84ab-0a7845ee52e6"},
+        "created_time": "2024-05-01T08:00:00.000Z",
+        "last_edited_time": "2024-05-01T08:00:00.000Z",
+        "created_by": {"object": "user", "id": "2b1d8e4a-6a33-4d1b-8c52-1e4c4a2f3b9e"},
+        "last_edited_by": {"object": "user", "id": "2b1d8e4a-6a33-4d1b-8c52-1e4c4a2f3b9e"},
+        "has_children": False,
+        "archived": False,
+        "in_trash": False,
+        "type": "to_do",
+        "to_do": {
+            "rich_text": [{
+                "type": "text",
+                "text": {"content": content, "link": None},
+                "annotations": {"bold": False, "italic": False, "strikethrough": False,
+                                "underline": False, "code": False, "color": "default"},
+                "plain_text": content,
+                "href": None,
+            }],
+            "checked": False,
+            "color": "default",
+        },
+    }
+
+
+def responses(blocks):
+    append = {"object": "list", "results": [to_do_block(index) for index in range(blocks)],
+              "next_cursor": None, "has_more": False, "type": "block", "block": {}}
+    archive = dict(to_do_block(0), object="page", archived=True)
+    return {"append": json.dumps(append).encode(), "archive": json.dumps(archive).encode()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=100, help="blocks in the append response")
+    parser.add_argument("--number", type=int, default=2000, help="parses per timing")
+    args = parser.parse_args()
+
+    client = Client(auth="secret_benchmark")
+    request = client._build_request("PATCH", "blocks/benchmark/children")
+    print(f"{'':<10}{'mode':<14}{'bytes':>8}{'µs/parse':>10}{'peak (KiB)':>12}")
+    for name, body in responses(args.blocks).items():
+        def parse(status_only):
+            response = httpx.Response(200, content=body, request=request)
+            return client._parse_response(response, status_only)
+
+        if parse(False) != dict(parse(True)):
+            raise SystemExit(f"status_only gave a different {name} body")
+        for mode, status_only in (("json", False), ("status_only", True)):
+            elapsed = min(timeit.repeat(lambda: parse(status_only), number=args.number, repeat=5))
+            tracemalloc.start()
+            parse(status_only)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{name:<10}{mode:<14}{len(body):>8}{elapsed / args.number * 1e6:>10.1f}"
+                  f"{peak / 1024:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
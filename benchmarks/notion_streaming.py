@@ -0,0 +1,127 @@
+"""Benchmark streamed decoding of Notion query responses
+
+Decodes a database query response of full page objects, arriving in chunks,
+with response.json() (the whole body, then the whole dict) and with
+StreamedList (one page at a time as the chunks arrive). Each page is handed to
+a consumer that only keeps its id, so the streamed peak stays around one page.
+Both must see the same pages, next_cursor and has_more:
+
+    python benchmarks/notion_streaming.py [--pages 100] [--chunk 16384]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import httpx  # noqa: E402
+
+from notion_client.streaming import StreamedList  # noqa: E402
+
+
+def make_page(index):
+    """A page of the calendar database, about 3 KB of JSON like the real ones"""
+    text = lambda content: [{  # noqa: E731
+        "type": "text",
+        "text": {"content": content, "link": None},
+        "annotations": {"bold": False, "italic": False, "strikethrough": False,
+                        "underline": False, "code": False, "color": "default"},
+        "plain_text": content,
+        "href": None,
+    }]
+    return {
+        "object": "page",
+        "id": f"{index:08x}-9373-46a5-84ab-0a7845ee52e6",
+        "created_time": "2024-05-01T08:00:00.000Z",
+        "last_edited_time": "2024-05-01T08:00:00.000Z",
+        "created_by": {"object": "user", "id": "2b1d8e4a-6a33-4d1b-8c52-1e4c4a2f3b9e"},
+        "last_edited_by": {"object": "user", "id": "2b1d8e4a-6a33-4d1b-8c52-1e4c4a2f3b9e"},
+        "cover": None,
+        "icon": None,
+        "parent": {"type": "database_id", "database_id": "9bc30ad4-9373-46a5-84ab-0a7845ee52e6"},
+        "archived": False,
+        "in_trash": False,
+        "properties": {
+            "Name": {"id": "title", "type": "title", "title": text(f"Event {index} – planning")},
+            "Date": {"id": "%3AdPp", "type": "date",
+                     "date": {"start": "2024-05-01", "end": None, "time_zone": None}},
+            "Time": {"id": "b%5Dq%3E", "type": "rich_text", "rich_text": text("7:30-8:00 AM")},
+            "Details": {"id": "dQ%7Bf", "type": "rich_text", "rich_text": text("Details " * 40)},
+            "Category": {"id": "m%3B%7D%7C", "type": "select",
+                         "select": {"id": "a3c5", "name": "Work", "color": "blue"}},
+        },
+        "url": f"https://www.notion.so/Event-{index:08x}9373",
+        "public_url": None,
+    }
+
+
+def make_body(pages):
+    return json.dumps({
+        "object": "list",
+        "results": [make_page(index) for index in range(pages)],
+        "next_cursor": "e6c6f5ff-8b5c-4c2a-8f2b-7b6c2a2e8a11",
+        "has_more": True,
+        "type": "page_or_database",
+        "page_or_database": {},
+        "request_id": "7c2d9a1e-5b3f-4f5e-9a7d-0c6e2b1d4f8a",
+    }).encode()
+
+
+def response(body, chunk):
+    return httpx.Response(200, content=iter(
+        [body[start:start + chunk] for start in range(0, len(body), chunk)]
+    ))
+
+
+def with_json(body, chunk):
+    data = response(body, chunk)
+    data.read()
+    decoded = data.json()
+    ids = [page["id"] for page in decoded.get("results")]
+    return ids, decoded.get("next_cursor"), decoded.get("has_more")
+
+
+def with_stream(body, chunk):
+    streamed = StreamedList(response(body, chunk))
+    ids = [page["id"] for page in streamed.get("results")]
+    return ids, streamed.get("next_cursor"), streamed.get("has_more")
+
+
+def measure(function, body, chunk, repeat=5):
+    """Best wall time, and peak traced allocation, of one decode"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(body, chunk)
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    function(body, chunk)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=100, help="pages per response (Notion's maximum is 100)")
+    parser.add_argument("--chunk", type=int, default=16384, help="bytes per network chunk")
+    args = parser.parse_args()
+
+    body = make_body(args.pages)
+    if with_json(body, args.chunk) != with_stream(body, args.chunk):
+        raise SystemExit("streamed decoding gave different results")
+
+    # Measured without the body itself, which both variants are handed
+    print(f"{args.pages} pages, {len(body) / 1024:.0f} KiB body, {args.chunk} byte chunks")
+    print(f"{'':<16}{'time (ms)':>12}{'peak (KiB)':>12}")
+    for name, function in (("response.json()", with_json), ("StreamedList", with_stream)):
+        elapsed, peak = measure(function, body, args.chunk)
+        print(f"{name:<16}{elapsed * 1e3:>12.2f}{peak / 1024:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
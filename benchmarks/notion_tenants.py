@@ -0,0 +1,299 @@
+"""Check and benchmark the multi-tenant runner of main.py
+
+Checks the token buckets of notion_client.ratelimit: a burst goes out at once,
+later requests are spaced by the rate, a `rate_limited` response holds back the
+token's requests for the Retry-After delay, and every token has a bucket of its
+own, so one tenant's requests never wait on another's. Then checks that
+load_tenants validates the roster, that the Lambda handler answers a bad one
+with a 500, that a dry run plans each tenant against its own snapshot, and
+that run_tenants sends each tenant's requests with its own token to its own
+database, over one shared client. Then times the daily refresh of several
+tenants against a mock Notion, one tenant after the other and with run_tenants:
+
+    python benchmarks/notion_tenants.py [--tenants 4] [--latency 0.02] [--rate 30]
+"""
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import httpx  # noqa: E402
+
+import main as automation  # noqa: E402
+from notion_client import Client  # noqa: E402
+from notion_client.ratelimit import (  # noqa: E402
+    RateLimiter,
+    RateLimiterRegistry,
+    parse_retry_after,
+)
+
+DATABASE = {
+    "object": "database",
+    "properties": {
+        "Name": {"id": "title", "type": "title", "title": {}},
+        "Date": {"id": "date", "type": "date", "date": {}},
+        "Time": {"id": "time", "type": "rich_text", "rich_text": {}},
+        "Details": {"id": "details", "type": "rich_text", "rich_text": {}},
+        "Category": {"id": "category", "type": "select", "select": {"options": []}},
+        "Color": {"id": "color", "type": "rich_text", "rich_text": {}},
+    },
+}
+
+
+def check(condition, message):
+    if not condition:
+        raise SystemExit(f"FAILED: {message}")
+    print(f"ok    {message}")
+
+
+class Notion:
+    """A mock Notion answering after `latency` seconds, which logs who asked for what.
+
+    Every database holds one page of an earlier day, which the refresh archives.
+    Page ids start with the id of their database.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.log = []
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+    def handle(self, request):
+        time.sleep(self.latency)
+        path = request.url.path
+        with self._lock:
+            self.log.append((request.headers["authorization"], request.method, path,
+                             request.content))
+            number = next(self._ids)
+        if path.endswith("/query"):
+            return httpx.Response(200, json={
+                "object": "list", "has_more": False, "next_cursor": None,
+                "results": [{"object": "page", "id": f"{path.split('/')[3]}-old",
+                             "properties": {"Date": {"date": {"start": "2000-01-01"}}}}],
+            })
+        if request.method == "GET" and path.startswith("/v1/databases/"):
+            return httpx.Response(200, json=dict(DATABASE, id=path.rsplit("/", 1)[-1]))
+        if path == "/v1/pages":
+            database = json.loads(request.content)["parent"]["database_id"]
+            return httpx.Response(200, json={"object": "page", "id": f"{database}-{number}"})
+        return httpx.Response(200, json={"object": "ok"})
+
+
+class Throttled:
+    """A mock Notion answering `rate_limited` once, with a Retry-After delay"""
+
+    def __init__(self, retry_after):
+        self.retry_after = retry_after
+        self.sent = {}
+
+    def handle(self, request):
+        token = request.headers["authorization"]
+        self.sent.setdefault(token, []).append(time.monotonic())
+        if self.retry_after is not None:
+            retry_after, self.retry_after = self.retry_after, None
+            return httpx.Response(429, headers={"Retry-After": str(retry_after)}, json={
+                "object": "error", "status": 429, "code": "rate_limited",
+                "message": "slow down"})
+        return httpx.Response(200, json={"object": "user", "id": "me"})
+
+
+def timed(call):
+    start = time.perf_counter()
+    call()
+    return time.perf_counter() - start
+
+
+def check_limiter():
+    limiter = RateLimiter(rate=10, burst=3)
+    check([limiter.reserve() for _ in range(3)] == [0.0] * 3,
+          "a burst of requests goes out at once")
+    check(abs(limiter.reserve() - 0.1) < 0.01 and abs(limiter.reserve() - 0.2) < 0.01,
+          "later requests are spaced by the rate, in the order they asked")
+    check(not limiter.try_acquire(), "try_acquire fails while the bucket is empty")
+
+    limiter = RateLimiter(rate=10, burst=3)
+    limiter.pause(0.5)
+    check(abs(limiter.reserve() - 0.6) < 0.01,
+          "a pause holds back the next request for the delay Notion asked")
+
+    check(parse_retry_after("2") == 2.0 and parse_retry_after("0.5") == 0.5
+          and parse_retry_after(None) is None and parse_retry_after("-1") is None
+          and parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") is None,
+          "Retry-After is read as seconds; dates and negative numbers are ignored")
+
+    registry = RateLimiterRegistry(rate=3)
+    check(registry.get("alice") is registry.get("alice")
+          and registry.get("alice") is not registry.get("bob")
+          and registry.get("alice").burst == 3,
+          "every token gets one limiter, with a burst of a second's requests")
+
+    try:
+        RateLimiter(rate=0)
+        check(False, "the rate is validated")
+    except ValueError:
+        check(True, "the rate is validated")
+
+
+def check_client():
+    server = Throttled(retry_after=None)
+    client = Client(auth="secret_alice", rate_limit=20, rate_limit_burst=1,
+                    client=httpx.Client(transport=httpx.MockTransport(server.handle)))
+    elapsed = timed(lambda: [client.users.me(auth=token)
+                             for _ in range(5) for token in ("secret_alice", "secret_bob")])
+    check(0.18 < elapsed < 0.3,
+          "requests of two tokens are spaced per token, not across tokens")
+
+    server = Throttled(retry_after=0.3)
+    client = Client(auth="secret_alice", rate_limit=20,
+                    client=httpx.Client(transport=httpx.MockTransport(server.handle)))
+    try:
+        client.users.me()
+    except Exception:
+        pass
+    check(timed(lambda: client.users.me(auth="secret_bob")) < 0.05,
+          "a token's rate_limited response doesn't hold back other tokens")
+    client.users.me()
+    alice = server.sent["Bearer secret_alice"]
+    check(alice[-1] - alice[0] >= 0.29,
+          "the rate limited token waits for the Retry-After delay")
+
+
+def check_roster():
+    event = {"tenants": [
+        {"name": "alice", "token": "secret_alice", "database_id": "db-alice",
+         "timezone": "Europe/Berlin"},
+        {"token": "secret_bob", "database_id": "db-bob"},
+    ]}
+    alice, bob = automation.load_tenants(event)
+    check(alice.timezone.zone == "Europe/Berlin" and alice.schedule == "default"
+          and bob.name == "db-bob" and bob.timezone is automation.TIMEZONE,
+          "the roster fills in names, timezones and schedules")
+    for entry, problem in (
+        ({"name": "carol", "token": "secret_carol"}, "a tenant without a database"),
+        ({"name": "carol", "token": "secret_carol", "database_id": "db",
+          "schedule": "weekends"}, "an unknown schedule"),
+        ({"name": "carol", "token": "secret_carol", "database_id": "db",
+          "timezone": "Mars/Olympus"}, "an unknown timezone"),
+    ):
+        try:
+            automation.load_tenants({"tenants": [entry]})
+            check(False, f"{problem} is rejected")
+        except ValueError:
+            check(True, f"{problem} is rejected")
+    if not automation.CONFIG.tenants_file:
+        check(automation.load_tenants({}) == [], "without a roster there are no tenants")
+
+    for event in ({"tenants": [{"name": "carol", "token": "secret_carol"}]},
+                  {"tenants": [{"name": "carol", "token": "secret_carol"}], "dry_run": True},
+                  {"tenants": ["carol"]}):
+        response = quietly(lambda: automation.lambda_handler(event, None))
+        if response["statusCode"] != 500 or not response["body"].startswith("Error: "):
+            check(False, f"the handler answers a bad roster with a 500 ({event})")
+    check(True, "the handler answers a bad roster with a 500, dry run or not")
+
+
+def check_dry_run():
+    roster = [{"name": name, "token": f"secret_{name}", "database_id": f"db-{name}"}
+              for name in ("alice", "bob")]
+    old = {"object": "page", "properties": {"Date": {"date": {"start": "2000-01-01"}}}}
+    with tempfile.TemporaryDirectory() as directory:
+        paths = {}
+        for name, pages in (("alice", 250), ("bob", 0)):
+            paths[f"db-{name}"] = os.path.join(directory, f"{name}.json")
+            with open(paths[f"db-{name}"], "w") as f:
+                json.dump([dict(old, id=f"{name}-{index}") for index in range(pages)], f)
+
+        response = automation.lambda_handler(
+            {"tenants": roster, "dry_run": True, "snapshot": paths}, None)
+        archives = {plan["tenant"]: sum(op["kind"] == "archive" for op in plan["operations"])
+                    for plan in response["plans"]}
+        check(response["statusCode"] == 200 and archives == {"alice": 250, "bob": 0},
+              "a dry run plans every tenant against its own snapshot")
+
+        for snapshot, problem in ((paths["db-alice"], "one snapshot path for several tenants"),
+                                  ({"db-carol": paths["db-bob"]}, "a snapshot of no tenant"),
+                                  (os.path.join(directory, "missing.json"),
+                                   "a missing snapshot")):
+            event = {"tenants": roster[:1] if problem == "a missing snapshot" else roster,
+                     "dry_run": True, "snapshot": snapshot}
+            response = quietly(lambda: automation.lambda_handler(event, None))
+            check(response["statusCode"] == 500, f"{problem} is answered with a 500")
+
+
+def tenants(count, run):
+    return [
+        automation.Tenant(name=f"tenant{index}", token=f"secret_tenant{index}",
+                          database_id=f"db-{run}-{index}")
+        for index in range(count)
+    ]
+
+
+def use(notion, rate):
+    automation.notion = Client(auth="secret_default", rate_limit=rate,
+                               client=httpx.Client(transport=httpx.MockTransport(notion.handle)))
+
+
+def quietly(call):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return call()
+
+
+def check_run_tenants():
+    notion = Notion()
+    use(notion, rate=None)
+    roster = tenants(3, "check")
+    results = quietly(lambda: automation.run_tenants(roster))
+    check(all(result["ok"] and result["created"] for result in results)
+          and [result["tenant"] for result in results] == [t.name for t in roster],
+          "run_tenants reports every tenant, in roster order")
+
+    for tenant in roster:
+        database = tenant.database_id.encode()
+        sent = [(method, path, content) for auth, method, path, content in notion.log
+                if auth == f"Bearer {tenant.token}"]
+        check(sent and all(database in path.encode() + content for method, path, content in sent),
+              f"{tenant.name}'s requests carry its token and reach its database only")
+    check(all(auth != "Bearer secret_default" for auth, *_ in notion.log),
+          "no request falls back to the default token")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tenants", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds per response")
+    parser.add_argument("--rate", type=float, default=30.0,
+                        help="requests per second of each token")
+    args = parser.parse_args()
+
+    check_limiter()
+    check_client()
+    check_roster()
+    check_dry_run()
+    check_run_tenants()
+
+    print(f"\n{args.tenants} tenants, {args.latency * 1e3:.0f} ms latency, "
+          f"{args.rate:g} requests/s per token")
+    print(f"{'':<20}{'requests':>10}{'time (s)':>10}")
+    for name, run in (
+        ("one after another", lambda roster: [automation.process_tenant(t) for t in roster]),
+        ("run_tenants", automation.run_tenants),
+    ):
+        notion = Notion(args.latency)
+        use(notion, args.rate)
+        roster = tenants(args.tenants, name)
+        elapsed = timed(lambda: quietly(lambda: run(roster)))
+        print(f"{name:<20}{len(notion.log):>10}{elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""Check and benchmark the per-phase timeouts of notion_client
+
+Checks that the phase timeouts of ClientOptions default to timeout_ms, that
+every endpoint method passes its `timeout_ms` on to its request, a number
+setting every phase and a dict only the phases it names, and that unknown
+phases are rejected before anything is sent. Then, against a local server that
+never answers, times how long a request waits for the only connection of the
+pool while another request hangs on it. With one timeout for every phase it
+waits for the other request to time out, then times out reading itself; with a
+short pool timeout it fails at once:
+
+    python benchmarks/notion_timeouts.py [--timeout 1.0] [--pool-timeout 0.05]
+"""
+import argparse
+import inspect
+import os
+import socket
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import httpx  # noqa: E402
+
+from notion_client import Client  # noqa: E402
+from notion_client.errors import RequestTimeoutError  # noqa: E402
+
+
+def check(condition, message):
+    if not condition:
+        raise SystemExit(f"FAILED: {message}")
+    print(f"ok    {message}")
+
+
+class Recorder:
+    """A mock Notion recording the timeouts of the requests it gets"""
+
+    def __init__(self):
+        self.timeouts = []
+
+    def handle(self, request):
+        self.timeouts.append(request.extensions["timeout"])
+        return httpx.Response(200, json={"object": "list", "results": [],
+                                         "has_more": False, "next_cursor": None})
+
+
+def endpoint_methods(client):
+    """Every endpoint method of `client`, with placeholder ids for its arguments"""
+    endpoints = [client.blocks, client.blocks.children, client.databases, client.pages,
+                 client.pages.properties, client.users, client.comments]
+    for endpoint in endpoints:
+        for name, method in inspect.getmembers(endpoint, inspect.ismethod):
+            if name.startswith("_"):
+                continue
+            ids = [parameter for parameter in inspect.signature(method).parameters.values()
+                   if parameter.kind is parameter.POSITIONAL_OR_KEYWORD]
+            yield (f"{type(endpoint).__name__}.{name}", method,
+                   [f"{index:032x}" for index in range(len(ids))])
+    yield "SearchEndpoint.__call__", client.search, []
+
+
+def check_options():
+    client = Client(timeout_ms=60_000, connect_timeout_ms=10_000, pool_timeout_ms=10_000)
+    check(client.client.timeout == httpx.Timeout(60, connect=10, pool=10),
+          "phases without a timeout of their own wait timeout_ms")
+    check(Client(timeout_ms=5_000).client.timeout == httpx.Timeout(5),
+          "timeout_ms alone applies to every phase")
+
+
+def check_overrides():
+    server = Recorder()
+    client = Client(auth="secret_check", timeout_ms=60_000, connect_timeout_ms=10_000,
+                    client=httpx.Client(transport=httpx.MockTransport(server.handle)))
+    default = {"connect": 10, "read": 60, "write": 60, "pool": 60}
+
+    missed = []
+    methods = list(endpoint_methods(client))
+    for name, method, ids in methods:
+        server.timeouts.clear()
+        method(*ids, timeout_ms=2_000)
+        if server.timeouts != [dict.fromkeys(default, 2)]:
+            missed.append(name)
+    check(not missed, f"all {len(methods)} endpoint methods pass a numeric timeout_ms "
+                      "to every phase"
+                      + (f" (not {', '.join(missed)})" if missed else ""))
+
+    server.timeouts.clear()
+    client.databases.query("db", timeout_ms={"read": 120_000})
+    client.pages.update("page", archived=True, timeout_ms={"read": 5_000, "write": None})
+    client.users.me()
+    check(server.timeouts == [
+        dict(default, read=120),
+        dict(default, read=5, write=None),
+        default,
+    ], "a dict overrides only the phases it names, None waits forever, "
+       "and the next call has the client's timeouts again")
+
+    server.timeouts.clear()
+    try:
+        client.pages.update("page", archived=True, timeout_ms={"total": 1_000})
+        check(False, "unknown phases are rejected")
+    except ValueError:
+        check(not server.timeouts, "unknown phases are rejected before anything is sent")
+
+
+class Silent:
+    """A local server that accepts connections and reads requests, but never answers"""
+
+    def __init__(self):
+        self.socket = socket.create_server(("127.0.0.1", 0))
+        self.port = self.socket.getsockname()[1]
+        self.connections = []
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                connection, _ = self.socket.accept()
+            except OSError:
+                return
+            self.connections.append(connection)
+
+    def close(self):
+        self.socket.close()
+        for connection in self.connections:
+            connection.close()
+
+
+def waiting_for_the_pool(port, timeout, pool_timeout):
+    """Whether a request for a pool whose only connection hangs on a read timed
+    out, and after how many seconds"""
+    client = Client(auth="secret_benchmark", base_url=f"http://127.0.0.1:{port}",
+                    timeout_ms=timeout * 1_000, max_connections=1,
+                    pool_timeout_ms=pool_timeout * 1_000 if pool_timeout else None)
+    hanging = threading.Thread(target=lambda: timed_out(client.users.me))
+    hanging.start()
+    time.sleep(0.05)
+    start = time.perf_counter()
+    failed = timed_out(client.users.me)
+    elapsed = time.perf_counter() - start
+    hanging.join()
+    client.close()
+    return failed, elapsed
+
+
+def timed_out(call):
+    try:
+        call()
+    except RequestTimeoutError:
+        return True
+    return False
+
+
+def check_pool_timeout(server):
+    failed, elapsed = waiting_for_the_pool(server.port, timeout=1.0, pool_timeout=0.05)
+    check(failed and elapsed < 0.5,
+          "a short pool timeout fails fast while the only connection hangs on a read")
+    client = Client(auth="secret_check", base_url=f"http://127.0.0.1:{server.port}",
+                    timeout_ms=5_000)
+    start = time.perf_counter()
+    failed = timed_out(lambda: client.users.me(timeout_ms={"read": 100}))
+    check(failed and time.perf_counter() - start < 1.0,
+          "a per-call read timeout ends a read the client would wait longer on")
+    client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--timeout", type=float, default=1.0,
+                        help="seconds of the single timeout, standing for timeout_ms")
+    parser.add_argument("--pool-timeout", type=float, default=0.05,
+                        help="seconds of the pool timeout")
+    args = parser.parse_args()
+
+    server = Silent()
+    check_options()
+    check_overrides()
+    check_pool_timeout(server)
+
+    print("\nwaiting for the only connection of the pool, busy with a hanging read")
+    print(f"{'':<22}{'timed out':>10}{'after (s)':>11}")
+    for name, pool_timeout in (("single timeout", None),
+                               ("short pool timeout", args.pool_timeout)):
+        failed, elapsed = waiting_for_the_pool(server.port, args.timeout, pool_timeout)
+        print(f"{name:<22}{str(failed):>10}{elapsed:>11.2f}")
+    server.close()
+
+
+if __name__ == "__main__":
+    main()
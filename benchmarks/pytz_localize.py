@@ -0,0 +1,137 @@
+"""Check and benchmark pytz localize_many/normalize_many against per-call localize
+
+First checks that the batch methods give exactly what calling localize() and
+normalize() on each datetime gives (same instants, same tzinfo instances, same
+errors), on random times and on the wall times around every DST transition,
+including ambiguous and non-existent ones, for each is_dst. Then times a
+horizon's worth of event start and end times in several tenant timezones:
+
+    python benchmarks/pytz_localize.py [--days 365] [--seed 0]
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pytz  # noqa: E402
+
+ZONES = [
+    "Asia/Kolkata",
+    "Europe/Berlin",
+    "America/New_York",
+    "Australia/Lord_Howe",  # 30 minute DST
+    "Europe/Warsaw",  # clocks wound back with no change of is_dst (1915)
+    "America/St_Johns",
+    "UTC",
+]
+
+# Event times of a day, in minutes after midnight (as schedules give them)
+EVENT_MINUTES = [0, 90, 120, 150, 180, 450, 480, 540, 720, 780, 1020, 1080, 1290, 1380, 1439]
+
+
+def outcome(function, *args):
+    """The result of a call, or the type of the error it raised"""
+    try:
+        return function(*args)
+    except Exception as e:
+        return type(e)
+
+
+def same(expected, got):
+    """Equal instants, with the same tzinfo instance and fold"""
+    return (
+        expected == got and expected.tzinfo is got.tzinfo
+        and expected.replace(tzinfo=None) == got.replace(tzinfo=None)
+        and expected.fold == got.fold
+    )
+
+
+def sample_times(zone, rng, count):
+    """Random naive times, plus the wall times around each transition"""
+    times = [
+        datetime(1850, 1, 1) + timedelta(seconds=rng.randrange(190 * 365 * 86400), microseconds=rng.randrange(10 ** 6))
+        for _ in range(count)
+    ]
+    for index, utc in enumerate(getattr(zone, "_utc_transition_times", None) or []):
+        if not datetime(1850, 1, 1) < utc < datetime(2040, 1, 1):
+            continue
+        for inf in zone._transition_info[max(0, index - 1):index + 1]:
+            wall = utc + inf[0]
+            for minutes in (-90, -61, -60, -59, -30, -1, 0, 1, 29, 30, 59, 60, 61, 90):
+                times.append(wall + timedelta(minutes=minutes))
+    times.append(datetime(1, 1, 1))
+    times.append(datetime(9999, 12, 31, 23, 59))
+    rng.shuffle(times)
+    return times
+
+
+def check(zone, rng, count):
+    times = sample_times(zone, rng, count)
+    for is_dst in (False, True, None):
+        expected = [outcome(zone.localize, dt, is_dst) for dt in times]
+        valid = [dt for dt, result in zip(times, expected) if isinstance(result, datetime)]
+        results = [result for result in expected if isinstance(result, datetime)]
+        got = zone.localize_many(valid, is_dst)
+        if len(got) != len(results) or not all(map(same, results, got)):
+            raise SystemExit(f"{zone}: localize_many differs with is_dst={is_dst}")
+        if list(zone.localize_many(valid, is_dst, epoch=True)) != [dt.timestamp() for dt in results]:
+            raise SystemExit(f"{zone}: localize_many epochs differ with is_dst={is_dst}")
+        # Every datetime localize() rejects makes localize_many raise the same
+        for dt, result in zip(times, expected):
+            if not isinstance(result, datetime):
+                if outcome(zone.localize_many, [valid[0], dt], is_dst) is not result:
+                    raise SystemExit(f"{zone}: localize_many({dt}, {is_dst}) did not raise {result}")
+
+    # Aware datetimes whose tzinfo is out of date, from this zone and others
+    aware = []
+    for dt in results:
+        for other in (zone, pytz.timezone("America/Los_Angeles")):
+            try:
+                aware.append(dt.astimezone(other) + timedelta(minutes=rng.randrange(-6000, 6000)))
+            except OverflowError:
+                pass
+    expected = [outcome(zone.normalize, dt) for dt in aware]
+    aware = [dt for dt, result in zip(aware, expected) if isinstance(result, datetime)]
+    expected = [result for result in expected if isinstance(result, datetime)]
+    if not all(map(same, expected, zone.normalize_many(aware))):
+        raise SystemExit(f"{zone}: normalize_many differs")
+    if list(zone.normalize_many(aware, epoch=True)) != [dt.timestamp() for dt in expected]:
+        raise SystemExit(f"{zone}: normalize_many epochs differ")
+    return len(times), len(aware)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=365, help="horizon length")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--samples", type=int, default=20000, help="random times checked per zone")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    for name in ZONES:
+        checked, normalized = check(pytz.timezone(name), rng, args.samples)
+        print(f"{name:<22} {checked} localize and {normalized} normalize results match")
+
+    start = datetime(2025, 1, 1)
+    horizon = [
+        start + timedelta(days=day, minutes=minutes)
+        for day in range(args.days) for minutes in EVENT_MINUTES
+    ]
+    print(f"\n{len(horizon)} event times per zone{'':<6}{'per call':>12}{'batch':>12}   (milliseconds)")
+    for name in ZONES:
+        zone = pytz.timezone(name)
+        runs = {
+            "per call": lambda: [zone.normalize(zone.localize(dt)) for dt in horizon],
+            "batch": lambda: zone.normalize_many(zone.localize_many(horizon)),
+        }
+        timings = [min(timeit.repeat(run, number=1, repeat=5)) * 1e3 for run in runs.values()]
+        print(f"{name:<42}" + "".join(f"{timing:>12.2f}" for timing in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""Check and benchmark the schedule time grammar of main.py
+
+Checks compile_time_range on every form a schedule time takes, then parses
+every time of the week's schedules with it and with the split-based parser it
+replaced (copied below). The only difference allowed is the fix of ranges
+sharing a PM: "2:30-2:45 PM" used to start at 2:30 AM. Localized times must
+carry the zone's real offset and fall on real instants across DST changes,
+whether a day is localized time by time or, without a change of offset, in one
+go. Then times parsing a day's schedule the old way and the new way, for a new
+day every run and for warm runs on the same day, which hit the caches:
+
+    python benchmarks/schedule_times.py [--number 2000]
+"""
+import argparse
+import os
+import sys
+import timeit
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pytz  # noqa: E402
+
+import main as automation  # noqa: E402
+
+# Time string -> (start, end) in minutes after midnight
+GRAMMAR = {
+    "7:30-8:00 AM": (450, 480),
+    "2:30-2:45 PM": (870, 885),
+    "10:15-12:15 PM": (615, 735),
+    "11:30-12:30 AM": (1410, 1470),
+    "10:15 AM-12:15 PM": (615, 735),
+    "11:00 PM-1:00 AM": (1380, 1500),
+    "9:30 PM": (1290, 1350),
+    "12:00 AM": (0, 60),
+    "13:00-14:30": (780, 870),
+    " 7:30 - 8:00 am ": (450, 480),
+    "All day": (None, None),
+}
+
+
+def check(condition, message):
+    if not condition:
+        raise SystemExit(f"FAILED: {message}")
+    print(f"ok    {message}")
+
+
+def baseline_minutes(time_range):
+    """The (start, end) minutes parse_time_range gave before the grammar"""
+    def minutes(time_str):
+        hour, minute = map(int, time_str.replace(" AM", "").replace(" PM", "").split(":"))
+        if "PM" in time_str and hour != 12:
+            hour += 12
+        if "AM" in time_str and hour == 12:
+            hour = 0
+        return hour * 60 + minute
+
+    if "-" not in time_range:
+        start = minutes(time_range)
+        return start, start + 60
+    parts = time_range.split("-")
+    return minutes(parts[0].strip()), minutes(parts[1].strip())
+
+
+def baseline_parse(time_range, day, timezone):
+    """parse_time_range as it was, with the zone attached as tzinfo"""
+    start, end = baseline_minutes(time_range)
+    midnight = datetime(day.year, day.month, day.day, tzinfo=timezone)
+    return ((midnight + timedelta(minutes=start)).isoformat(),
+            (midnight + timedelta(minutes=end)).isoformat())
+
+
+def reference_localize(time_range, day, timezone):
+    """The start and end of a schedule time, localized one wall time at a time"""
+    spec = automation.compile_time_range(time_range)
+    if spec.start is None:
+        return day.isoformat(), None
+    midnight = datetime(day.year, day.month, day.day)
+    return tuple(timezone.normalize(timezone.localize(midnight + timedelta(minutes=minutes)))
+                 .isoformat() for minutes in (spec.start, spec.end))
+
+
+def week_of_times():
+    monday = datetime(2024, 1, 1)
+    return [
+        event["time"]
+        for schedule in automation.SCHEDULES.values()
+        for offset in range(7)
+        for event in schedule(monday + timedelta(days=offset))
+    ]
+
+
+def check_grammar():
+    for time_range, expected in GRAMMAR.items():
+        got = tuple(automation.compile_time_range(time_range))
+        check(got == expected, f"{time_range!r} parses to {expected}")
+    for malformed in ("7-8 AM", "7:30-8:00 XM", "7:3 PM", "noon"):
+        try:
+            automation.compile_time_range(malformed)
+            check(False, f"{malformed!r} is rejected")
+        except ValueError:
+            pass
+    check(True, "malformed times raise ValueError")
+
+
+def check_schedules():
+    times = week_of_times()
+    changed = Counter()
+    for time_range in times:
+        old = baseline_minutes(time_range)
+        new = tuple(automation.compile_time_range(time_range))
+        if new == old:
+            continue
+        if not (time_range.endswith("PM") and new == (old[0] + 720, old[1])):
+            check(False, f"{time_range!r} parses as before but for the shared PM "
+                         f"(was {old}, now {new})")
+        changed[time_range] += 1
+    check(True, f"{sum(changed.values())} of {len(times)} schedule times start 12 hours "
+                f"later, all ranges sharing a PM ({len(changed)} distinct); "
+                "the others parse as before")
+
+
+def check_localized():
+    kolkata = pytz.timezone("Asia/Kolkata")
+    start, end = automation.parse_time_range("2:30-2:45 PM", date(2024, 5, 6), kolkata)
+    check((start, end) == ("2024-05-06T14:30:00+05:30", "2024-05-06T14:45:00+05:30"),
+          "localized times carry +05:30, not the zone's LMT offset")
+
+    new_york = pytz.timezone("America/New_York")
+    start, end = automation.parse_time_range("1:30-3:30 AM", date(2024, 3, 10), new_york)
+    check((start, end) == ("2024-03-10T01:30:00-05:00", "2024-03-10T03:30:00-04:00"),
+          "times across a DST change fall on real instants")
+    start, _ = automation.parse_time_range("2:30 AM", date(2024, 3, 10), new_york)
+    check(start == "2024-03-10T03:30:00-04:00",
+          "a wall time skipped by DST moves to the real instant")
+    check(automation.parse_time_range("All day", date(2024, 5, 6), kolkata)
+          == ("2024-05-06", None), "all-day events give the date and no end")
+
+    times = week_of_times() + ["12:00 AM", "11:00 PM-1:00 AM", "All day"]
+    first = date(2024, 1, 1)
+    for zone in ("Asia/Kolkata", "America/New_York", "Europe/Berlin",
+                 "Australia/Lord_Howe", "America/Santiago", "UTC"):
+        timezone = pytz.timezone(zone)
+        for day in (first + timedelta(days=offset) for offset in range(366)):
+            expected = [reference_localize(time_range, day, timezone) for time_range in times]
+            if automation.localize_time_ranges(times, day, timezone) != expected:
+                check(False, f"a day's times match pytz's localize() ({zone}, {day})")
+    check(True, "a day's times match pytz's localize() and normalize() of each, every day "
+                "of 2024, in zones with and without DST")
+    check(automation.localize_time_ranges(["All day"], first, pytz.utc)
+          == [("2024-01-01", None)], "a day of all-day events only gives their dates")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000, help="runs parsed")
+    args = parser.parse_args()
+
+    check_grammar()
+    check_schedules()
+    check_localized()
+
+    timezone = pytz.timezone("Asia/Kolkata")
+    events = automation.get_events_for_day(datetime(2024, 1, 1))
+    times = [event["time"] for event in events]
+    days = [date(2024, 1, 1) + timedelta(days=offset) for offset in range(args.number)]
+
+    def baseline():
+        for day in days:
+            for time_range in times:
+                baseline_parse(time_range, day, timezone)
+
+    def cold():
+        for day in days:
+            automation.localize_time_ranges(times, day, timezone)
+
+    def warm():
+        # Warm Lambda invocations parse the same day's schedule again
+        for _ in days:
+            for time_range in times:
+                automation.parse_time_range(time_range, days[0], timezone)
+
+    print(f"\n{len(times)} events a day, {args.number} runs")
+    print(f"{'':<34}{'ms':>10}")
+    for name, function in (
+        ("split parser (LMT offset)", baseline),
+        ("grammar, a new day every run", cold),
+        ("grammar, the same day every run", warm),
+    ):
+        elapsed = min(timeit.repeat(function, number=1, repeat=5))
+        print(f"{name:<34}{elapsed * 1e3:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""Build a minimal, reproducible Lambda deployment zip
+
+Only the modules reachable from the handler are packaged (found by static import
+analysis, minus the optional parts of our dependencies we never use), together with
+the data files they read and just the pytz zones our tenants need, which are also
+frozen into pytz/_frozen_zones.py for file-free loading. Every module is
+precompiled at a fixed optimization level with hash-based .pyc files, and the zip
+is written with sorted entries and fixed timestamps, so the same tree always gives
+the same bytes.
+
+Usage:
+    python build_lambda.py [--zone Europe/Berlin] [--tenants-file tenants.env] [--all-zones]
+
+Tenant rosters sent in the Lambda event can only use the zones of the build: pass
+--all-zones to package every zone file if their timezones aren't known in advance
+(only the named zones are frozen either way).
+
+The zip lands in build/lambda.zip, next to build/build_report.json which records
+the size and import time of the build against the lambda_package/ directory.
+"""
+import argparse
+import json
+import os
+import py_compile
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import zipfile
+from modulefinder import ModuleFinder
+
+import freeze_zones
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Entry point of the function (configure the Lambda handler as main.lambda_handler)
+ENTRY_MODULE = "main"
+
+# Modules imported dynamically, which static analysis can't see: anyio loads its
+# event loop backend with import_module (httpx's AsyncClient needs it)
+INCLUDED_MODULES = [
+    "anyio._backends._asyncio",
+]
+
+# Parts of our dependencies that main.py never uses: command line tools, test
+# plugins, the trio backend, and the HTTP/2 and SOCKS transports (which httpcore
+# imports optionally and replaces with stubs when missing)
+EXCLUDED_MODULES = [
+    "anyio._backends._trio",
+    "anyio.pytest_plugin",
+    "certifi.__main__",
+    "dotenv.__main__",
+    "dotenv.cli",
+    "dotenv.ipython",
+    "httpcore._async.http2",
+    "httpcore._async.socks_proxy",
+    "httpcore._sync.http2",
+    "httpcore._sync.socks_proxy",
+    "httpx._main",
+    "pytz.reference",
+    "sniffio._tests",
+]
+
+# Files never needed at runtime, even inside packaged directories
+EXCLUDED_DATA = {"py.typed"}
+
+# Zones always packaged; tenants can add more with --zone or --tenants-file
+DEFAULT_ZONES = ["Asia/Kolkata"]
+
+# Fixed timestamp for every zip entry (the earliest date zip supports)
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+def find_modules(source):
+    """Return {module name: file path} for every module the entry point can import"""
+    finder = ModuleFinder(path=[source] + sys.path[1:], excludes=EXCLUDED_MODULES)
+    finder.run_script(os.path.join(source, ENTRY_MODULE + ".py"))
+    for name in INCLUDED_MODULES:
+        finder.import_hook(name)
+    modules = {}
+    for name, module in finder.modules.items():
+        path = module.__file__
+        if path and os.path.abspath(path).startswith(source + os.sep):
+            modules[name if name != "__main__" else ENTRY_MODULE] = path
+    return modules
+
+
+def find_data_files(source, modules, zones, all_zones=False):
+    """Return the non-Python files read at runtime by the packaged modules
+
+    Only the files of `zones` are taken from pytz/zoneinfo, unless `all_zones`.
+    """
+    package_dirs = {
+        os.path.dirname(path) for path in modules.values()
+        if os.path.basename(path) == "__init__.py"
+    }
+    data_files = []
+    for package_dir in sorted(package_dirs):
+        for name in sorted(os.listdir(package_dir)):
+            path = os.path.join(package_dir, name)
+            if os.path.isfile(path) and not name.endswith((".py", ".pyc")) and name not in EXCLUDED_DATA:
+                data_files.append(path)
+
+    zoneinfo = os.path.join(source, "pytz", "zoneinfo")
+    if os.path.join(source, "pytz") in package_dirs and all_zones:
+        for directory, dirnames, filenames in os.walk(zoneinfo):
+            dirnames.sort()
+            data_files.extend(os.path.join(directory, name) for name in sorted(filenames))
+    elif os.path.join(source, "pytz") in package_dirs:
+        for zone in sorted(set(zones)):
+            path = os.path.join(zoneinfo, *zone.split("/"))
+            if not os.path.isfile(path):
+                raise SystemExit(f"Unknown timezone {zone!r}: no {path}")
+            data_files.append(path)
+    return data_files
+
+
+def tenant_zones(tenants_file):
+    """Read the timezones used by a NOTION_TENANTS_FILE roster"""
+    sys.path.insert(0, ROOT)
+    from dotenv import dotenv_values
+    return [
+        value for key, value in dotenv_values(tenants_file, compiled=True).items()
+        if key.endswith("__TIMEZONE") and value
+    ]
+
+
+def stage(source, modules, data_files, staging, zones, optimize, sourceless):
+    """Copy the build into `staging`, precompiling every module"""
+    for name, path in sorted(modules.items()):
+        relative = os.path.relpath(path, source)
+        target = os.path.join(staging, relative)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if name == "pytz._frozen_zones":
+            # Freeze exactly the zones this build is for
+            freeze_zones.write(zones, target)
+        else:
+            shutil.copyfile(path, target)
+        # A legacy .pyc next to where the source was is imported whatever the
+        # interpreter's optimization flags are. Without cfile, py_compile writes
+        # __pycache__/<name>.<tag>[.opt-N].pyc, which the runtime only picks up
+        # when run at the same -O level.
+        cfile = os.path.splitext(target)[0] + ".pyc" if sourceless else None
+        py_compile.compile(
+            target,
+            cfile=cfile,
+            dfile=relative,
+            doraise=True,
+            optimize=optimize,
+            invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+        )
+        if sourceless:
+            os.remove(target)
+    for path in data_files:
+        target = os.path.join(staging, os.path.relpath(path, source))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copyfile(path, target)
+
+
+def write_zip(staging, output):
+    """Zip `staging` with sorted entries and fixed metadata"""
+    paths = []
+    for directory, dirnames, filenames in os.walk(staging):
+        dirnames.sort()
+        paths.extend(os.path.join(directory, name) for name in sorted(filenames))
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED, compresslevel=9) as archive:
+        for path in paths:
+            info = zipfile.ZipInfo(os.path.relpath(path, staging).replace(os.sep, "/"), ZIP_DATE_TIME)
+            info.external_attr = 0o644 << 16
+            info.compress_type = zipfile.ZIP_DEFLATED
+            with open(path, "rb") as f:
+                archive.writestr(info, f.read(), compresslevel=9)
+    return len(paths)
+
+
+def tree_size(directory):
+    """Return (file count, total bytes) of a directory, ignoring bytecode caches"""
+    count = size = 0
+    for path, dirnames, filenames in os.walk(directory):
+        dirnames[:] = [name for name in dirnames if name != "__pycache__"]
+        count += len(filenames)
+        size += sum(os.path.getsize(os.path.join(path, name)) for name in filenames)
+    return count, size
+
+
+def import_time(directory, optimize, runs=7):
+    """Median wall time, in seconds, of a cold `import main` from `directory`"""
+    code = (
+        "import sys, time\n"
+        f"sys.path.insert(0, {directory!r})\n"
+        "start = time.perf_counter()\n"
+        f"import {ENTRY_MODULE}\n"
+        "print(time.perf_counter() - start)\n"
+    )
+    env = dict(os.environ, NOTION_API_KEY="build", NOTION_DATABASE_ID="build")
+    env.pop("NOTION_TENANTS_FILE", None)
+    flags = ["-" + "O" * optimize] if optimize else []
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-S", *flags, "-c", code],
+            cwd=directory, env=env, capture_output=True, text=True,
+        )
+        if result.returncode:
+            raise SystemExit(f"Importing {ENTRY_MODULE} from {directory} failed:\n{result.stderr}")
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    # The first run of a source tree writes its bytecode cache; skip it
+    return statistics.median(timings[1:])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", default=ROOT, help="tree to package (default: this directory)")
+    parser.add_argument("--baseline", default=os.path.join(ROOT, "lambda_package"),
+                        help="existing package to compare against")
+    parser.add_argument("--output", default=os.path.join(ROOT, "build", "lambda.zip"))
+    parser.add_argument("--zone", action="append", default=[], help="extra pytz zone to keep")
+    parser.add_argument("--tenants-file", help="NOTION_TENANTS_FILE roster to read zones from")
+    parser.add_argument("--all-zones", action="store_true",
+                        help="package every pytz zone file, for rosters sent in the event")
+    parser.add_argument("--optimize", type=int, choices=(0, 1, 2), default=0,
+                        help="bytecode optimization level (match the function's PYTHONOPTIMIZE)")
+    parser.add_argument("--sourceless", action="store_true", help="ship .pyc files without sources")
+    parser.add_argument("--no-measure", action="store_true", help="skip the import-time comparison")
+    args = parser.parse_args()
+
+    source = os.path.abspath(args.source)
+    zones = DEFAULT_ZONES + args.zone
+    if args.tenants_file:
+        zones += tenant_zones(args.tenants_file)
+
+    modules = find_modules(source)
+    data_files = find_data_files(source, modules, zones, args.all_zones)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+
+    with tempfile.TemporaryDirectory() as staging:
+        stage(source, modules, data_files, staging, zones, args.optimize, args.sourceless)
+        file_count = write_zip(staging, args.output)
+        _, unzipped = tree_size(staging)
+
+        report = {
+            "python": sys.version.split()[0],
+            "optimize": args.optimize,
+            "sourceless": args.sourceless,
+            "modules": len(modules),
+            "zones": "all" if args.all_zones else sorted(set(zones)),
+            "frozen_zones": sorted(set(zones)),
+            "build": {
+                "files": file_count,
+                "zip_bytes": os.path.getsize(args.output),
+                "unzipped_bytes": unzipped,
+            },
+        }
+        if os.path.isdir(args.baseline):
+            baseline_files, baseline_bytes = tree_size(args.baseline)
+            report["baseline"] = {"files": baseline_files, "unzipped_bytes": baseline_bytes}
+            report["delta"] = {"unzipped_bytes": unzipped - baseline_bytes}
+        if not args.no_measure:
+            report["build"]["import_seconds"] = import_time(staging, args.optimize)
+            if "baseline" in report:
+                report["baseline"]["import_seconds"] = import_time(args.baseline, args.optimize)
+                report["delta"]["import_seconds"] = (
+                    report["build"]["import_seconds"] - report["baseline"]["import_seconds"]
+                )
+
+    report_path = os.path.join(os.path.dirname(os.path.abspath(args.output)), "build_report.json")
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
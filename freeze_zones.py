@@ -0,0 +1,67 @@
+"""Freeze pytz zones into pytz/_frozen_zones.py
+
+pytz.timezone() builds frozen zones from in-memory tables instead of opening
+pytz/zoneinfo files (and instead of checking which of the ~600 zone files exist,
+which the first lookup of any other zone does). Freeze the zones our tenants use:
+
+    python freeze_zones.py Asia/Kolkata Europe/Berlin [--tenants-file tenants.env]
+
+Re-run it after upgrading pytz so the tables follow the new tz database.
+"""
+import argparse
+import os
+import pprint
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+from pytz import open_resource, OLSON_VERSION  # noqa: E402
+from pytz.tzfile import build_tzinfo, freeze_tzinfo  # noqa: E402
+
+OUTPUT = os.path.join(ROOT, "pytz", "_frozen_zones.py")
+
+HEADER = '''"""Timezone tables frozen by freeze_zones.py (tz database {version}).
+
+Do not edit by hand: run `python freeze_zones.py <zone>...` to regenerate.
+Each entry is a table for pytz.tzfile.build_frozen_tzinfo.
+"""
+
+FROZEN_ZONES = '''
+
+
+def render(zones):
+    """Return the source of a _frozen_zones module holding `zones`"""
+    tables = {}
+    for zone in sorted(set(zones)):
+        fp = open_resource(zone)
+        try:
+            tables[zone] = freeze_tzinfo(build_tzinfo(zone, fp))
+        finally:
+            fp.close()
+    return HEADER.format(version=OLSON_VERSION) + pprint.pformat(tables, width=88, compact=True) + "\n"
+
+
+def write(zones, output=OUTPUT):
+    """Write a _frozen_zones module holding `zones` to `output`"""
+    with open(output, "w") as f:
+        f.write(render(zones))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("zones", nargs="*", default=["Asia/Kolkata"])
+    parser.add_argument("--tenants-file", help="NOTION_TENANTS_FILE roster to read zones from")
+    parser.add_argument("--output", default=OUTPUT)
+    args = parser.parse_args()
+
+    zones = list(args.zones)
+    if args.tenants_file:
+        from build_lambda import tenant_zones
+        zones += tenant_zones(args.tenants_file)
+    write(zones, args.output)
+    print(f"Froze {len(set(zones))} zone(s) into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
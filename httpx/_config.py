@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+import threading
 import typing
 
 from ._models import Headers
@@ -19,6 +20,52 @@ class UnsetType:
 
 UNSET = UnsetType()
 
+# SSL contexts made by shared_ssl_context, shared by the transports of the process
+# with the same settings: loading the CA bundle is the most expensive part of
+# making a client.
+_ssl_contexts: dict[typing.Hashable, ssl.SSLContext] = {}
+_ssl_contexts_lock = threading.Lock()
+
+
+def shared_ssl_context(
+    verify: ssl.SSLContext | str | bool = True,
+    cert: CertTypes | None = None,
+    trust_env: bool = True,
+    http2: bool = False,
+) -> ssl.SSLContext:
+    """
+    Return the SSL context of a transport, shared with the other transports
+    of the process that have the same settings.
+
+    Contexts built from `verify=True/False/<path>` are cached for the lifetime of
+    the process, keyed on the arguments and on `SSL_CERT_FILE`/`SSL_CERT_DIR`.
+    httpcore sets the ALPN protocols of the context on every connection, from
+    `http2`, so `http2` is part of the key: every connection of a shared context
+    sets the same protocols. Contexts passed as `verify` are returned as is.
+    """
+    if not isinstance(verify, (bool, str)) or not isinstance(
+        cert, (str, tuple, type(None))
+    ):
+        return create_ssl_context(verify, cert, trust_env)
+
+    key = (
+        verify,
+        cert,
+        trust_env,
+        http2,
+        os.environ.get("SSL_CERT_FILE"),
+        os.environ.get("SSL_CERT_DIR"),
+    )
+    ctx = _ssl_contexts.get(key)
+    if ctx is None:
+        with _ssl_contexts_lock:
+            ctx = _ssl_contexts.get(key)
+            if ctx is None:
+                ctx = create_ssl_context(verify, cert, trust_env)
+                ctx.set_alpn_protocols(["http/1.1", "h2"] if http2 else ["http/1.1"])
+                _ssl_contexts[key] = ctx
+    return ctx
+
 
 def create_ssl_context(
     verify: ssl.SSLContext | str | bool = True,
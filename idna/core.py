@@ -1,6 +1,7 @@
 import bisect
 import re
 import unicodedata
+from functools import lru_cache
 from typing import Optional, Union
 
 from . import idnadata
@@ -9,6 +10,11 @@ from .intranges import intranges_contain
 _virama_combining_class = 9
 _alabel_prefix = b"xn--"
 _unicode_dots_re = re.compile("[\u002e\u3002\uff0e\uff61]")
+# Letters, digits and hyphens only, 1 to 63 characters per label, no leading or
+# trailing hyphen: such names are valid IDNA as they are, and UTS46 only lowercases them
+_ldh_label = "[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?"
+_ldh_domain_re = re.compile("(?:{0}\\.)*{0}\\.?\\Z".format(_ldh_label))
+_cache_size = 1024
 
 
 class IDNAError(UnicodeError):
@@ -363,6 +369,14 @@ def uts46_remap(domain: str, std3_rules: bool = True, transitional: bool = False
     return unicodedata.normalize("NFC", output)
 
 
+def _is_ldh_domain(s: str) -> bool:
+    """Whether `s` is a plain ASCII host name that needs no table lookups."""
+    if _ldh_domain_re.match(s) is None:
+        return False
+    # Hyphens in the 3rd and 4th position are reserved (and mark A-labels)
+    return "--" not in s or all(label[2:4] != "--" for label in s.split("."))
+
+
 def encode(
     s: Union[str, bytes, bytearray],
     strict: bool = False,
@@ -375,6 +389,13 @@ def encode(
             s = str(s, "ascii")
         except UnicodeDecodeError:
             raise IDNAError("should pass a unicode string to the function rather than a byte string.")
+    return _encode(s, strict, uts46, std3_rules, transitional)
+
+
+@lru_cache(maxsize=_cache_size)
+def _encode(s: str, strict: bool, uts46: bool, std3_rules: bool, transitional: bool) -> bytes:
+    if _is_ldh_domain(s) and len(s) <= (254 if s[-1] == "." else 253):
+        return (s.lower() if uts46 else s).encode("ascii")
     if uts46:
         s = uts46_remap(s, std3_rules, transitional)
     trailing_dot = False
@@ -413,6 +434,13 @@ def decode(
             s = str(s, "ascii")
     except UnicodeDecodeError:
         raise IDNAError("Invalid ASCII in A-label")
+    return _decode(s, strict, uts46, std3_rules)
+
+
+@lru_cache(maxsize=_cache_size)
+def _decode(s: str, strict: bool, uts46: bool, std3_rules: bool) -> str:
+    if _is_ldh_domain(s):
+        return s.lower()
     if uts46:
         s = uts46_remap(s, std3_rules, False)
     trailing_dot = False
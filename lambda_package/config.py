@@ -0,0 +1,154 @@
+"""Configuration bootstrap for the Notion automation
+
+On AWS Lambda, settings come from the function's environment variables only, so
+the .env search is skipped entirely. Locally, the .env file is located and
+parsed once per process (walking up from this file's directory, like
+load_dotenv() did from main.py).
+
+Settings are then validated once into an immutable Config.
+"""
+import math
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import pytz
+from dotenv.main import DotEnv
+
+ENV_FILENAME = ".env"
+
+
+class ConfigError(ValueError):
+    """Raised when required settings are missing or malformed"""
+
+
+@dataclass(frozen=True)
+class Config:
+    """Validated settings of one process"""
+    notion_api_key: Optional[str]
+    database_id: Optional[str]
+    timezone: str
+    rate_limit: float
+    tenant_workers: int
+    tenants_file: Optional[str]
+    estimated_latency: float
+    idempotency_property: Optional[str]
+    env_file: Optional[str]
+    missing: Tuple[str, ...] = ()
+
+    def require(self):
+        """Raise ConfigError unless the single-tenant settings are all set"""
+        if self.missing:
+            raise ConfigError("Missing settings: " + ", ".join(self.missing))
+
+
+def is_lambda():
+    """Tell whether we are running inside the AWS Lambda runtime"""
+    return "AWS_LAMBDA_FUNCTION_NAME" in os.environ or os.environ.get(
+        "AWS_EXECUTION_ENV", ""
+    ).startswith("AWS_Lambda_")
+
+
+@lru_cache(maxsize=None)
+def find_env_file(start=os.path.dirname(os.path.abspath(__file__))):
+    """Return the closest .env in `start` or its parents, or None (cached)"""
+    path = start
+    while True:
+        candidate = os.path.join(path, ENV_FILENAME)
+        if os.path.isfile(candidate):
+            return candidate
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+def read_env_file(path):
+    """Parse a .env file"""
+    return DotEnv(path, interpolate=True, override=False, compiled=True).dict()
+
+
+def load_environment():
+    """Export the .env bindings that aren't already set (no-op on Lambda)
+
+    Returns the path of the .env file used, if any.
+    """
+    if is_lambda():
+        return None
+    path = find_env_file()
+    if path is None:
+        return None
+    for key, value in read_env_file(path).items():
+        if value is not None and key not in os.environ:
+            os.environ[key] = value
+    return path
+
+
+def _number(name, default, kind):
+    value = os.environ.get(name, default)
+    try:
+        number = kind(value)
+    except ValueError:
+        raise ConfigError(f"{name} must be a number, got {value!r}")
+    # nan compares False with everything, so it must be caught before the sign
+    if not math.isfinite(number) or number <= 0:
+        raise ConfigError(f"{name} must be a positive finite number, got {value!r}")
+    return number
+
+
+@lru_cache(maxsize=None)
+def load_config():
+    """Load, validate and freeze the settings of this process (once)
+
+    Malformed settings raise ConfigError right away. NOTION_API_KEY and
+    NOTION_DATABASE_ID may be left unset (tenants can come from the event or from
+    NOTION_TENANTS_FILE): they are listed in Config.missing, and Config.require()
+    raises when the single-tenant run needs them.
+    """
+    env_file = load_environment()
+
+    api_key = os.environ.get("NOTION_API_KEY") or None
+    database_id = os.environ.get("NOTION_DATABASE_ID") or None
+    tenants_file = os.environ.get("NOTION_TENANTS_FILE") or None
+    idempotency_property = os.environ.get("NOTION_IDEMPOTENCY_PROPERTY") or None
+    missing = tuple(
+        name for name, value in (("NOTION_API_KEY", api_key), ("NOTION_DATABASE_ID", database_id))
+        if not value
+    )
+    problems = []
+    if tenants_file and not os.path.isfile(tenants_file):
+        problems.append(f"NOTION_TENANTS_FILE {tenants_file!r} does not exist")
+
+    timezone = os.environ.get("NOTION_TIMEZONE", "Asia/Kolkata")
+    try:
+        pytz.timezone(timezone)
+    except pytz.UnknownTimeZoneError:
+        problems.append(f"NOTION_TIMEZONE {timezone!r} is not a known timezone")
+
+    numbers = {}
+    for name, default, kind in (
+        ("NOTION_RATE_LIMIT", "3", float),
+        ("NOTION_TENANT_WORKERS", "8", int),
+        ("NOTION_ESTIMATED_LATENCY", "0.35", float),
+    ):
+        try:
+            numbers[name] = _number(name, default, kind)
+        except ConfigError as e:
+            problems.append(str(e))
+
+    if problems:
+        raise ConfigError("Invalid configuration: " + "; ".join(problems))
+
+    return Config(
+        notion_api_key=api_key,
+        database_id=database_id,
+        timezone=timezone,
+        rate_limit=numbers["NOTION_RATE_LIMIT"],
+        tenant_workers=numbers["NOTION_TENANT_WORKERS"],
+        tenants_file=tenants_file,
+        estimated_latency=numbers["NOTION_ESTIMATED_LATENCY"],
+        idempotency_property=idempotency_property,
+        env_file=env_file,
+        missing=missing,
+    )
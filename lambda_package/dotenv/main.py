@@ -5,12 +5,12 @@ import pathlib
 import shutil
 import sys
 import tempfile
-from collections import OrderedDict
+from collections import ChainMap, OrderedDict
 from contextlib import contextmanager
 from typing import IO, Dict, Iterable, Iterator, Mapping, Optional, Tuple, Union
 
-from .parser import Binding, parse_stream
-from .variables import parse_variables
+from .parser import Binding, parse_stream, parse_stream_compiled
+from .variables import compile_variables, parse_variables
 
 # A type alias for a string path to be used for the paths in this file.
 # These paths may flow to `open()` and `shutil.move()`; `shutil.move()`
@@ -40,6 +40,7 @@ class DotEnv:
         encoding: Optional[str] = None,
         interpolate: bool = True,
         override: bool = True,
+        compiled: bool = False,
     ) -> None:
         self.dotenv_path: Optional[StrPath] = dotenv_path
         self.stream: Optional[IO[str]] = stream
@@ -48,6 +49,7 @@ class DotEnv:
         self.encoding: Optional[str] = encoding
         self.interpolate: bool = interpolate
         self.override: bool = override
+        self.compiled: bool = compiled
 
     @contextmanager
     def _get_stream(self) -> Iterator[IO[str]]:
@@ -72,17 +74,17 @@ class DotEnv:
         raw_values = self.parse()
 
         if self.interpolate:
-            self._dict = OrderedDict(
-                resolve_variables(raw_values, override=self.override)
-            )
+            resolve = resolve_variables_compiled if self.compiled else resolve_variables
+            self._dict = OrderedDict(resolve(raw_values, override=self.override))
         else:
             self._dict = OrderedDict(raw_values)
 
         return self._dict
 
     def parse(self) -> Iterator[Tuple[str, Optional[str]]]:
+        parse = parse_stream_compiled if self.compiled else parse_stream
         with self._get_stream() as stream:
-            for mapping in with_warn_for_invalid_lines(parse_stream(stream)):
+            for mapping in with_warn_for_invalid_lines(parse(stream)):
                 if mapping.key is not None:
                     yield mapping.key, mapping.value
 
@@ -255,6 +257,34 @@ def resolve_variables(
     return new_values
 
 
+def resolve_variables_compiled(
+    values: Iterable[Tuple[str, Optional[str]]],
+    override: bool,
+) -> Mapping[str, Optional[str]]:
+    """Same result as `resolve_variables`, without rescanning repeated values.
+
+    Values are parsed into atoms once (see `compile_variables`), values without
+    `${` are kept as is, and variables are looked up through the bindings read so
+    far and the environment instead of a fresh copy of both for every value.
+    """
+    new_values: Dict[str, Optional[str]] = {}
+    environ = dict(os.environ)
+    if override:
+        env: Mapping[str, Optional[str]] = ChainMap(new_values, environ)  # type: ignore
+    else:
+        env = ChainMap(environ, new_values)  # type: ignore
+
+    for name, value in values:
+        if value is None or "${" not in value:
+            result = value
+        else:
+            result = "".join(atom.resolve(env) for atom in compile_variables(value))
+
+        new_values[name] = result
+
+    return new_values
+
+
 def _walk_to_root(path: str) -> Iterator[str]:
     """
     Yield directories starting from the given directory up to the root
@@ -329,6 +359,7 @@ def load_dotenv(
     override: bool = False,
     interpolate: bool = True,
     encoding: Optional[str] = "utf-8",
+    compiled: bool = False,
 ) -> bool:
     """Parse a .env file and then load all the variables found as environment variables.
 
@@ -340,6 +371,8 @@ def load_dotenv(
         override: Whether to override the system environment variables with the variables
             from the `.env` file.
         encoding: Encoding to be used to read the file.
+        compiled: Whether to use the single-pass parser, which is faster on large files
+            and gives the same result.
     Returns:
         Bool: True if at least one environment variable is set else False
 
@@ -358,6 +391,7 @@ def load_dotenv(
         interpolate=interpolate,
         override=override,
         encoding=encoding,
+        compiled=compiled,
     )
     return dotenv.set_as_environment_variables()
 
@@ -368,6 +402,7 @@ def dotenv_values(
     verbose: bool = False,
     interpolate: bool = True,
     encoding: Optional[str] = "utf-8",
+    compiled: bool = False,
 ) -> Dict[str, Optional[str]]:
     """
     Parse a .env file and return its content as a dict.
@@ -381,6 +416,8 @@ def dotenv_values(
         stream: `StringIO` object with .env content, used if `dotenv_path` is `None`.
         verbose: Whether to output a warning if the .env file is missing.
         encoding: Encoding to be used to read the file.
+        compiled: Whether to use the single-pass parser, which is faster on large files
+            and gives the same result.
 
     If both `dotenv_path` and `stream` are `None`, `find_dotenv()` is used to find the
     .env file.
@@ -395,4 +432,5 @@ def dotenv_values(
         interpolate=interpolate,
         override=True,
         encoding=encoding,
+        compiled=compiled,
     ).dict()
@@ -23,6 +23,46 @@ _end_of_line = make_regex(r"[^\S\r\n]*(?:\r\n|\n|\r|$)")
 _rest_of_line = make_regex(r"[^\r\n]*(?:\r|\n|\r\n)?")
 _double_quote_escapes = make_regex(r"\\[\\'\"abfnrtv]")
 _single_quote_escapes = make_regex(r"\\[\\']")
+_inline_comment = make_regex(r"\s+#.*")
+
+# One whole binding, as parse_binding reads it. Each piece that parse_binding
+# matches with its own regex is made atomic with the (?=(?P<x>...))(?P=x) idiom,
+# so that the master regex cannot backtrack into it and find a parse that the
+# piece by piece reader would not. Anything it does not match (invalid lines) is
+# left to parse_binding.
+_binding = make_regex(
+    r"""
+    \s*
+    (?:
+        (?P<end>\Z)
+    |
+        (?=(?P<export>(?:export[^\S\r\n]+)?))(?P=export)
+        (?:
+            (?=\#)
+        |
+            '(?P<quoted_key>[^']+)'
+        |
+            (?P<key>(?!')[^=\#\s]+)
+        )
+        [^\S\r\n]*
+        (?:
+            (?P<equals>=)[^\S\r\n]*
+            (?:
+                (?=(?P<single>'(?:\\'|[^'])*'))(?P=single)
+            |
+                (?=(?P<double>"(?:\\"|[^"])*"))(?P=double)
+            |
+                (?P<unquoted>[^\s'"][^\r\n]*)
+            |
+                (?=[\r\n]|\Z)
+            )
+        )?
+        (?:[^\S\r\n]*\#[^\r\n]*)?
+        [^\S\r\n]*(?:\r\n|\n|\r|$)
+    )
+    """,
+    extra_flags=re.VERBOSE,
+)
 
 
 class Original(NamedTuple):
@@ -173,3 +213,55 @@ def parse_stream(stream: IO[str]) -> Iterator[Binding]:
     reader = Reader(stream)
     while reader.has_next():
         yield parse_binding(reader)
+
+
+def _compiled_value(match: Match[str]) -> Optional[str]:
+    if match.group("equals") is None:
+        return None
+    value = match.group("single")
+    if value is not None:
+        value = value[1:-1]
+        return decode_escapes(_single_quote_escapes, value) if "\\" in value else value
+    value = match.group("double")
+    if value is not None:
+        value = value[1:-1]
+        return decode_escapes(_double_quote_escapes, value) if "\\" in value else value
+    value = match.group("unquoted")
+    if value is None:
+        return u""
+    if "#" in value:
+        value = _inline_comment.sub("", value)
+    return value.rstrip()
+
+
+def parse_stream_compiled(stream: IO[str]) -> Iterator[Binding]:
+    """Same bindings as `parse_stream`, read in a single pass over the stream.
+
+    Every valid binding is matched by one compiled regex instead of a chain of
+    per-token matches; only invalid lines go through `parse_binding`.
+    """
+    reader = Reader(stream)
+    string = reader.string
+    position = reader.position
+    while position.chars < len(string):
+        match = _binding.match(string, position.chars)
+        if match is None:
+            yield parse_binding(reader)
+            continue
+        original = match.group()
+        line = position.line
+        position.chars = match.end()
+        if "\r" in original:
+            position.line += len(_newline.findall(original))
+        else:
+            position.line += original.count("\n")
+        if match.group("end") is not None:
+            key = None
+        else:
+            key = match.group("quoted_key") or match.group("key")
+        yield Binding(
+            key=key,
+            value=_compiled_value(match),
+            original=Original(string=original, line=line),
+            error=False,
+        )
@@ -1,6 +1,7 @@
 import re
 from abc import ABCMeta, abstractmethod
-from typing import Iterator, Mapping, Optional, Pattern
+from functools import lru_cache
+from typing import Iterator, Mapping, Optional, Pattern, Tuple
 
 _posix_variable: Pattern[str] = re.compile(
     r"""
@@ -84,3 +85,9 @@ def parse_variables(value: str) -> Iterator[Atom]:
     length = len(value)
     if cursor < length:
         yield Literal(value=value[cursor:length])
+
+
+@lru_cache(maxsize=4096)
+def compile_variables(value: str) -> Tuple[Atom, ...]:
+    """Return the atoms of `value`, parsed once per distinct value."""
+    return tuple(parse_variables(value))
@@ -1,5 +1,15 @@
 import re
-from typing import AnyStr, cast, List, overload, Sequence, Tuple, TYPE_CHECKING, Union
+from typing import (
+    AnyStr,
+    cast,
+    Dict,
+    List,
+    overload,
+    Sequence,
+    Tuple,
+    TYPE_CHECKING,
+    Union,
+)
 
 from ._abnf import field_name, field_value
 from ._util import bytesify, LocalProtocolError, validate
@@ -73,6 +83,20 @@ _content_length_re = re.compile(rb"[0-9]+")
 _field_name_re = re.compile(field_name.encode("ascii"))
 _field_value_re = re.compile(field_value.encode("ascii"))
 
+# Header fields that have already passed the regexes, as (name, value) ->
+# (raw_name, lowercased name, value). Clients send the same few headers with
+# every request (Host, User-Agent, Accept, Notion-Version...), so validating
+# each distinct field once saves most of the regex work on the request-write
+# path. Only fields given as bytes are looked up, and the memo is emptied when
+# it is full.
+_validated_fields: Dict[Tuple[bytes, bytes], Tuple[bytes, bytes, bytes]] = {}
+VALIDATED_FIELDS_MAX = 1024
+# Fields never kept in the memo: credentials, which must not outlive the
+# requests carrying them, and Content-Length, whose values would only churn it.
+_UNMEMOIZED_FIELDS = frozenset(
+    [b"authorization", b"proxy-authorization", b"cookie", b"content-length"]
+)
+
 
 class Headers(Sequence[Tuple[bytes, bytes]]):
     """
@@ -159,16 +183,27 @@ def normalize_and_validate(
         # For headers coming out of the parser, we can safely skip some steps,
         # because it always returns bytes and has already run these regexes
         # over the data:
-        if not _parsed:
-            name = bytesify(name)
-            value = bytesify(value)
-            validate(_field_name_re, name, "Illegal header name {!r}", name)
-            validate(_field_value_re, value, "Illegal header value {!r}", value)
+        if _parsed:
+            raw_name = name
+            name = name.lower()
+        else:
+            field = None
+            if type(name) is bytes and type(value) is bytes:
+                field = _validated_fields.get((name, value))
+            if field is None:
+                name = bytesify(name)
+                value = bytesify(value)
+                validate(_field_name_re, name, "Illegal header name {!r}", name)
+                validate(_field_value_re, value, "Illegal header value {!r}", value)
+                field = (name, name.lower(), value)
+                if field[1] not in _UNMEMOIZED_FIELDS:
+                    if len(_validated_fields) >= VALIDATED_FIELDS_MAX:
+                        _validated_fields.clear()
+                    _validated_fields[(name, value)] = field
+            raw_name, name, value = field
         assert isinstance(name, bytes)
         assert isinstance(value, bytes)
 
-        raw_name = name
-        name = name.lower()
         if name == b"content-length":
             lengths = {length.strip() for length in value.split(b",")}
             if len(lengths) != 1:
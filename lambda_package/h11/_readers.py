@@ -165,7 +165,7 @@ class ChunkedReader:
                 return None
             if data != self._bytes_to_discard[: len(data)]:
                 raise LocalProtocolError(
-                    f"malformed chunk footer: {data!r} (expected {self._bytes_to_discard!r})"
+                    f"malformed chunk footer: {bytes(data)!r} (expected {self._bytes_to_discard!r})"
                 )
             self._bytes_to_discard = self._bytes_to_discard[len(data) :]
             if self._bytes_to_discard:
@@ -1,6 +1,7 @@
 import re
 import sys
-from typing import List, Optional, Union
+from collections import deque
+from typing import Deque, List, Optional, Pattern, Union
 
 __all__ = ["ReceiveBuffer"]
 
@@ -13,121 +14,200 @@ __all__ = ["ReceiveBuffer"]
 # - on average, do this fast
 # - worst case, do this in O(n) where n is the number of bytes processed
 # Plan:
-# - store bytearray, offset, how far we've searched for a separator token
+# - store the received pieces as they came in (immutable bytes), plus the
+#   offset of the first unread byte in the first piece
+# - hand out body data as memoryview slices of those pieces, so reading a
+#   body copies nothing; only data that straddles two pieces gets joined
+# - consume by advancing the offset and dropping finished pieces, never by
+#   deleting from the front of a buffer
+# - search for line separators in the first piece only; when a search runs
+#   past its end, merge it with the next piece and search on, so that lines
+#   (which are short) end up in one piece while body data stays in the pieces
+#   it came in; merged pieces are bytearrays that grow in place, so lines that
+#   trickle in a few bytes at a time are not copied over and over
 # - use the how-far-we've-searched data to avoid rescanning
-# - while doing a stream of uninterrupted processing, advance offset instead
-#   of constantly copying
-# WARNING:
-# - I haven't benchmarked or profiled any of this yet.
 #
-# Note that starting in Python 3.4, deleting the initial n bytes from a
-# bytearray is amortized O(n), thanks to some excellent work by Antoine
-# Martin:
-#
-#     https://bugs.python.org/issue19087
-#
-# This means that if we only supported 3.4+, we could get rid of the code here
-# involving self._start and self.compress, because it's doing exactly the same
-# thing that bytearray now does internally.
-#
-# BUT unfortunately, we still support 2.7, and reading short segments out of a
-# long buffer MUST be O(bytes read) to avoid DoS issues, so we can't actually
-# delete this code. Yet:
-#
-#     https://pythonclock.org/
-#
-# (Two things to double-check first though: make sure PyPy also has the
-# optimization, and benchmark to make sure it's a win, since we do have a
-# slightly clever thing where we delay calling compress() until we've
-# processed a whole event, which could in theory be slightly more efficient
-# than the internal bytearray support.)
+# benchmarks/h11_receivebuffer.py measures this against the previous
+# bytearray implementation on header-heavy and body-heavy responses.
 blank_line_regex = re.compile(b"\n\r?\n", re.MULTILINE)
+next_line_regex = re.compile(b"\r\n")
+
+# Longest separator we search for, minus one: how many bytes of the first
+# piece a separator that ends in the next piece can start in
+_OVERLAP = 2
 
 
 class ReceiveBuffer:
     def __init__(self) -> None:
-        self._data = bytearray()
+        self._chunks: Deque[Union[bytes, bytearray]] = deque()
+        self._start = 0
+        self._length = 0
         self._next_line_search = 0
         self._multiple_lines_search = 0
+        # Whether the buffer is a merged piece holding an incomplete line
+        self._gathering = False
 
     def __iadd__(self, byteslike: Union[bytes, bytearray]) -> "ReceiveBuffer":
-        self._data += byteslike
+        if byteslike:
+            chunks = self._chunks
+            if self._gathering:
+                # A line is being gathered in a merged piece: keep it growing
+                chunks[-1] += byteslike
+            elif type(byteslike) is bytes:
+                chunks.append(byteslike)
+            else:
+                # Copy mutable buffers: the caller is free to reuse them
+                chunks.append(bytes(byteslike))
+            self._length += len(byteslike)
         return self
 
     def __bool__(self) -> bool:
         return bool(len(self))
 
     def __len__(self) -> int:
-        return len(self._data)
+        return self._length
 
     # for @property unprocessed_data
     def __bytes__(self) -> bytes:
-        return bytes(self._data)
+        if not self._chunks:
+            return b""
+        if len(self._chunks) == 1:
+            return bytes(self._chunks[0][self._start :])
+        return b"".join([self._chunks[0][self._start :], *list(self._chunks)[1:]])
+
+    def _peek(self, count: int) -> bytes:
+        first = self._chunks[0] if self._chunks else b""
+        if self._start + count <= len(first):
+            return bytes(first[self._start : self._start + count])
+        out = b""
+        start = self._start
+        for chunk in self._chunks:
+            out += chunk[start : start + count - len(out)]
+            if len(out) == count:
+                break
+            start = 0
+        return out
 
-    def _extract(self, count: int) -> bytearray:
-        # extracting an initial slice of the data buffer and return it
-        out = self._data[:count]
-        del self._data[:count]
+    def _find(self, regex: "Pattern[bytes]", start: int) -> int:
+        """
+        Return the index just past the first match at or after `start`, or -1.
+        """
+        chunks = self._chunks
+        while chunks:
+            first = chunks[0]
+            match = regex.search(first, self._start + start)
+            if match is not None:
+                return match.end() - self._start
+            if len(chunks) == 1:
+                self._gathering = type(first) is bytearray
+                break
+            # The match may straddle the next piece, or lie beyond it
+            start = max(start, len(first) - self._start - _OVERLAP)
+            chunks.popleft()
+            if type(first) is not bytearray or self._start:
+                first = bytearray(first[self._start :])
+                self._start = 0
+            first += chunks[0]
+            chunks[0] = first
+        return -1
+
+    def _extract(self, count: int) -> memoryview:
+        # extracting an initial slice of the data buffer and return it,
+        # without copying unless it spans several pieces
+        first = self._chunks[0]
+        end = self._start + count
+        # Merged pieces keep growing, so no views of them are handed out
+        if end <= len(first) and type(first) is bytes:
+            out = memoryview(first)[self._start : end]
+            self._consume(count)
+            self._next_line_search = 0
+            self._multiple_lines_search = 0
+            self._gathering = False
+            return out
+        return memoryview(self._extract_bytes(count))
+
+    def _extract_bytes(self, count: int) -> bytes:
+        # same as _extract, as a copy: for lines, which get parsed right away
+        first = self._chunks[0]
+        end = self._start + count
+        if end <= len(first):
+            out = bytes(first[self._start : end])
+            self._consume(count)
+        else:
+            pieces = []
+            remaining = count
+            while remaining:
+                piece = self._chunks[0][self._start : self._start + remaining]
+                pieces.append(piece)
+                self._consume(len(piece))
+                remaining -= len(piece)
+            out = b"".join(pieces)
 
         self._next_line_search = 0
         self._multiple_lines_search = 0
+        self._gathering = False
 
         return out
 
-    def maybe_extract_at_most(self, count: int) -> Optional[bytearray]:
+    def _consume(self, count: int) -> None:
+        self._start += count
+        self._length -= count
+        if self._start == len(self._chunks[0]):
+            self._chunks.popleft()
+            self._start = 0
+
+    def maybe_extract_at_most(self, count: int) -> Optional[memoryview]:
         """
         Extract a fixed number of bytes from the buffer.
         """
-        out = self._data[:count]
-        if not out:
+        count = min(count, self._length)
+        if count <= 0:
             return None
 
         return self._extract(count)
 
-    def maybe_extract_next_line(self) -> Optional[bytearray]:
+    def maybe_extract_next_line(self) -> Optional[bytes]:
         """
         Extract the first line, if it is completed in the buffer.
         """
         # Only search in buffer space that we've not already looked at.
         search_start_index = max(0, self._next_line_search - 1)
-        partial_idx = self._data.find(b"\r\n", search_start_index)
+        idx = self._find(next_line_regex, search_start_index)
 
-        if partial_idx == -1:
-            self._next_line_search = len(self._data)
+        if idx == -1:
+            self._next_line_search = self._length
             return None
 
-        # + 2 is to compensate len(b"\r\n")
-        idx = partial_idx + 2
-
-        return self._extract(idx)
+        return self._extract_bytes(idx)
 
-    def maybe_extract_lines(self) -> Optional[List[bytearray]]:
+    def maybe_extract_lines(self) -> Optional[List[bytes]]:
         """
         Extract everything up to the first blank line, and return a list of lines.
         """
         # Handle the case where we have an immediate empty line.
-        if self._data[:1] == b"\n":
-            self._extract(1)
+        chunks = self._chunks
+        if chunks and self._start + 2 <= len(chunks[0]):
+            start = bytes(chunks[0][self._start : self._start + 2])
+        else:
+            start = self._peek(2)
+        if start[:1] == b"\n":
+            self._extract_bytes(1)
             return []
 
-        if self._data[:2] == b"\r\n":
-            self._extract(2)
+        if start == b"\r\n":
+            self._extract_bytes(2)
             return []
 
         # Only search in buffer space that we've not already looked at.
-        match = blank_line_regex.search(self._data, self._multiple_lines_search)
-        if match is None:
-            self._multiple_lines_search = max(0, len(self._data) - 2)
+        idx = self._find(blank_line_regex, self._multiple_lines_search)
+        if idx == -1:
+            self._multiple_lines_search = max(0, self._length - 2)
             return None
 
         # Truncate the buffer and return it.
-        idx = match.span(0)[-1]
-        out = self._extract(idx)
-        lines = out.split(b"\n")
-
-        for line in lines:
-            if line.endswith(b"\r"):
-                del line[-1]
+        out = self._extract_bytes(idx)
+        # Dropping the \r of every \r\n strips one \r from the end of each line
+        lines = out.replace(b"\r\n", b"\n").split(b"\n")
 
         assert lines[-2] == lines[-1] == b""
 
@@ -148,6 +228,6 @@ class ReceiveBuffer:
         try:
             # HTTP header line must not contain non-printable characters
             # and should not start with a space
-            return self._data[0] < 0x21
+            return self._chunks[0][self._start] < 0x21
         except IndexError:
             return False
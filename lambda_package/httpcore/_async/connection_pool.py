@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import itertools
 import ssl
 import sys
 import types
 import typing
+from collections import deque
 
 from .._backends.auto import AutoBackend
 from .._backends.base import SOCKET_OPTION, AsyncNetworkBackend
@@ -15,8 +17,11 @@ from .interfaces import AsyncConnectionInterface, AsyncRequestInterface
 
 
 class AsyncPoolRequest:
-    def __init__(self, request: Request) -> None:
+    def __init__(self, request: Request, sequence: int = 0) -> None:
         self.request = request
+        self.origin = request.url.origin
+        # Position in the pool's queue, by arrival
+        self.sequence = sequence
         self.connection: AsyncConnectionInterface | None = None
         self._connection_acquired = AsyncEvent()
 
@@ -120,6 +125,14 @@ class AsyncConnectionPool(AsyncRequestInterface):
         self._connections: list[AsyncConnectionInterface] = []
         self._requests: list[AsyncPoolRequest] = []
 
+        # Indexes over that state, so that assigning requests to connections does
+        # not match every queued request against every connection: the requests
+        # waiting for a connection, in a FIFO queue per origin, and the origin
+        # each connection was created for.
+        self._waiting: dict[Origin, deque[AsyncPoolRequest]] = {}
+        self._connection_origins: dict[AsyncConnectionInterface, Origin] = {}
+        self._sequence = itertools.count()
+
         # We only mutate the state of the connection pool within an 'optional_thread_lock'
         # context. This holds a threading lock unless we're running in async mode,
         # in which case it is a no-op.
@@ -217,12 +230,19 @@ class AsyncConnectionPool(AsyncRequestInterface):
 
         with self._optional_thread_lock:
             # Add the incoming request to our request queue.
-            pool_request = AsyncPoolRequest(request)
+            pool_request = AsyncPoolRequest(request, next(self._sequence))
             self._requests.append(pool_request)
+            self._enqueue(pool_request)
 
+        handed_back = False
         try:
             while True:
                 with self._optional_thread_lock:
+                    if handed_back:
+                        # Back in line, in the same critical section as the
+                        # assignment, so a retry takes the lock only once.
+                        self._enqueue(pool_request)
+                        handed_back = False
                     # Assign incoming requests to available connections,
                     # closing or creating new connections as required.
                     closing = self._assign_requests_to_connections()
@@ -241,7 +261,9 @@ class AsyncConnectionPool(AsyncRequestInterface):
                     # handle a request, but then become unavailable.
                     #
                     # In this case we clear the connection and try again.
+                    # Until it is queued again, no other request can see it.
                     pool_request.clear_connection()
+                    handed_back = True
                 else:
                     break  # pragma: nocover
 
@@ -250,6 +272,7 @@ class AsyncConnectionPool(AsyncRequestInterface):
                 # For any exception or cancellation we remove the request from
                 # the queue, and then re-assign requests to connections.
                 self._requests.remove(pool_request)
+                self._dequeue(pool_request)
                 closing = self._assign_requests_to_connections()
 
             await self._close_connections(closing)
@@ -267,6 +290,36 @@ class AsyncConnectionPool(AsyncRequestInterface):
             extensions=response.extensions,
         )
 
+    def _enqueue(self, pool_request: AsyncPoolRequest) -> None:
+        queue = self._waiting.get(pool_request.origin)
+        if queue is None:
+            queue = self._waiting[pool_request.origin] = deque()
+        if not queue or queue[-1].sequence < pool_request.sequence:
+            queue.append(pool_request)
+        else:
+            # A request handed back by its connection keeps its place in line.
+            index = next(
+                index
+                for index, waiting in enumerate(queue)
+                if waiting.sequence > pool_request.sequence
+            )
+            queue.insert(index, pool_request)
+
+    def _dequeue(self, pool_request: AsyncPoolRequest) -> None:
+        queue = self._waiting.get(pool_request.origin)
+        if queue is not None and pool_request in queue:
+            queue.remove(pool_request)
+            if not queue:
+                del self._waiting[pool_request.origin]
+
+    def _add_connection(self, connection: AsyncConnectionInterface, origin: Origin) -> None:
+        self._connections.append(connection)
+        self._connection_origins[connection] = origin
+
+    def _remove_connection(self, connection: AsyncConnectionInterface) -> None:
+        self._connections.remove(connection)
+        self._connection_origins.pop(connection, None)
+
     def _assign_requests_to_connections(self) -> list[AsyncConnectionInterface]:
         """
         Manage the state of the connection pool, assigning incoming
@@ -276,65 +329,97 @@ class AsyncConnectionPool(AsyncRequestInterface):
 
         Any closing connections are returned, allowing the I/O for closing
         those connections to be handled seperately.
+
+        The work done is linear in the number of connections plus the number
+        of origins with queued requests, rather than in their product.
         """
         closing_connections = []
+        available_connections: dict[Origin, list[AsyncConnectionInterface]] = {}
+        idle_connections: list[AsyncConnectionInterface] = []
 
         # First we handle cleaning up any connections that are closed,
         # have expired their keep-alive, or surplus idle connections.
+        # The connections we keep are indexed as we go: the idle ones, and the
+        # available ones of every origin that has requests waiting.
         for connection in list(self._connections):
             if connection.is_closed():
                 # log: "removing closed connection"
-                self._connections.remove(connection)
+                self._remove_connection(connection)
             elif connection.has_expired():
                 # log: "closing expired connection"
-                self._connections.remove(connection)
+                self._remove_connection(connection)
                 closing_connections.append(connection)
             elif (
                 connection.is_idle()
-                and len([connection.is_idle() for connection in self._connections])
-                > self._max_keepalive_connections
+                and len(self._connections) > self._max_keepalive_connections
             ):
                 # log: "closing idle connection"
-                self._connections.remove(connection)
+                self._remove_connection(connection)
                 closing_connections.append(connection)
-
-        # Assign queued requests to connections.
-        queued_requests = [request for request in self._requests if request.is_queued()]
-        for pool_request in queued_requests:
-            origin = pool_request.request.url.origin
-            available_connections = [
-                connection
-                for connection in self._connections
-                if connection.can_handle_request(origin) and connection.is_available()
-            ]
-            idle_connections = [
-                connection for connection in self._connections if connection.is_idle()
-            ]
-
-            # There are three cases for how we may be able to handle the request:
-            #
-            # 1. There is an existing connection that can handle the request.
-            # 2. We can create a new connection to handle the request.
-            # 3. We can close an idle connection and then create a new connection
-            #    to handle the request.
-            if available_connections:
-                # log: "reusing existing connection"
-                connection = available_connections[0]
-                pool_request.assign_to_connection(connection)
-            elif len(self._connections) < self._max_connections:
-                # log: "creating new connection"
-                connection = self.create_connection(origin)
-                self._connections.append(connection)
+            else:
+                if connection.is_idle():
+                    idle_connections.append(connection)
+                origin = self._connection_origins.get(connection)
+                origins = list(self._waiting) if origin is None else [origin]
+                for origin in origins:
+                    if (
+                        origin in self._waiting
+                        and connection.can_handle_request(origin)
+                        and connection.is_available()
+                    ):
+                        available_connections.setdefault(origin, []).append(
+                            connection
+                        )
+
+        # There are three cases for how we may be able to handle a request:
+        #
+        # 1. There is an existing connection that can handle the request.
+        # 2. We can create a new connection to handle the request.
+        # 3. We can close an idle connection and then create a new connection
+        #    to handle the request.
+        #
+        # Requests in the first case are spread over the available connections
+        # of their origin, in order. Any extra requests go to the first one: an
+        # HTTP/2 connection takes them all, and a busy HTTP/1.1 connection hands
+        # them back with ConnectionNotAvailable, to be queued again.
+        reused_connections: set[AsyncConnectionInterface] = set()
+        for origin, connections in available_connections.items():
+            # log: "reusing existing connection"
+            for index, pool_request in enumerate(self._waiting.pop(origin)):
+                connection = connections[index if index < len(connections) else 0]
                 pool_request.assign_to_connection(connection)
-            elif idle_connections:
+                reused_connections.add(connection)
+
+        # The others get new connections, in order of arrival across origins,
+        # while there is room in the pool or an idle connection to replace.
+        replaceable_connections = deque(
+            connection
+            for connection in idle_connections
+            if connection not in reused_connections
+        )
+        while self._waiting and (
+            len(self._connections) < self._max_connections or replaceable_connections
+        ):
+            origin = min(
+                self._waiting, key=lambda origin: self._waiting[origin][0].sequence
+            )
+            queue = self._waiting[origin]
+            pool_request = queue.popleft()
+            if len(self._connections) >= self._max_connections:
                 # log: "closing idle connection"
-                connection = idle_connections[0]
-                self._connections.remove(connection)
+                connection = replaceable_connections.popleft()
+                self._remove_connection(connection)
                 closing_connections.append(connection)
-                # log: "creating new connection"
-                connection = self.create_connection(origin)
-                self._connections.append(connection)
-                pool_request.assign_to_connection(connection)
+            # log: "creating new connection"
+            connection = self.create_connection(origin)
+            self._add_connection(connection, origin)
+            pool_request.assign_to_connection(connection)
+            if connection.is_available():
+                # The rest of the origin's requests can share it (HTTP/2).
+                while queue:
+                    queue.popleft().assign_to_connection(connection)
+            if not queue:
+                del self._waiting[origin]
 
         return closing_connections
 
@@ -350,6 +435,7 @@ class AsyncConnectionPool(AsyncRequestInterface):
         with self._optional_thread_lock:
             closing_connections = list(self._connections)
             self._connections = []
+            self._connection_origins = {}
         await self._close_connections(closing_connections)
 
     async def __aenter__(self) -> AsyncConnectionPool:
@@ -147,22 +147,45 @@ class Headers(typing.MutableMapping[str, str]):
         encoding: str | None = None,
     ) -> None:
         self._list = []  # type: typing.List[typing.Tuple[bytes, bytes, bytes]]
+        # Positions in `_list` of every lowercased key, in order
+        self._index = {}  # type: typing.Dict[bytes, typing.List[int]]
 
         if isinstance(headers, Headers):
             self._list = list(headers._list)
+            self._index = {
+                key: positions[:] for key, positions in headers._index.items()
+            }
         elif isinstance(headers, Mapping):
             for k, v in headers.items():
                 bytes_key = _normalize_header_key(k, encoding)
                 bytes_value = _normalize_header_value(v, encoding)
-                self._list.append((bytes_key, bytes_key.lower(), bytes_value))
+                self._append((bytes_key, bytes_key.lower(), bytes_value))
         elif headers is not None:
             for k, v in headers:
                 bytes_key = _normalize_header_key(k, encoding)
                 bytes_value = _normalize_header_value(v, encoding)
-                self._list.append((bytes_key, bytes_key.lower(), bytes_value))
+                self._append((bytes_key, bytes_key.lower(), bytes_value))
 
         self._encoding = encoding
 
+    def _append(self, item: tuple[bytes, bytes, bytes]) -> None:
+        positions = self._index.get(item[1])
+        if positions is None:
+            self._index[item[1]] = [len(self._list)]
+        else:
+            positions.append(len(self._list))
+        self._list.append(item)
+
+    def _reindex(self) -> None:
+        # Positions shift when items are removed from `_list`
+        self._index = {}
+        for idx, (_, key, _) in enumerate(self._list):
+            positions = self._index.get(key)
+            if positions is None:
+                self._index[key] = [idx]
+            else:
+                positions.append(idx)
+
     @property
     def encoding(self) -> str:
         """
@@ -258,9 +281,8 @@ class Headers(typing.MutableMapping[str, str]):
         get_header_key = key.lower().encode(self.encoding)
 
         values = [
-            item_value.decode(self.encoding)
-            for _, item_key, item_value in self._list
-            if item_key.lower() == get_header_key
+            self._list[idx][2].decode(self.encoding)
+            for idx in self._index.get(get_header_key, ())
         ]
 
         if not split_commas:
@@ -276,7 +298,8 @@ class Headers(typing.MutableMapping[str, str]):
         for key in headers.keys():
             if key in self:
                 self.pop(key)
-        self._list.extend(headers._list)
+        for item in headers._list:
+            self._append(item)
 
     def copy(self) -> Headers:
         return Headers(self, encoding=self.encoding)
@@ -290,16 +313,15 @@ class Headers(typing.MutableMapping[str, str]):
         """
         normalized_key = key.lower().encode(self.encoding)
 
-        items = [
-            header_value.decode(self.encoding)
-            for _, header_key, header_value in self._list
-            if header_key == normalized_key
-        ]
-
-        if items:
-            return ", ".join(items)
+        positions = self._index.get(normalized_key)
+        if positions is None:
+            raise KeyError(key)
 
-        raise KeyError(key)
+        if len(positions) == 1:
+            return self._list[positions[0]][2].decode(self.encoding)
+        return ", ".join(
+            self._list[idx][2].decode(self.encoding) for idx in positions
+        )
 
     def __setitem__(self, key: str, value: str) -> None:
         """
@@ -310,20 +332,17 @@ class Headers(typing.MutableMapping[str, str]):
         set_value = value.encode(self._encoding or "utf-8")
         lookup_key = set_key.lower()
 
-        found_indexes = [
-            idx
-            for idx, (_, item_key, _) in enumerate(self._list)
-            if item_key == lookup_key
-        ]
+        found_indexes = self._index.get(lookup_key)
 
-        for idx in reversed(found_indexes[1:]):
-            del self._list[idx]
+        if not found_indexes:
+            self._append((set_key, lookup_key, set_value))
+            return
 
-        if found_indexes:
-            idx = found_indexes[0]
-            self._list[idx] = (set_key, lookup_key, set_value)
-        else:
-            self._list.append((set_key, lookup_key, set_value))
+        self._list[found_indexes[0]] = (set_key, lookup_key, set_value)
+        if len(found_indexes) > 1:
+            for idx in reversed(found_indexes[1:]):
+                del self._list[idx]
+            self._reindex()
 
     def __delitem__(self, key: str) -> None:
         """
@@ -331,21 +350,22 @@ class Headers(typing.MutableMapping[str, str]):
         """
         del_key = key.lower().encode(self.encoding)
 
-        pop_indexes = [
-            idx
-            for idx, (_, item_key, _) in enumerate(self._list)
-            if item_key.lower() == del_key
-        ]
+        pop_indexes = self._index.get(del_key)
 
         if not pop_indexes:
             raise KeyError(key)
 
         for idx in reversed(pop_indexes):
             del self._list[idx]
+        if pop_indexes[0] >= len(self._list):
+            # They were the last headers, no other position has moved
+            del self._index[del_key]
+        else:
+            self._reindex()
 
     def __contains__(self, key: typing.Any) -> bool:
         header_key = key.lower().encode(self.encoding)
-        return header_key in [key for _, key, _ in self._list]
+        return header_key in self._index
 
     def __iter__(self) -> typing.Iterator[typing.Any]:
         return iter(self.keys())
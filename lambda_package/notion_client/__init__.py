@@ -7,6 +7,13 @@ For more information visit https://github.com/ramnes/notion-sdk-py.
 """
 
 from .client import AsyncClient, Client
+from .concurrency import AdaptiveConcurrencyLimiter
 from .errors import APIErrorCode, APIResponseError
 
-__all__ = ["AsyncClient", "Client", "APIErrorCode", "APIResponseError"]
+__all__ = [
+    "AsyncClient",
+    "Client",
+    "AdaptiveConcurrencyLimiter",
+    "APIErrorCode",
+    "APIResponseError",
+]
@@ -25,6 +25,8 @@ class BlocksChildrenEndpoint(Endpoint):
             method="PATCH",
             body=pick(kwargs, "children", "after"),
             auth=kwargs.get("auth"),
+            timeout_ms=kwargs.get("timeout_ms"),
+            status_only=kwargs.get("status_only", False),
         )
 
     def list(self, block_id: str, **kwargs: Any) -> SyncAsync[Any]:
@@ -37,6 +39,9 @@ class BlocksChildrenEndpoint(Endpoint):
             method="GET",
             query=pick(kwargs, "start_cursor", "page_size"),
             auth=kwargs.get("auth"),
+            timeout_ms=kwargs.get("timeout_ms"),
+            status_only=kwargs.get("status_only", False),
+            stream=kwargs.get("stream", False),
         )
 
 
@@ -51,7 +56,11 @@ class BlocksEndpoint(Endpoint):
         *[🔗 Endpoint documentation](https://developers.notion.com/reference/retrieve-a-block)*
         """  # noqa: E501
         return self.parent.request(
-            path=f"blocks/{block_id}", method="GET", auth=kwargs.get("auth")
+            path=f"blocks/{block_id}",
+            method="GET",
+            auth=kwargs.get("auth"),
+            timeout_ms=kwargs.get("timeout_ms"),
+            status_only=kwargs.get("status_only", False),
         )
 
     def update(self, block_id: str, **kwargs: Any) -> SyncAsync[Any]:
@@ -95,6 +104,8 @@ class BlocksEndpoint(Endpoint):
                 "table",
             ),
             auth=kwargs.get("auth"),
+            timeout_ms=kwargs.get("timeout_ms"),
+            status_only=kwargs.get("status_only", False),
         )
 
     def delete(self, block_id: str, **kwargs: Any) -> SyncAsync[Any]:
@@ -106,6 +117,8 @@ class BlocksEndpoint(Endpoint):
             path=f"blocks/{block_id}",
             method="DELETE",
             auth=kwargs.get("auth"),
+            timeout_ms=kwargs.get("timeout_ms"),
+            status_only=kwargs.get("status_only", False),
         )
 
 
@@ -122,6 +135,9 @@ class DatabasesEndpoint(Endpoint):
             method="GET",
             query=pick(kwargs, "start_cursor", "page_size"),
             auth=kwargs.get("auth"),
+            timeout_ms=kwargs.get("timeout_ms"),
+            status_only=kwargs.get("status_only", False),
+            stream=kwargs.get("stream", False),
         )
 
     def query(self, database_id: str, **kwargs: Any) -> SyncAsync[Any]:
@@ -135,6 +151,9 @@ class DatabasesEndpoint(Endpoint):
             query=pick(kwargs, "filter_properties"),
             body=pick(kwargs, "filter", "sorts", "start_cursor", "page_size"),
             auth=kwargs.get("auth"),
+            timeout_ms=kwargs.get("timeout_ms"),
+            status_only=kwargs.get("status_only", False),
+            stream=kwargs.get("stream", False),
         )
 
     def retrieve(self, database_id: str, **kwargs: Any) -> SyncAsync[Any]:
@@ -143,7 +162,11 @@ class DatabasesEndpoint(Endpoint):
         *[🔗 Endpoint documentation](https://developers.notion.com/reference/retrieve-a-database)*
         """  # noqa: E501
         return self.parent.request(
-            path=f"databases/{database_id}", method="GET", auth=kwargs.get("auth")
+            path=f"databases/{database_id}",
+            method="GET",
+            auth=kwargs.get("auth"),
+            timeout_ms=kwargs.get("timeout_ms"),
+            status_only=kwargs.get("status_only", False),
         )
 
     def create(self, **kwargs: Any) -> SyncAsync[Any]:
@@ -158,6 +181,8 @@ class DatabasesEndpoint(Endpoint):
                 kwargs, "parent", "title", "properties", "icon", "cover", "is_inline"
             ),
             auth=kwargs.get("auth"),
+            timeout_ms=kwargs.get("timeout_ms"),
+            status_only=kwargs.get("status_only", False),
         )
 
     def update(self, database_id: str, **kwargs: Any) -> SyncAsync[Any]:
@@ -178,6 +203,8 @@ class DatabasesEndpoint(Endpoint):
                 "is_inline",
             ),
             auth=kwargs.get("auth"),
+            timeout_ms=kwargs.get("timeout_ms"),
+            status_only=kwargs.get("status_only", False),
         )
 
 
@@ -191,7 +218,10 @@ class PagesPropertiesEndpoint(Endpoint):
             path=f"pages/{page_id}/properties/{property_id}",
             method="GET",
             auth=kwargs.get("auth"),
+            timeout_ms=kwargs.get("timeout_ms"),
+            status_only=kwargs.get("status_only", False),
             query=pick(kwargs, "start_cursor", "page_size"),
+            stream=kwargs.get("stream", False),
         )
 
 
@@ -210,6 +240,8 @@ class PagesEndpoint(Endpoint):
             method="POST",
             body=pick(kwargs, "parent", "properties", "children", "icon", "cover"),
             auth=kwargs.get("auth"),
+            timeout_ms=kwargs.get("timeout_ms"),
+            status_only=kwargs.get("status_only", False),
         )
 
     def retrieve(self, page_id: str, **kwargs: Any) -> SyncAsync[Any]:
@@ -222,6 +254,8 @@ class PagesEndpoint(Endpoint):
             method="GET",
             query=pick(kwargs, "filter_properties"),
             auth=kwargs.get("auth"),
+            timeout_ms=kwargs.get("timeout_ms"),
+            status_only=kwargs.get("status_only", False),
         )
 
     def update(self, page_id: str, **kwargs: Any) -> SyncAsync[Any]:
@@ -234,6 +268,8 @@ class PagesEndpoint(Endpoint):
             method="PATCH",
             body=pick(kwargs, "in_trash", "archived", "properties", "icon", "cover"),
             auth=kwargs.get("auth"),
+            timeout_ms=kwargs.get("timeout_ms"),
+            status_only=kwargs.get("status_only", False),
         )
 
 
@@ -248,6 +284,9 @@ class UsersEndpoint(Endpoint):
             method="GET",
             query=pick(kwargs, "start_cursor", "page_size"),
             auth=kwargs.get("auth"),
+            timeout_ms=kwargs.get("timeout_ms"),
+            status_only=kwargs.get("status_only", False),
+            stream=kwargs.get("stream", False),
         )
 
     def retrieve(self, user_id: str, **kwargs: Any) -> SyncAsync[Any]:
@@ -256,7 +295,11 @@ class UsersEndpoint(Endpoint):
         *[🔗 Endpoint documentation](https://developers.notion.com/reference/get-user)*
         """  # noqa: E501
         return self.parent.request(
-            path=f"users/{user_id}", method="GET", auth=kwargs.get("auth")
+            path=f"users/{user_id}",
+            method="GET",
+            auth=kwargs.get("auth"),
+            timeout_ms=kwargs.get("timeout_ms"),
+            status_only=kwargs.get("status_only", False),
         )
 
     def me(self, **kwargs: Any) -> SyncAsync[Any]:
@@ -265,7 +308,11 @@ class UsersEndpoint(Endpoint):
         *[🔗 Endpoint documentation](https://developers.notion.com/reference/get-self)*
         """  # noqa: E501
         return self.parent.request(
-            path="users/me", method="GET", auth=kwargs.get("auth")
+            path="users/me",
+            method="GET",
+            auth=kwargs.get("auth"),
+            timeout_ms=kwargs.get("timeout_ms"),
+            status_only=kwargs.get("status_only", False),
         )
 
 
@@ -280,6 +327,9 @@ class SearchEndpoint(Endpoint):
             method="POST",
             body=pick(kwargs, "query", "sort", "filter", "start_cursor", "page_size"),
             auth=kwargs.get("auth"),
+            timeout_ms=kwargs.get("timeout_ms"),
+            status_only=kwargs.get("status_only", False),
+            stream=kwargs.get("stream", False),
         )
 
 
@@ -294,6 +344,8 @@ class CommentsEndpoint(Endpoint):
             method="POST",
             body=pick(kwargs, "parent", "discussion_id", "rich_text"),
             auth=kwargs.get("auth"),
+            timeout_ms=kwargs.get("timeout_ms"),
+            status_only=kwargs.get("status_only", False),
         )
 
     def list(self, **kwargs: Any) -> SyncAsync[Any]:
@@ -306,4 +358,7 @@ class CommentsEndpoint(Endpoint):
             method="GET",
             query=pick(kwargs, "block_id", "start_cursor", "page_size"),
             auth=kwargs.get("auth"),
+            timeout_ms=kwargs.get("timeout_ms"),
+            status_only=kwargs.get("status_only", False),
+            stream=kwargs.get("stream", False),
         )
@@ -0,0 +1,119 @@
+"""Circuit breakers for notion-sdk-py.
+
+When Notion keeps answering with 5xx errors or not answering at all, sending more
+requests only burns time waiting for them to fail. A breaker that has seen too many
+consecutive failures opens and makes requests fail immediately; once its recovery
+timeout has elapsed it lets a single probe request through and closes again if
+that probe succeeds.
+"""
+import threading
+import time
+from enum import Enum
+from typing import Dict, Optional
+
+
+class CircuitState(str, Enum):
+    Closed = "closed"
+    """Requests flow normally."""
+
+    Open = "open"
+    """Requests fail fast until the recovery timeout elapses."""
+
+    HalfOpen = "half_open"
+    """A single probe request is in flight to test whether Notion recovered."""
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker for one family of endpoints."""
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = CircuitState.Closed
+        self.failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def retry_after(self) -> float:
+        """Return the number of seconds before the next probe is allowed."""
+        if self.state is not CircuitState.Open:
+            return 0.0
+        elapsed = time.monotonic() - self._opened_at
+        return max(0.0, self.recovery_timeout - elapsed)
+
+    def allow(self) -> bool:
+        """Return `True` if a request may be sent now."""
+        with self._lock:
+            if self.state is CircuitState.Closed:
+                return True
+            if self.state is CircuitState.Open and not self.retry_after():
+                self.state = CircuitState.HalfOpen
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Close the breaker after a request got a non-5xx response."""
+        with self._lock:
+            self.state = CircuitState.Closed
+            self.failures = 0
+
+    def release_probe(self) -> None:
+        """Give back the probe of a request cancelled before it got an outcome.
+
+        The next request is then let through as the probe instead.
+        """
+        with self._lock:
+            if self.state is CircuitState.HalfOpen:
+                self.state = CircuitState.Open
+                self._opened_at = time.monotonic() - self.recovery_timeout
+
+    def record_failure(self) -> None:
+        """Count a 5xx response or a request that got no response at all."""
+        with self._lock:
+            self.failures += 1
+            if (
+                self.state is CircuitState.HalfOpen
+                or self.failures >= self.failure_threshold
+            ):
+                self.state = CircuitState.Open
+                self._opened_at = time.monotonic()
+
+
+class CircuitBreakerRegistry:
+    """Hand out one `CircuitBreaker` per endpoint family (`pages`, `databases`...).
+
+    Keep the registry at module level to have breakers survive across warm
+    invocations of a serverless function.
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> CircuitBreaker:
+        """Return the breaker guarding the endpoint family of `path`."""
+        family = endpoint_family(path)
+        breaker = self._breakers.get(family)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(
+                    family,
+                    CircuitBreaker(self.failure_threshold, self.recovery_timeout),
+                )
+        return breaker
+
+    def states(self) -> Dict[str, CircuitState]:
+        """Return the current state of every breaker, by endpoint family."""
+        return {family: breaker.state for family, breaker in self._breakers.items()}
+
+
+def endpoint_family(path: str) -> str:
+    """Return the family of an API path, e.g. `databases` for `databases/x/query`."""
+    return path.lstrip("/").split("/", 1)[0]
+
+
+def is_failure(status_code: Optional[int]) -> bool:
+    """Return `True` if a response (or the lack of one) counts against a breaker."""
+    return status_code is None or status_code >= 500
@@ -1,8 +1,32 @@
 """Utility functions for notion-sdk-py."""
-from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, Generator, List
+import asyncio
+import hashlib
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generator,
+    List,
+)
 from urllib.parse import urlparse
 from uuid import UUID
 
+import httpx
+
+from notion_client.errors import HTTPResponseError, RequestTimeoutError
+
+if TYPE_CHECKING:  # pragma: no cover
+    from notion_client.client import AsyncClient, Client
+
+# Delay between an ambiguous failure of an idempotent create and the query for its
+# key, doubled on every further attempt: the query index of a database lags behind
+# its writes, so a page created a moment ago may not be found right away
+IDEMPOTENT_CREATE_BACKOFF = 1.0
+
 
 def pick(base: Dict[Any, Any], *keys: str) -> Dict[Any, Any]:
     """Return a dict composed of key value pairs for keys passed as args."""
@@ -63,8 +87,14 @@ async def async_iterate_paginated_api(
 
     while True:
         response = await function(**kwargs, start_cursor=next_cursor)
-        for result in response.get("results"):
-            yield result
+        results = response.get("results")
+        if hasattr(results, "__aiter__"):
+            # Streamed responses decode their results as they arrive
+            async for result in results:
+                yield result
+        else:
+            for result in results:
+                yield result
 
         next_cursor = response.get("next_cursor")
         if (not response["has_more"]) | (next_cursor is None):
@@ -78,6 +108,132 @@ async def async_collect_paginated_api(
     return [result async for result in async_iterate_paginated_api(function, **kwargs)]
 
 
+def idempotency_key(*parts: str) -> str:
+    """Return a deterministic idempotency key for the page described by `parts`."""
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()[:32]
+
+
+def is_ambiguous_failure(error: Exception) -> bool:
+    """Return `True` if the failed request may still have been applied by Notion."""
+    if isinstance(error, (RequestTimeoutError, httpx.TransportError)):
+        return True
+    return isinstance(error, HTTPResponseError) and error.status >= 500
+
+
+def _is_retryable(error: Exception) -> bool:
+    # Rate limited requests were not applied, and are worth another try too
+    if isinstance(error, HTTPResponseError) and error.status == 429:
+        return True
+    return is_ambiguous_failure(error)
+
+
+def _stamp_key(kwargs: Dict[str, Any], key: str, key_property: str) -> Dict[str, Any]:
+    properties = dict(kwargs.get("properties") or {})
+    properties[key_property] = {
+        "rich_text": [{"type": "text", "text": {"content": key}}]
+    }
+    return dict(kwargs, properties=properties)
+
+
+def _key_query(kwargs: Dict[str, Any], key: str, key_property: str) -> Dict[str, Any]:
+    return {
+        "database_id": kwargs["parent"]["database_id"],
+        "filter": {"property": key_property, "rich_text": {"equals": key}},
+        "page_size": 1,
+        "auth": kwargs.get("auth"),
+    }
+
+
+def create_page_idempotently(
+    client: "Client",
+    key: str,
+    key_property: str = "Idempotency Key",
+    max_attempts: int = 3,
+    **kwargs: Any,
+) -> Any:
+    """Create a page in a database once, however many times the create is tried.
+
+    `kwargs` are the arguments of `pages.create`, whose `parent` must be a
+    database. The page is stamped with `key` in its `key_property` rich text
+    property, which the database must have. When a create fails in a way that
+    leaves unknown whether the page was created (a timeout, a connection error
+    or a server error), the database is queried for the key, after a backoff
+    that gives the query index time to catch up: the page found is returned, or
+    else the create is tried again, up to `max_attempts` times. Rate limited
+    creates and key queries failing the same ways are tried again too, within
+    the same attempts. Other errors are raised right away.
+    """
+    kwargs = _stamp_key(kwargs, key, key_property)
+    query = _key_query(kwargs, key, key_property)
+    max_attempts = max(max_attempts, 1)
+    # Whether a create that failed may have been applied all the same
+    unsure = False
+    for attempt in range(1, max_attempts + 1):
+        if attempt > 1:
+            time.sleep(IDEMPOTENT_CREATE_BACKOFF * 2 ** (attempt - 2))
+        creating = False
+        try:
+            if unsure:
+                existing = client.databases.query(**query).get("results")
+                if existing:
+                    return existing[0]
+                unsure = False
+            creating = True
+            return client.pages.create(**kwargs)
+        except Exception as error:
+            if not _is_retryable(error):
+                raise
+            failure = error
+            unsure = unsure or (creating and is_ambiguous_failure(error))
+    if unsure:
+        # Last look for the page of the last attempt
+        time.sleep(IDEMPOTENT_CREATE_BACKOFF * 2 ** (max_attempts - 1))
+        existing = client.databases.query(**query).get("results")
+        if existing:
+            return existing[0]
+    raise failure
+
+
+async def async_create_page_idempotently(
+    client: "AsyncClient",
+    key: str,
+    key_property: str = "Idempotency Key",
+    max_attempts: int = 3,
+    **kwargs: Any,
+) -> Any:
+    """Create a page in a database once, asynchronously.
+
+    Works as `create_page_idempotently`.
+    """
+    kwargs = _stamp_key(kwargs, key, key_property)
+    query = _key_query(kwargs, key, key_property)
+    max_attempts = max(max_attempts, 1)
+    unsure = False
+    for attempt in range(1, max_attempts + 1):
+        if attempt > 1:
+            await asyncio.sleep(IDEMPOTENT_CREATE_BACKOFF * 2 ** (attempt - 2))
+        creating = False
+        try:
+            if unsure:
+                existing = (await client.databases.query(**query)).get("results")
+                if existing:
+                    return existing[0]
+                unsure = False
+            creating = True
+            return await client.pages.create(**kwargs)
+        except Exception as error:
+            if not _is_retryable(error):
+                raise
+            failure = error
+            unsure = unsure or (creating and is_ambiguous_failure(error))
+    if unsure:
+        await asyncio.sleep(IDEMPOTENT_CREATE_BACKOFF * 2 ** (max_attempts - 1))
+        existing = (await client.databases.query(**query)).get("results")
+        if existing:
+            return existing[0]
+    raise failure
+
+
 def is_full_block(response: Dict[Any, Any]) -> bool:
     """Return `True` if response is a full block."""
     return response.get("object") == "block" and "type" in response
@@ -0,0 +1,103 @@
+"""Client-side rate limiting for notion-sdk-py.
+
+Notion allows an average of three requests per second per integration token, with
+some bursts beyond that. Requests over the limit come back as `rate_limited`.
+"""
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Return the delay of a `Retry-After` header in seconds, or `None`.
+
+    Notion sends a number of seconds; HTTP dates are not supported.
+    """
+    if value is None:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        return None
+    return delay if delay >= 0 else None
+
+
+class RateLimiter:
+    """Token bucket shared by every request sent with the same bearer token.
+
+    Callers reserve a token before sending. When the bucket is empty the reservation
+    still succeeds but the caller is told how long to wait, so concurrent callers
+    are spaced out instead of all retrying at once.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be a positive number of requests per second")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take a token and return the number of seconds to wait before using it."""
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def try_acquire(self) -> bool:
+        """Take a token only if one is available right now."""
+        with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every request for `seconds`, after a `rate_limited` response."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+    def acquire(self) -> None:
+        """Block the current thread until a request may be sent."""
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def async_acquire(self) -> None:
+        """Wait asynchronously until a request may be sent."""
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+class RateLimiterRegistry:
+    """Hand out one `RateLimiter` per bearer token."""
+
+    def __init__(self, rate: float, burst: Optional[int] = None) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._limiters: Dict[Optional[str], RateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, auth: Optional[str]) -> RateLimiter:
+        """Return the limiter for `auth`, creating it on first use."""
+        limiter = self._limiters.get(auth)
+        if limiter is None:
+            with self._lock:
+                limiter = self._limiters.setdefault(
+                    auth, RateLimiter(self.rate, self.burst)
+                )
+        return limiter
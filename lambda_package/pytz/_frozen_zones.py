@@ -0,0 +1,11 @@
+"""Timezone tables frozen by freeze_zones.py (tz database 2025b).
+
+Do not edit by hand: run `python freeze_zones.py <zone>...` to regenerate.
+Each entry is a table for pytz.tzfile.build_frozen_tzinfo.
+"""
+
+FROZEN_ZONES = {'Asia/Kolkata': ((None, -2147483648, -2019705670, -891581400, -872058600, -862637400,
+                   -764145000),
+                  ((21180, 0, 'LMT'), (19260, 0, 'MMT'), (19800, 0, 'IST'),
+                   (23400, 3600, '+0630'), (19800, 0, 'IST'), (23400, 3600, '+0630'),
+                   (19800, 0, 'IST')))}
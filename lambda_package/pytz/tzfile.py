@@ -122,6 +122,47 @@ def build_tzinfo(zone, fp):
 
     return cls()
 
+def build_frozen_tzinfo(zone, table):
+    """Build a tzinfo from tables made by freeze_tzinfo, without any file access.
+
+    `table` is either (utcoffset, tzname) for a zone with a single offset, or
+    (transitions, transition_info) where transitions are UTC epoch seconds (None
+    standing for datetime.min) and transition_info holds (utcoffset, dst, tzname)
+    triples, offsets in seconds.
+    """
+    if not isinstance(table[0], tuple):
+        utcoffset, tzname = table
+        cls = type(zone, (StaticTzInfo,), dict(
+            zone=zone,
+            _utcoffset=memorized_timedelta(utcoffset),
+            _tzname=tzname))
+    else:
+        transitions, infos = table
+        cls = type(zone, (DstTzInfo,), dict(
+            zone=zone,
+            _utc_transition_times=[
+                datetime.min if trans is None else memorized_datetime(trans)
+                for trans in transitions],
+            _transition_info=[memorized_ttinfo(*info) for info in infos]))
+    return cls()
+
+
+def freeze_tzinfo(tz):
+    """Return the tables build_frozen_tzinfo needs to rebuild `tz`."""
+    def seconds(delta):
+        return delta.days * 86400 + delta.seconds
+
+    if isinstance(tz, StaticTzInfo):
+        return (seconds(tz._utcoffset), tz._tzname)
+    transitions = tuple(
+        None if trans == datetime.min
+        else seconds(trans - memorized_datetime(0))
+        for trans in tz._utc_transition_times)
+    infos = tuple(
+        (seconds(utcoffset), seconds(dst), tzname)
+        for utcoffset, dst, tzname in tz._transition_info)
+    return (transitions, infos)
+
 if __name__ == '__main__':
     import os.path
     from pprint import pprint
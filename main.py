@@ -1,98 +1,304 @@
-import os
+import json
+import math
+import re
 import pytz
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from notion_client import Client
-from dotenv import load_dotenv
+from functools import lru_cache, partial
+from typing import Any, NamedTuple, Optional
+from notion_client import APIErrorCode, APIResponseError, Client
+from notion_client.errors import SchemaValidationError
+from notion_client.helpers import (
+    IDEMPOTENT_CREATE_BACKOFF, create_page_idempotently, idempotency_key
+)
+from notion_client.schema import SchemaCache
+from notion_client.circuit import CircuitBreakerRegistry
+from dotenv import dotenv_values
+from config import load_config
 import random
 
-# Load environment variables from .env file
-load_dotenv()
-
-# Use proper environment variable retrieval
-notion = Client(auth=os.environ.get("NOTION_API_KEY"))
+# Settings from the environment (and, outside Lambda, from the .env file)
+CONFIG = load_config()
+
+# Notion allows an average of 3 requests per second per integration token
+NOTION_RATE_LIMIT = CONFIG.rate_limit
+
+# Maximum number of tenants processed at the same time in one invocation
+TENANT_WORKERS = CONFIG.tenant_workers
+
+# Maximum number of archive requests of one tenant in flight at the same time
+ARCHIVE_WORKERS = 4
+
+# Archives are small writes that should fail fast (they are retried by the next
+# run), while a page of a full database scan may take Notion long to answer
+ARCHIVE_TIMEOUT_MS = 10_000
+QUERY_TIMEOUT_MS = {"read": 120_000}
+
+# One client (and one connection pool) shared by every tenant. Requests are sent
+# with the tenant's token, and each token gets its own rate limiter. The circuit
+# breakers live as long as the module, so a warm Lambda remembers a Notion outage
+# and fails fast instead of waiting on every request. The pool keeps a connection
+# open for every request that can be in flight at once. Connecting or waiting
+# for a connection should never take long, whatever the request.
+notion = Client(
+    auth=CONFIG.notion_api_key,
+    rate_limit=NOTION_RATE_LIMIT,
+    circuit_breakers=CircuitBreakerRegistry(),
+    max_keepalive_connections=TENANT_WORKERS * ARCHIVE_WORKERS,
+    connect_timeout_ms=10_000,
+    pool_timeout_ms=10_000,
+)
+
+# Rich text property stamped with an idempotency key on every event created, so
+# that creates can be retried without duplicates (unset: plain creates)
+IDEMPOTENCY_PROPERTY = CONFIG.idempotency_property
+
+# Database schemas, fetched at most every 10 minutes (kept across warm invocations)
+# to check event properties before sending them
+SCHEMAS = SchemaCache(ttl=600)
 
 # Your Notion database ID - Fixed to use proper environment variable retrieval
-DATABASE_ID = os.environ.get("NOTION_DATABASE_ID")
-# Timezone setting - change to your timezone
-TIMEZONE = pytz.timezone('Asia/Kolkata')  # Change to your timezone
+DATABASE_ID = CONFIG.database_id
+# Timezone setting - set NOTION_TIMEZONE to change it (default Asia/Kolkata)
+TIMEZONE = pytz.timezone(CONFIG.timezone)
 
-def get_current_day():
-    """Get the current day of the week"""
-    now = datetime.now(TIMEZONE)
-    days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-    return days[now.weekday()]
+# Maximum page size allowed by the Notion API for database queries
+QUERY_PAGE_SIZE = 100
+# Typical round trip of one Notion API request, used by dry-run estimates (seconds)
+ESTIMATED_REQUEST_LATENCY = CONFIG.estimated_latency
 
-def get_time_block(time_str, date):
-    """Convert time string to datetime object"""
-    if "-" in time_str:
-        # Extract start time from range (e.g., "7:30-8:00 AM" -> "7:30 AM")
-        time_str = time_str.split("-")[0].strip()
+# Last known pages of each database, by database ID (kept across warm invocations)
+TASKS_CACHE = {}
 
-    hour, minute = map(int, time_str.replace(" AM", "").replace(" PM", "").split(":"))
-    if "PM" in time_str and hour != 12:
-        hour += 12
-    if "AM" in time_str and hour == 12:
-        hour = 0
 
-    return datetime(
-        date.year, date.month, date.day, hour, minute, tzinfo=TIMEZONE
-    ).isoformat()
+@dataclass(frozen=True)
+class Tenant:
+    """One person's calendar: whose token to use, which database, which schedule"""
+    name: str
+    token: Optional[str]
+    database_id: Optional[str]
+    timezone: Any = TIMEZONE
+    schedule: str = "default"
 
-def parse_time_range(time_range, date):
-    """Parse a time range like '7:30-8:00 AM' into start and end times"""
-    if "-" not in time_range:
-        # If there's no range, default to 1 hour duration
-        start_time = time_range
-        start_hour, start_minute = map(int, start_time.replace(" AM", "").replace(" PM", "").split(":"))
-        is_pm = "PM" in start_time
-        is_am = "AM" in start_time
 
-        if is_pm and start_hour != 12:
-            start_hour += 12
-        if is_am and start_hour == 12:
-            start_hour = 0
+# The tenant described by NOTION_API_KEY / NOTION_DATABASE_ID
+DEFAULT_TENANT = Tenant(
+    name="default",
+    token=CONFIG.notion_api_key,
+    database_id=DATABASE_ID,
+)
 
-        # Create datetime objects
-        start_dt = datetime(date.year, date.month, date.day, start_hour, start_minute, tzinfo=TIMEZONE)
-        end_dt = start_dt + timedelta(hours=1)
-        return start_dt.isoformat(), end_dt.isoformat()
+def get_current_day(tenant=None):
+    """Get the current day of the week"""
+    tenant = tenant or DEFAULT_TENANT
+    now = datetime.now(tenant.timezone)
+    days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+    return days[now.weekday()]
 
-    # Split into start and end times
-    parts = time_range.split("-")
-    start_time = parts[0].strip()
-    end_time = parts[1].strip()
+# Schedule times look like "7:30-8:00 AM" (meridiem shared by both ends),
+# "10:15 AM-12:15 PM" (one meridiem per end), "9:30 PM" (single time) or "All day"
+TIME_RANGE_PATTERN = re.compile(
+    r"^\s*(?:(?P<all_day>all\s+day)"
+    r"|(?P<start_hour>\d{1,2}):(?P<start_minute>\d{2})\s*(?P<start_meridiem>[AP]M)?"
+    r"(?:\s*-\s*(?P<end_hour>\d{1,2}):(?P<end_minute>\d{2})\s*(?P<end_meridiem>[AP]M)?)?)\s*$",
+    re.IGNORECASE,
+)
+
+class TimeSpec(NamedTuple):
+    """A schedule time, in minutes after midnight (both None for all-day events)"""
+    start: Optional[int]
+    end: Optional[int]
+
+def to_minutes(hour, minute, meridiem):
+    """Convert a 12-hour (or 24-hour, without meridiem) time to minutes after midnight"""
+    if meridiem == "PM" and hour != 12:
+        hour += 12
+    if meridiem == "AM" and hour == 12:
+        hour = 0
+    return hour * 60 + minute
+
+@lru_cache(maxsize=None)
+def compile_time_range(time_range):
+    """Parse a schedule time string into a TimeSpec, once per distinct string"""
+    match = TIME_RANGE_PATTERN.match(time_range)
+    if not match:
+        raise ValueError(f"Unrecognised time range: {time_range!r}")
+    if match["all_day"]:
+        return TimeSpec(None, None)
+
+    start_hour, start_minute = int(match["start_hour"]), int(match["start_minute"])
+    start_meridiem = match["start_meridiem"] and match["start_meridiem"].upper()
+    if match["end_hour"] is None:
+        # If there's no range, default to 1 hour duration
+        start = to_minutes(start_hour, start_minute, start_meridiem)
+        return TimeSpec(start, start + 60)
+
+    end_meridiem = match["end_meridiem"] and match["end_meridiem"].upper()
+    end = to_minutes(int(match["end_hour"]), int(match["end_minute"]), end_meridiem or start_meridiem)
+    start = to_minutes(start_hour, start_minute, start_meridiem or end_meridiem)
+    if start_meridiem is None and end_meridiem and start > end:
+        # "10:15-12:15 PM" starts in the morning: the meridiem only applies to the end
+        start = to_minutes(start_hour, start_minute, "AM" if end_meridiem == "PM" else "PM")
+    if end <= start:
+        # The event runs past midnight
+        end += 24 * 60
+    return TimeSpec(start, end)
+
+@lru_cache(maxsize=256)
+def compile_time_ranges(time_ranges):
+    """Compile a day's schedule times once, for every day they are localized on
+
+    Gives their TimeSpecs, the offsets after midnight of the start and end of
+    every timed event, and the earliest and latest of those offsets.
+    """
+    specs = tuple(compile_time_range(time_range) for time_range in time_ranges)
+    offsets = tuple(
+        timedelta(minutes=minutes)
+        for spec in specs if spec.start is not None
+        for minutes in (spec.start, spec.end)
+    )
+    window = (min(offsets), max(offsets)) if offsets else None
+    return specs, offsets, window
+
+def localize_time_ranges(time_ranges, day, timezone):
+    """Turn schedule times on a given day into ISO start/end datetimes in `timezone`
+
+    The start and end of every timed event are localized together, in one pass
+    over the timezone's transitions (localize_many/normalize_many). On days
+    without a change of offset, only the earliest and latest are.
+    """
+    specs, offsets, window = compile_time_ranges(tuple(time_ranges))
+    midnight = datetime(day.year, day.month, day.day)
+    wall_times = [midnight + offset for offset in offsets]
+    if window is None:
+        localized = iter(())
+    else:
+        first, last = timezone.localize_many([midnight + window[0], midnight + window[1]])
+        if first.tzinfo is last.tzinfo:
+            # Offsets change a few times a year at most: when the earliest and
+            # latest times share one, every time in between has it too
+            localized = (wall_time.replace(tzinfo=first.tzinfo) for wall_time in wall_times)
+        else:
+            # normalize() moves wall times skipped by a DST change to the real instant
+            localized = iter(timezone.normalize_many(timezone.localize_many(wall_times)))
+    return [
+        (day.isoformat(), None) if spec.start is None
+        else (next(localized).isoformat(), next(localized).isoformat())
+        for spec in specs
+    ]
 
-    # Parse the start time
-    start_hour, start_minute = map(int, start_time.replace(" AM", "").replace(" PM", "").split(":"))
-    is_pm = "PM" in start_time
-    is_am = "AM" in start_time
+@lru_cache(maxsize=4096)
+def localize_time_range(time_range, day, timezone):
+    """Turn a schedule time on a given day into ISO start/end datetimes in `timezone`"""
+    return localize_time_ranges((time_range,), day, timezone)[0]
 
-    if is_pm and start_hour != 12:
-        start_hour += 12
-    if is_am and start_hour == 12:
-        start_hour = 0
+def parse_time_range(time_range, date, timezone=None):
+    """Parse a time range like '7:30-8:00 AM' into start and end times
 
-    # Parse the end time
-    end_hour, end_minute = map(int, end_time.replace(" AM", "").replace(" PM", "").split(":"))
-    is_pm = "PM" in end_time
-    is_am = "AM" in end_time
+    All-day events give the ISO date as the start and None as the end.
+    """
+    day = date.date() if isinstance(date, datetime) else date
+    return localize_time_range(time_range, day, timezone or TIMEZONE)
 
-    if is_pm and end_hour != 12:
-        end_hour += 12
-    if is_am and end_hour == 12:
-        end_hour = 0
+def get_time_block(time_str, date, timezone=None):
+    """Convert time string to datetime object"""
+    return parse_time_range(time_str, date, timezone)[0]
 
-    # Create datetime objects
-    start_dt = datetime(date.year, date.month, date.day, start_hour, start_minute, tzinfo=TIMEZONE)
-    end_dt = datetime(date.year, date.month, date.day, end_hour, end_minute, tzinfo=TIMEZONE)
+def compile_schedules():
+    """Parse every time string of the week's schedules in one go, at cold start
 
-    return start_dt.isoformat(), end_dt.isoformat()
+    This also makes a malformed time in a schedule fail at import instead of
+    halfway through a run.
+    """
+    monday = datetime(2024, 1, 1)
+    for schedule in SCHEDULES.values():
+        for offset in range(7):
+            for event in schedule(monday + timedelta(days=offset)):
+                compile_time_range(event["time"])
 
 
 def get_category_from_time(time_str):
     return None
 
-def create_notion_event(title, time_range, details, checkbox_items, category=None, color=None):
+def build_event_properties(title, time_range, details, today, category=None, color=None):
+    """Build the Notion page properties of one event"""
+    properties = {
+        "Name": {
+            "title": [
+                {
+                    "text": {
+                        "content": title
+                    }
+                }
+            ]
+        },
+        "Date": {
+            "date": {
+                "start": today
+            }
+        },
+        "Time": {
+            "rich_text": [
+                {
+                    "text": {
+                        "content": time_range
+                    }
+                }
+            ]
+        },
+        "Details": {
+            "rich_text": [
+                {
+                    "text": {
+                        "content": details
+                    }
+                }
+            ]
+        }
+    }
+    
+    # Add category if provided
+    if category:
+        properties["Category"] = {
+            "rich_text": [
+                {
+                    "text": {
+                        "content": category
+                    }
+                }
+            ]
+        }
+    
+    # Add color if provided (using a rich_text property)
+    if color:
+        properties["Color"] = {
+           "rich_text": [
+                {
+                    "text": {
+                        "content": color
+                    }
+                }
+            ]
+        }
+    return properties
+
+def build_checklist_blocks(checkbox_items):
+    """Build the to-do blocks appended under an event page"""
+    children = []
+    for item in checkbox_items:
+        children.append({
+            "object": "block",
+            "type": "to_do",
+            "to_do": {
+                "rich_text": [{"type": "text", "text": {"content": item}}],
+                "checked": False
+            }
+        })
+    return children
+
+def create_notion_event(title, time_range, details, checkbox_items, category=None, color=None, tenant=None,
+                        properties=None):
     """Create a single event in Notion with proper structure
     
     Args:
@@ -103,75 +309,35 @@ def create_notion_event(title, time_range, details, checkbox_items, category=Non
         category (str): Morning/Afternoon/Evening
         color (str): Color for the event (blue, red, green, yellow, orange, pink, purple, brown, gray)
                     This will be visible as a colored dot/tag in the Notion interface
+        tenant (Tenant): Whose database to create the event in (defaults to DEFAULT_TENANT)
+        properties (dict): Page properties already built for the event (built from the
+                    arguments above if not given)
     """
-    today = datetime.now(TIMEZONE).strftime("%Y-%m-%d")
+    tenant = tenant or DEFAULT_TENANT
+    today = datetime.now(tenant.timezone).strftime("%Y-%m-%d")
     
     try:
         # Create properties for the Notion page
-        properties = {
-            "Name": {
-                "title": [
-                    {
-                        "text": {
-                            "content": title
-                        }
-                    }
-                ]
-            },
-            "Date": {
-                "date": {
-                    "start": today
-                }
-            },
-            "Time": {
-                "rich_text": [
-                    {
-                        "text": {
-                            "content": time_range
-                        }
-                    }
-                ]
-            },
-            "Details": {
-                "rich_text": [
-                    {
-                        "text": {
-                            "content": details
-                        }
-                    }
-                ]
-            }
-        }
-        
-        # Add category if provided
-        if category:
-            properties["Category"] = {
-                "rich_text": [
-                    {
-                        "text": {
-                            "content": category
-                        }
-                    }
-                ]
-            }
-        
-        # Add color if provided (using a rich_text property)
-        if color:
-            properties["Color"] = {
-               "rich_text": [
-                    {
-                        "text": {
-                            "content": color
-                        }
-                    }
-                ]
-            }
+        if properties is None:
+            properties = build_event_properties(title, time_range, details, today, category, color)
         
         # Create the page in Notion
-        page = notion.pages.create(
-            parent={"database_id": DATABASE_ID},
-            properties=properties
-        )
+        if IDEMPOTENCY_PROPERTY:
+            # Retried on timeouts and server errors, without ever creating it twice
+            page = create_page_idempotently(
+                notion,
+                idempotency_key(today, title, time_range),
+                key_property=IDEMPOTENCY_PROPERTY,
+                parent={"database_id": tenant.database_id},
+                properties=properties,
+                auth=tenant.token
+            )
+        else:
+            page = notion.pages.create(
+                parent={"database_id": tenant.database_id},
+                properties=properties,
+                auth=tenant.token
+            )
         
         # Check if page was created successfully
         if page:
@@ -181,21 +347,14 @@ def create_notion_event(title, time_range, details, checkbox_items, category=Non
         
         # Add checkbox items if provided
         if checkbox_items and page:
-            children = []
-            for item in checkbox_items:
-                children.append({
-                    "object": "block",
-                    "type": "to_do",
-                    "to_do": {
-                        "rich_text": [{"type": "text", "text": {"content": item}}],
-                        "checked": False
-                    }
-                })
+            children = build_checklist_blocks(checkbox_items)
             
             if children:
                 response = notion.blocks.children.append(
                     block_id=page["id"],
-                    children=children
+                    children=children,
+                    auth=tenant.token,
+                    status_only=True  # Only success matters, skip decoding the blocks
                 )
                 
                 if response:
@@ -206,42 +365,66 @@ def create_notion_event(title, time_range, details, checkbox_items, category=Non
         return page
     
     except Exception as e:
+        if isinstance(e, APIResponseError) and e.code == APIErrorCode.ValidationError:
+            # The database schema may have changed since it was cached
+            SCHEMAS.invalidate(tenant.database_id)
         print(f"Error creating event {title}: {e}")
         return None
 
-def remove_tasks_without_todays_date():
+def is_stale_task(task, today):
+    """Tell whether a task should be archived because it isn't dated today"""
+    date_property = task.get("properties", {}).get("Date", {})
+    date_value = date_property.get("date", {})
+    
+    # Check if date is empty (None) or not equal to today
+    return date_value is None or date_value.get("start") != today
+
+def fetch_tasks(tenant=None):
+    """Fetch every page of the tenant's database, following pagination"""
+    tenant = tenant or DEFAULT_TENANT
+    tasks = []
+    has_more = True
+    next_cursor = None
+    
+    # Get all tasks with pagination
+    while has_more:
+        # Query parameters
+        query_params = {
+            "database_id": tenant.database_id,
+            "page_size": QUERY_PAGE_SIZE,
+            "auth": tenant.token,
+            "timeout_ms": QUERY_TIMEOUT_MS
+        }
+        
+        # Add start_cursor if we have one from previous pagination
+        if next_cursor:
+            query_params["start_cursor"] = next_cursor
+            
+        # Execute query, decoding the pages one by one as the response arrives
+        response = notion.databases.query(**query_params, stream=True)
+        
+        # Add results to our tasks list
+        fetched = len(tasks)
+        tasks.extend(response.get("results"))
+        
+        # Check if there are more results (they follow the results in the response)
+        has_more = response.get("has_more", False)
+        next_cursor = response.get("next_cursor")
+        
+        # Print progress
+        print(f"Fetched {len(tasks) - fetched} tasks from Notion database...")
+    
+    # Remember what the database looked like for dry runs in later warm invocations
+    TASKS_CACHE[tenant.database_id] = tasks
+    return tasks
+
+def remove_tasks_without_todays_date(tenant=None):
     """Removes all tasks from the database that don't have today's date."""
-    today = datetime.now(TIMEZONE).strftime("%Y-%m-%d")
+    tenant = tenant or DEFAULT_TENANT
+    today = datetime.now(tenant.timezone).strftime("%Y-%m-%d")
     
     try:
-        tasks = []
-        has_more = True
-        next_cursor = None
-        
-        # Get all tasks with pagination
-        while has_more:
-            # Query parameters
-            query_params = {
-                "database_id": DATABASE_ID,
-                "page_size": 100  # Maximum allowed by Notion API
-            }
-            
-            # Add start_cursor if we have one from previous pagination
-            if next_cursor:
-                query_params["start_cursor"] = next_cursor
-                
-            # Execute query
-            response = notion.databases.query(**query_params)
-            
-            # Add results to our tasks list
-            tasks.extend(response.get("results", []))
-            
-            # Check if there are more results
-            has_more = response.get("has_more", False)
-            next_cursor = response.get("next_cursor")
-            
-            # Print progress
-            print(f"Fetched {len(response.get('results', []))} tasks from Notion database...")
+        tasks = fetch_tasks(tenant)
         
         print(f"Total tasks retrieved: {len(tasks)}")
         
@@ -249,29 +432,37 @@ def remove_tasks_without_todays_date():
             print("No tasks found in the database.")
             return 0
         
-        tasks_to_remove = []
-        
         # Filter tasks manually
-        for task in tasks:
-            date_property = task.get("properties", {}).get("Date", {})
-            date_value = date_property.get("date", {})
-            
-            # Check if date is empty (None) or not equal to today
-            if date_value is None or date_value.get("start") != today:
-                tasks_to_remove.append(task)
+        tasks_to_remove = [task for task in tasks if is_stale_task(task, today)]
         
         print(f"Found {len(tasks_to_remove)} tasks without today's date ({today}).")
         
-        # Archive each task that doesn't have today's date
-        for task in tasks_to_remove:
-            notion.pages.update(
-                page_id=task["id"],
-                archived=True  # This effectively deletes the page in Notion
-            )
-            print(f"Removed task: {task['id']}")
+        # Archive the tasks that don't have today's date, a few at a time
+        results = notion.batch(
+            [
+                partial(
+                    notion.pages.update,
+                    page_id=task["id"],
+                    archived=True,  # This effectively deletes the page in Notion
+                    auth=tenant.token,
+                    timeout_ms=ARCHIVE_TIMEOUT_MS,
+                    status_only=True  # Only success matters, skip decoding the page
+                )
+                for task in tasks_to_remove
+            ],
+            max_workers=ARCHIVE_WORKERS,
+        )
+        removed_ids = set()
+        for task, result in zip(tasks_to_remove, results):
+            if result.ok:
+                removed_ids.add(task["id"])
+                print(f"Removed task: {task['id']}")
+            else:
+                print(f"Error removing task {task['id']}: {result.error}")
+        TASKS_CACHE[tenant.database_id] = [task for task in tasks if task["id"] not in removed_ids]
         
-        print(f"Successfully removed {len(tasks_to_remove)} task(s) that didn't have today's date = {today}.")
-        return len(tasks_to_remove)
+        print(f"Successfully removed {len(removed_ids)} task(s) that didn't have today's date = {today}.")
+        return len(removed_ids)
     
     except Exception as e:
         print(f"Error removing tasks: {e}")
@@ -314,26 +505,57 @@ def get_events_for_day(date):
             # Color will be assigned randomly
         }]
 
-def create_events_for_day(date):
+def create_events_for_day(date, tenant=None):
     """Create events in Notion for a specific day"""
-    events = get_events_for_day(date)
+    tenant = tenant or DEFAULT_TENANT
+    events = SCHEDULES[tenant.schedule](date)
     created_count = 0
-    
+    today = datetime.now(tenant.timezone).strftime("%Y-%m-%d")
+
+    # Shape the properties of every event for the database before touching it: a
+    # schema mismatch fails the run with all its problems at once, without
+    # archiving anything or sending a single create
+    try:
+        schema = SCHEMAS.get(notion, tenant.database_id, auth=tenant.token)
+    except Exception as e:
+        # Each create then fails or succeeds on its own, as without the check
+        print(f"Error fetching the database schema, creating events unchecked: {e}")
+        schema = None
+    planned = []
+    problems = []
+    for event in reversed(events):
+        color = get_random_color()
+        category = get_category_from_time(event["time"])
+        properties = build_event_properties(
+            event["title"], event["time"], event["details"], today, category, color
+        )
+        if schema is not None:
+            try:
+                properties = schema.encode(properties)
+            except SchemaValidationError as e:
+                problems.extend(problem for problem in e.problems if problem not in problems)
+                continue
+        planned.append((color, category, properties))
+    # create_page_idempotently stamps the key into this property of every event
+    if schema is not None and IDEMPOTENCY_PROPERTY and (
+        schema.properties.get(IDEMPOTENCY_PROPERTY) != "rich_text"
+    ):
+        problems.append(
+            f"{IDEMPOTENCY_PROPERTY!r} (NOTION_IDEMPOTENCY_PROPERTY) is not a rich text "
+            "property of the database"
+        )
+    if problems:
+        raise SchemaValidationError(problems)
+
     # Remove tasks that don't have today's date
-    removed_count = remove_tasks_without_todays_date()
+    removed_count = remove_tasks_without_todays_date(tenant)
     print(f"Removed {removed_count} tasks without today's date")
 
-    for event in reversed(events):
+    for event, (color, category, properties) in zip(reversed(events), planned):
         title = event["title"]
         time_range = event["time"]
         details = event["details"]
         checkbox_items = event.get("checkbox_items", [])
-        
-        # Get a random color
-        color = get_random_color()
-        
-        # Parse the time range into start and end times
-        start_time, end_time = parse_time_range(time_range, date)
 
         # Create the event in Notion
         result = create_notion_event(
@@ -341,15 +563,142 @@ def create_events_for_day(date):
             time_range=time_range, 
             details=details, 
             checkbox_items=checkbox_items,
-            category=get_category_from_time(time_range),
-            color=color
+            category=category,
+            color=color,
+            tenant=tenant,
+            properties=properties
         )
         if result:
             created_count += 1
+            TASKS_CACHE.setdefault(tenant.database_id, []).append(result)
     
     return created_count
 
 
+def load_snapshot(path):
+    """Load database pages saved as JSON: a list of pages or a query response"""
+    with open(path) as f:
+        snapshot = json.load(f)
+    return snapshot.get("results", []) if isinstance(snapshot, dict) else snapshot
+
+def load_snapshots(spec, tenants):
+    """Load the saved pages a dry run plans against, by database ID
+
+    `spec` is either the path of one tenant's saved pages, or a mapping of
+    database IDs to such paths. Tenants without a snapshot are planned from the
+    pages cached by the last run, or from a read-only query.
+    """
+    if not spec:
+        return {}
+    if isinstance(spec, dict):
+        known = {tenant.database_id for tenant in tenants}
+        unknown = sorted(set(spec) - known)
+        if unknown:
+            raise ValueError(f"Snapshots given for unknown databases: {', '.join(unknown)}")
+        return {database_id: load_snapshot(path) for database_id, path in spec.items()}
+    if len(tenants) > 1:
+        # One tenant's pages would skew every other tenant's dedupe and archive plan
+        raise ValueError("A snapshot path can only be used with a single tenant; "
+                         "map each database_id to its own snapshot instead")
+    return {tenants[0].database_id: load_snapshot(spec)}
+
+def plan_events_for_day(date, tenant=None, snapshot=None):
+    """Work out what create_events_for_day would do, without writing anything
+
+    The database content is taken from `snapshot` (a list of pages) if given, then
+    from the pages cached by the last run in this process, and only then from a
+    read-only query.
+
+    Returns the list of planned requests and an estimate of the request count, the
+    wall time under the current rate limit and the payload bytes sent. Requests that
+    are only sent if something fails (the key queries of idempotent creates) are
+    planned as conditional, and counted only in the `max_` figures.
+    """
+    tenant = tenant or DEFAULT_TENANT
+    today = datetime.now(tenant.timezone).strftime("%Y-%m-%d")
+    if snapshot is None:
+        snapshot = TASKS_CACHE.get(tenant.database_id)
+    tasks = snapshot if snapshot is not None else fetch_tasks(tenant)
+
+    operations = []
+
+    def plan(kind, method, path, body=None, conditional=False):
+        payload = json.dumps(body).encode() if body is not None else b""
+        operation = {"kind": kind, "method": method, "path": path, "bytes": len(payload)}
+        if conditional:
+            operation["conditional"] = True
+        operations.append(operation)
+
+    if SCHEMAS.cached(tenant.database_id) is None:
+        plan("schema", "GET", f"databases/{tenant.database_id}")
+
+    query_body = {"page_size": QUERY_PAGE_SIZE}
+    for _ in range(max(1, math.ceil(len(tasks) / QUERY_PAGE_SIZE))):
+        plan("query", "POST", f"databases/{tenant.database_id}/query", query_body)
+
+    for task in tasks:
+        if is_stale_task(task, today):
+            plan("archive", "PATCH", f"pages/{task['id']}", {"archived": True})
+
+    for event in reversed(SCHEDULES[tenant.schedule](date)):
+        properties = build_event_properties(
+            event["title"], event["time"], event["details"], today,
+            get_category_from_time(event["time"]), get_random_color()
+        )
+        if IDEMPOTENCY_PROPERTY:
+            key = idempotency_key(today, event["title"], event["time"])
+            properties[IDEMPOTENCY_PROPERTY] = {
+                "rich_text": [{"type": "text", "text": {"content": key}}]
+            }
+        plan("create", "POST", "pages", {
+            "parent": {"database_id": tenant.database_id},
+            "properties": properties,
+        })
+        if IDEMPOTENCY_PROPERTY:
+            # Sent, after a backoff, if the create fails without telling whether
+            # the page was created
+            plan("idempotency", "POST", f"databases/{tenant.database_id}/query", {
+                "filter": {"property": IDEMPOTENCY_PROPERTY, "rich_text": {"equals": key}},
+                "page_size": 1,
+            }, conditional=True)
+        children = build_checklist_blocks(event.get("checkbox_items", []))
+        if children:
+            plan("append", "PATCH", "blocks/{page_id}/children", {"children": children})
+
+    by_kind = {}
+    for operation in operations:
+        by_kind[operation["kind"]] = by_kind.get(operation["kind"], 0) + 1
+    # Requests are sent one after the other, except archives which go out
+    # ARCHIVE_WORKERS at a time, so a run takes at least one round trip per
+    # request or group of archives, and at least as long as the rate limiter lets
+    # them through. Each conditional request also waits out a backoff first.
+    conditional = sum(1 for operation in operations if operation.get("conditional"))
+    requests = len(operations) - conditional
+    archives = by_kind.get("archive", 0)
+    round_trips = requests - archives + math.ceil(archives / ARCHIVE_WORKERS)
+    wall_time = max(round_trips * ESTIMATED_REQUEST_LATENCY, requests / NOTION_RATE_LIMIT)
+    max_wall_time = max(
+        (round_trips + conditional) * ESTIMATED_REQUEST_LATENCY
+        + conditional * IDEMPOTENT_CREATE_BACKOFF,
+        len(operations) / NOTION_RATE_LIMIT,
+    )
+    return {
+        "tenant": tenant.name,
+        "date": today,
+        "operations": operations,
+        "estimate": {
+            "requests": requests,
+            "max_requests": len(operations),
+            "by_kind": by_kind,
+            "payload_bytes": sum(
+                operation["bytes"] for operation in operations
+                if not operation.get("conditional")
+            ),
+            "wall_time_seconds": round(wall_time, 2),
+            "max_wall_time_seconds": round(max_wall_time, 2),
+        },
+    }
+
 def get_random_color():
     """Return a random color from Notion's available colors"""
     notion_colors = [
@@ -360,9 +709,129 @@ def get_random_color():
     weighted_colors = notion_colors + ["blue", "green", "purple", "pink", "orange"]
     return random.choice(weighted_colors)
 
+def load_tenants(event=None):
+    """Build the tenant roster for this invocation
+
+    The roster comes from the Lambda event ({"tenants": [{"name", "token",
+    "database_id", "timezone", "schedule"}, ...]}) or from the .env-style file named
+    by NOTION_TENANTS_FILE, where each tenant is a group of prefixed keys:
+
+        ALICE__NOTION_API_KEY=...
+        ALICE__NOTION_DATABASE_ID=...
+        ALICE__TIMEZONE=Europe/Berlin   (optional)
+        ALICE__SCHEDULE=default         (optional)
+
+    Returns an empty list when no roster is configured.
+    """
+    if event and event.get("tenants"):
+        entries = event["tenants"]
+    elif CONFIG.tenants_file:
+        grouped = {}
+        for key, value in dotenv_values(CONFIG.tenants_file, compiled=True).items():
+            name, sep, setting = key.partition("__")
+            if sep:
+                grouped.setdefault(name, {})[setting] = value
+        entries = [
+            {
+                "name": name.lower(),
+                "token": settings.get("NOTION_API_KEY"),
+                "database_id": settings.get("NOTION_DATABASE_ID"),
+                "timezone": settings.get("TIMEZONE"),
+                "schedule": settings.get("SCHEDULE"),
+            }
+            for name, settings in grouped.items()
+        ]
+    else:
+        return []
+
+    tenants = []
+    for entry in entries:
+        if not entry.get("token") or not entry.get("database_id"):
+            raise ValueError(f"Tenant {entry.get('name')!r} needs both a token and a database_id")
+        schedule = entry.get("schedule") or "default"
+        if schedule not in SCHEDULES:
+            raise ValueError(f"Tenant {entry.get('name')!r} uses unknown schedule {schedule!r}")
+        timezone = TIMEZONE
+        if entry.get("timezone"):
+            try:
+                timezone = pytz.timezone(entry["timezone"])
+            except pytz.UnknownTimeZoneError:
+                # Lambda builds only carry the zones they were built for (see build_lambda.py)
+                raise ValueError(
+                    f"Tenant {entry.get('name')!r} uses timezone {entry['timezone']!r}, "
+                    "which is unknown or not packaged in this build"
+                )
+        tenants.append(Tenant(
+            name=entry.get("name") or entry["database_id"],
+            token=entry["token"],
+            database_id=entry["database_id"],
+            timezone=timezone,
+            schedule=schedule,
+        ))
+    return tenants
+
+def process_tenant(tenant):
+    """Run the daily refresh for one tenant and report how it went"""
+    today = datetime.now(tenant.timezone)
+    print(f"[{tenant.name}] Starting process for {get_current_day(tenant)} ({today.strftime('%Y-%m-%d')})")
+    try:
+        created_count = create_events_for_day(today, tenant)
+    except Exception as e:
+        print(f"[{tenant.name}] Error: {str(e)}")
+        return {"tenant": tenant.name, "ok": False, "error": str(e)}
+    print(f"[{tenant.name}] Created {created_count} events")
+    return {"tenant": tenant.name, "ok": True, "created": created_count}
+
+def run_tenants(tenants):
+    """Process every tenant concurrently over the shared Notion client
+
+    Each tenant's requests go through its own token's rate limiter, so a busy
+    tenant never slows down the others.
+    """
+    workers = max(1, min(TENANT_WORKERS, len(tenants)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(process_tenant, tenants))
+
 def lambda_handler(event, context):
-    """AWS Lambda handler function"""
+    """AWS Lambda handler function
+
+    Send {"dry_run": true} to get the plan and request-cost estimate of the run
+    instead of running it, optionally with "snapshot": "<path to saved pages>" for
+    a single tenant, or {"<database_id>": "<path>", ...} for several.
+    """
     try:
+        # A malformed roster is reported like any other error of the run
+        tenants = load_tenants(event)
+        if event and event.get("dry_run"):
+            planned = tenants or [DEFAULT_TENANT]
+            snapshots = load_snapshots(event.get("snapshot"), planned)
+            plans = [
+                plan_events_for_day(datetime.now(tenant.timezone), tenant,
+                                    snapshots.get(tenant.database_id))
+                for tenant in planned
+            ]
+            requests = sum(plan["estimate"]["requests"] for plan in plans)
+            max_requests = sum(plan["estimate"]["max_requests"] for plan in plans)
+            return {
+                'statusCode': 200,
+                'body': f"Dry run: {requests} requests planned for {len(plans)} tenant(s)"
+                        + (f", up to {max_requests} on failures" if max_requests > requests else ""),
+                'plans': plans
+            }
+
+        if tenants:
+            results = run_tenants(tenants)
+            failed = [result["tenant"] for result in results if not result["ok"]]
+            created = sum(result.get("created", 0) for result in results)
+            return {
+                'statusCode': 500 if failed else 200,
+                'body': f"Processed {len(results)} tenants, created {created} events"
+                        + (f", failed: {', '.join(failed)}" if failed else ""),
+                'tenants': results
+            }
+
+        CONFIG.require()
+
         # Get today's date
         today = datetime.now(TIMEZONE)
         
@@ -1762,6 +2231,13 @@ def get_sunday_events(date):
 
     return events
 
+# Weekly schedules a tenant can pick from, by name
+SCHEDULES = {
+    "default": get_events_for_day,
+}
+
+compile_schedules()
+
 if __name__ == "__main__":
     # Get today's date
     today = datetime.now(TIMEZONE)  # Fixed this line
@@ -1770,8 +2246,7 @@ if __name__ == "__main__":
     created_count = create_events_for_day(today)
     
     # Print database properties (for debugging)
-    database = notion.databases.retrieve(DATABASE_ID)
-    property_names = list(database["properties"].keys())
+    property_names = list(SCHEMAS.get(notion, DATABASE_ID).properties)
     print(f"Available calendar properties: {property_names}")
     
     # Print the events for the current day (for debugging)
@@ -0,0 +1,84 @@
+"""Batches of requests for the synchronous client.
+
+`Client.batch` runs endpoint calls on a thread pool. The threads share the client's
+connection pool, rate limiters and concurrency limiter, so a batch is as polite to
+the API as the same calls made one after the other, only faster.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from notion_client.errors import HTTPResponseError
+from notion_client.ratelimit import parse_retry_after
+
+# Delay before the first retry of a `rate_limited` call without `Retry-After`,
+# doubled on every further retry
+BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one call of a batch.
+
+    Attributes:
+        value: What the call returned, if it succeeded.
+        error: The exception the call raised, if it failed.
+        attempts: Number of times the call was made.
+    """
+
+    value: Any = None
+    error: Optional[Exception] = None
+    attempts: int = 1
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def result(self) -> Any:
+        """Return the value of the call, or raise its exception."""
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class Batch:
+    """Run the calls of one batch, retrying the ones that were rate limited.
+
+    When a call comes back `rate_limited`, every call of the batch waits for the
+    `Retry-After` delay before being sent (the client's rate limiter, if any, also
+    holds back requests sent with the same token outside the batch).
+    """
+
+    def __init__(self, max_retries: int = 3) -> None:
+        self.max_retries = max_retries
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+
+    def _wait(self) -> None:
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _pause(self, delay: float) -> None:
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + delay)
+
+    def run(self, call: Callable[[], Any]) -> BatchResult:
+        """Make the call, retrying it while it is rate limited."""
+        attempts = 0
+        while True:
+            self._wait()
+            attempts += 1
+            try:
+                return BatchResult(value=call(), attempts=attempts)
+            except HTTPResponseError as error:
+                if error.status != 429 or attempts > self.max_retries:
+                    return BatchResult(error=error, attempts=attempts)
+                delay = parse_retry_after(error.headers.get("retry-after"))
+                if delay is None:
+                    delay = min(MAX_BACKOFF, BACKOFF * 2 ** (attempts - 1))
+                self._pause(delay)
+            except Exception as error:
+                return BatchResult(error=error, attempts=attempts)
@@ -1,10 +1,14 @@
 """Synchronous and asynchronous clients for Notion's API."""
+import asyncio
 import json
 import logging
+import threading
+import time
 from abc import abstractclassmethod
+from concurrent.futures import ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from types import TracebackType
-from typing import Any, Dict, List, Optional, Type, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Type, Union
 
 import httpx
 from httpx import Request, Response
@@ -17,14 +21,36 @@ from notion_client.api_endpoints import (
     SearchEndpoint,
     UsersEndpoint,
 )
+from notion_client.batch import Batch, BatchResult
+from notion_client.circuit import (
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    endpoint_family,
+    is_failure,
+)
+from notion_client.concurrency import AdaptiveConcurrencyLimiter
 from notion_client.errors import (
     APIResponseError,
+    CircuitOpenError,
     HTTPResponseError,
     RequestTimeoutError,
     is_api_error_code,
 )
+from notion_client.hedging import (
+    HedgingPolicy,
+    async_first_response,
+    endpoint_key,
+    first_response,
+)
 from notion_client.logging import make_console_logger
-from notion_client.typing import SyncAsync
+from notion_client.ratelimit import (
+    RateLimiter,
+    RateLimiterRegistry,
+    parse_retry_after,
+)
+from notion_client.responses import LazyResponse
+from notion_client.streaming import AsyncStreamedList, StreamedList
+from notion_client.typing import SyncAsync, TimeoutMs
 
 
 @dataclass
@@ -36,26 +62,65 @@ class ClientOptions:
             should be set on each request.
         timeout_ms: Number of milliseconds to wait before emitting a
             `RequestTimeoutError`.
+        connect_timeout_ms: Number of milliseconds to wait for a connection to be
+            established. Defaults to `timeout_ms`.
+        read_timeout_ms: Number of milliseconds to wait for each chunk of a
+            response. Defaults to `timeout_ms`.
+        write_timeout_ms: Number of milliseconds to wait for each chunk of a
+            request to be sent. Defaults to `timeout_ms`.
+        pool_timeout_ms: Number of milliseconds to wait for a connection from the
+            pool. Defaults to `timeout_ms`.
         base_url: The root URL for sending API requests. This can be changed to test with
             a mock server.
         log_level: Verbosity of logs the instance will produce. By default, logs are
             written to `stdout`.
         logger: A custom logger.
         notion_version: Notion version to use.
+        rate_limit: Maximum average number of requests per second sent with a single
+            bearer token. Requests over the limit wait client-side before being sent.
+            By default, no limit is applied.
+        rate_limit_burst: Number of requests per bearer token that may be sent
+            back-to-back before `rate_limit` kicks in. Defaults to `rate_limit`.
+        concurrency_limiter: Adaptive limit on the number of requests in flight at
+            once, shared by every request of the client. By default, the number of
+            concurrent requests is not limited.
+        circuit_breakers: Breakers making requests fail fast with a
+            `CircuitOpenError` while an endpoint family keeps failing. Create the
+            registry once per process to keep breaker state across warm invocations.
+        hedging: Policy for sending a second copy of slow idempotent reads (`GET`
+            requests, database queries and searches) and using whichever copy
+            answers first. By default, requests are never hedged.
+        max_connections: Maximum number of connections of the connection pool
+            created by the client. `None` means no limit.
+        max_keepalive_connections: Maximum number of idle connections kept open
+            in that pool. `None` means no limit.
+        keepalive_expiry: Number of seconds an idle connection is kept open.
     """
 
     auth: Optional[str] = None
     timeout_ms: int = 60_000
+    connect_timeout_ms: Optional[int] = None
+    read_timeout_ms: Optional[int] = None
+    write_timeout_ms: Optional[int] = None
+    pool_timeout_ms: Optional[int] = None
     base_url: str = "https://api.notion.com"
     log_level: int = logging.WARNING
     logger: Optional[logging.Logger] = None
     notion_version: str = "2022-06-28"
+    rate_limit: Optional[float] = None
+    rate_limit_burst: Optional[int] = None
+    concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None
+    circuit_breakers: Optional[CircuitBreakerRegistry] = None
+    hedging: Optional[HedgingPolicy] = None
+    max_connections: Optional[int] = 100
+    max_keepalive_connections: Optional[int] = 20
+    keepalive_expiry: Optional[float] = 5.0
 
 
 class BaseClient:
     def __init__(
         self,
-        client: Union[httpx.Client, httpx.AsyncClient],
+        client: Optional[Union[httpx.Client, httpx.AsyncClient]],
         options: Optional[Union[Dict[str, Any], ClientOptions]] = None,
         **kwargs: Any,
     ) -> None:
@@ -68,6 +133,17 @@ class BaseClient:
         self.logger.setLevel(options.log_level)
         self.options = options
 
+        self._rate_limiters: Optional[RateLimiterRegistry] = None
+        if options.rate_limit:
+            self._rate_limiters = RateLimiterRegistry(
+                options.rate_limit, options.rate_limit_burst
+            )
+
+        # A client given by the caller is reused by `with` blocks and left open;
+        # otherwise each block gets a new client made from the options.
+        self._reuse_client = client is not None
+        if client is None:
+            client = self._make_client()
         self._clients: List[Union[httpx.Client, httpx.AsyncClient]] = []
         self.client = client
 
@@ -85,7 +161,18 @@ class BaseClient:
     @client.setter
     def client(self, client: Union[httpx.Client, httpx.AsyncClient]) -> None:
         client.base_url = httpx.URL(f"{self.options.base_url}/v1/")
-        client.timeout = httpx.Timeout(timeout=self.options.timeout_ms / 1_000)
+        options = self.options
+        phases = {
+            phase: timeout_ms / 1_000
+            for phase, timeout_ms in (
+                ("connect", options.connect_timeout_ms),
+                ("read", options.read_timeout_ms),
+                ("write", options.write_timeout_ms),
+                ("pool", options.pool_timeout_ms),
+            )
+            if timeout_ms is not None
+        }
+        client.timeout = httpx.Timeout(options.timeout_ms / 1_000, **phases)
         client.headers = httpx.Headers(
             {
                 "Notion-Version": self.options.notion_version,
@@ -96,6 +183,18 @@ class BaseClient:
             client.headers["Authorization"] = f"Bearer {self.options.auth}"
         self._clients.append(client)
 
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.options.max_connections,
+            max_keepalive_connections=self.options.max_keepalive_connections,
+            keepalive_expiry=self.options.keepalive_expiry,
+        )
+
+    @abstractclassmethod
+    def _make_client(self) -> Union[httpx.Client, httpx.AsyncClient]:
+        # noqa
+        pass
+
     def _build_request(
         self,
         method: str,
@@ -103,17 +202,98 @@ class BaseClient:
         query: Optional[Dict[Any, Any]] = None,
         body: Optional[Dict[Any, Any]] = None,
         auth: Optional[str] = None,
+        timeout_ms: Optional[TimeoutMs] = None,
     ) -> Request:
-        headers = httpx.Headers()
-        if auth:
-            headers["Authorization"] = f"Bearer {auth}"
-        self.logger.info(f"{method} {self.client.base_url}{path}")
-        self.logger.debug(f"=> {query} -- {body}")
-        return self.client.build_request(
-            method, path, params=query, json=body, headers=headers
+        headers = {"Authorization": f"Bearer {auth}"} if auth else None
+        self.logger.info("%s %s%s", method, self.client.base_url, path)
+        self.logger.debug("=> %s -- %s", query, body)
+        # The base URL and headers of our clients are fixed: they are merged
+        # once into the client's request template.
+        template = self.client.request_template()
+        if timeout_ms is None:
+            return template.build_request(
+                method, path, params=query, json=body, headers=headers
+            )
+        return template.build_request(
+            method,
+            path,
+            params=query,
+            json=body,
+            headers=headers,
+            timeout=self._timeout(timeout_ms),
         )
 
-    def _parse_response(self, response: Response) -> Any:
+    def _timeout(self, timeout_ms: TimeoutMs) -> httpx.Timeout:
+        """Turn a per-call `timeout_ms` into the timeout of its request."""
+        if not isinstance(timeout_ms, dict):
+            return httpx.Timeout(timeout_ms / 1_000)
+        phases = self.client.timeout.as_dict()
+        for phase, phase_ms in timeout_ms.items():
+            if phase not in phases:
+                raise ValueError(
+                    f"Unknown timeout phase {phase!r}, "
+                    "expected 'connect', 'read', 'write' or 'pool'"
+                )
+            phases[phase] = phase_ms / 1_000 if phase_ms is not None else None
+        return httpx.Timeout(**phases)
+
+    def _rate_limiter(self, auth: Optional[str]) -> Optional[RateLimiter]:
+        if self._rate_limiters is None:
+            return None
+        return self._rate_limiters.get(auth or self.options.auth)
+
+    def _may_hedge(self, policy: HedgingPolicy, auth: Optional[str]) -> bool:
+        if not policy.try_spend():
+            return False
+        limiter = self._rate_limiter(auth)
+        if limiter is not None and not limiter.try_acquire():
+            policy.refund()
+            return False
+        return True
+
+    def _check_circuit(self, path: str) -> Optional[CircuitBreaker]:
+        registry = self.options.circuit_breakers
+        if registry is None:
+            return None
+        breaker = registry.get(path)
+        if not breaker.allow():
+            raise CircuitOpenError(endpoint_family(path), breaker.retry_after())
+        return breaker
+
+    def _record_circuit(
+        self,
+        breaker: Optional[CircuitBreaker],
+        response: Optional[Response],
+        cancelled: bool = False,
+    ) -> None:
+        if breaker is None:
+            return
+        if cancelled:
+            # Cancelled by the caller: that says nothing about Notion's health
+            breaker.release_probe()
+        elif is_failure(response.status_code if response else None):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+    def _record_rate_limit(
+        self, limiter: Optional[RateLimiter], response: Optional[Response]
+    ) -> None:
+        if limiter is None or response is None or response.status_code != 429:
+            return
+        # Hold back the token's other requests for as long as Notion asks
+        delay = parse_retry_after(response.headers.get("retry-after"))
+        limiter.pause(delay if delay is not None else 1 / limiter.rate)
+
+    def _release_concurrency(self, ticket: int, response: Optional[Response]) -> None:
+        limiter = self.options.concurrency_limiter
+        if limiter is None:
+            return
+        limit = limiter.release(ticket, response.status_code if response else None)
+        if limit is not None:
+            self.logger.debug("Concurrency limit is now %s", limit)
+
+    def _parse_response(self, response: Response, status_only: bool = False) -> Any:
         try:
             response.raise_for_status()
         except httpx.HTTPStatusError as error:
@@ -126,8 +306,11 @@ class BaseClient:
                 raise APIResponseError(response, body["message"], code)
             raise HTTPResponseError(error.response)
 
+        if status_only:
+            return LazyResponse(response)
+
         body = response.json()
-        self.logger.debug(f"=> {body}")
+        self.logger.debug("=> %s", body)
 
         return body
 
@@ -139,13 +322,21 @@ class BaseClient:
         query: Optional[Dict[Any, Any]] = None,
         body: Optional[Dict[Any, Any]] = None,
         auth: Optional[str] = None,
+        stream: bool = False,
+        timeout_ms: Optional[TimeoutMs] = None,
+        status_only: bool = False,
     ) -> SyncAsync[Any]:
         # noqa
         pass
 
 
 class Client(BaseClient):
-    """Synchronous client for Notion's API."""
+    """Synchronous client for Notion's API.
+
+    Used as a context manager, the client sends the requests of the block through
+    the `httpx.Client` it was given, or else through a new one sized by the pool
+    options, which is closed at the end of the block.
+    """
 
     client: httpx.Client
 
@@ -155,13 +346,22 @@ class Client(BaseClient):
         client: Optional[httpx.Client] = None,
         **kwargs: Any,
     ) -> None:
-        if client is None:
-            client = httpx.Client()
         super().__init__(client, options, **kwargs)
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self._hedge_lock = threading.Lock()
+        # Hedged sends using the executor, and whether close() is waiting on them
+        self._hedged_sends = 0
+        self._hedge_close_pending = False
+
+    def _make_client(self) -> httpx.Client:
+        return httpx.Client(limits=self._limits())
 
     def __enter__(self) -> "Client":
-        self.client = httpx.Client()
-        self.client.__enter__()
+        if self._reuse_client:
+            self.client = self._clients[-1]
+        else:
+            self.client = self._make_client()
+            self.client.__enter__()
         return self
 
     def __exit__(
@@ -170,12 +370,125 @@ class Client(BaseClient):
         exc_value: BaseException,
         traceback: TracebackType,
     ) -> None:
-        self.client.__exit__(exc_type, exc_value, traceback)
+        if not self._reuse_client:
+            self.client.__exit__(exc_type, exc_value, traceback)
         del self._clients[-1]
 
     def close(self) -> None:
-        """Close the connection pool of the current inner client."""
+        """Close the connection pool of the current inner client.
+
+        The threads running hedged attempts are stopped once the hedged requests
+        in flight have their response.
+        """
         self.client.close()
+        with self._hedge_lock:
+            self._hedge_close_pending = True
+            executor = self._detach_hedging()
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _acquire_hedging(self, policy: HedgingPolicy) -> ThreadPoolExecutor:
+        """Return the threads running hedged attempts, started on first use.
+
+        Every call must be paired with a call to `_release_hedging`.
+        """
+        with self._hedge_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(
+                    max_workers=policy.max_workers,
+                    thread_name_prefix="notion-hedge",
+                )
+            self._hedged_sends += 1
+            return self._hedge_executor
+
+    def _release_hedging(self) -> None:
+        with self._hedge_lock:
+            self._hedged_sends -= 1
+            executor = self._detach_hedging()
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _detach_hedging(self) -> Optional[ThreadPoolExecutor]:
+        # Called under _hedge_lock. Losing attempts still running finish on
+        # their own; the threads are started again if the client is used later.
+        if not self._hedge_close_pending or self._hedged_sends:
+            return None
+        self._hedge_close_pending = False
+        executor, self._hedge_executor = self._hedge_executor, None
+        return executor
+
+    def batch(
+        self,
+        calls: Iterable[Callable[[], Any]],
+        max_workers: int = 8,
+        max_retries: int = 3,
+    ) -> List[BatchResult]:
+        """Run endpoint calls on a thread pool and return their outcomes in order.
+
+        Each call is a function without arguments, such as
+        `functools.partial(client.pages.update, page_id, archived=True)`. The calls
+        share this client's connection pool, rate limiters and concurrency limiter.
+        A call answered with `rate_limited` is retried up to `max_retries` times,
+        and the whole batch waits for the `Retry-After` delay before sending more.
+        Exceptions are returned in the `BatchResult` of their call, not raised.
+        """
+        calls = list(calls)
+        if not calls:
+            return []
+        batch = Batch(max_retries)
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(calls)),
+            thread_name_prefix="notion-batch",
+        ) as executor:
+            return list(executor.map(batch.run, calls))
+
+    def _send(
+        self, request: Request, path: str, auth: Optional[str], stream: bool = False
+    ) -> Response:
+        policy = self.options.hedging
+        if stream:
+            # Only one copy of a streamed response can be read
+            return self.client.send(request, stream=True)
+        if policy is None or not policy.is_hedgeable(request.method, path):
+            return self.client.send(request)
+        key = endpoint_key(request.method, path)
+        delay = policy.delay(key)
+        start = time.monotonic()
+        if delay is None:
+            response = self.client.send(request)
+        else:
+            executor = self._acquire_hedging(policy)
+            try:
+                response = self._send_hedged(
+                    executor, request, policy, key, delay, auth
+                )
+            finally:
+                self._release_hedging()
+        policy.record(key, time.monotonic() - start)
+        return response
+
+    def _send_hedged(
+        self,
+        executor: ThreadPoolExecutor,
+        request: Request,
+        policy: HedgingPolicy,
+        key: str,
+        delay: float,
+        auth: Optional[str],
+    ) -> Response:
+        try:
+            attempts = [executor.submit(self.client.send, request)]
+        except RuntimeError:
+            # The executor is shut down (the interpreter is exiting): don't hedge
+            return self.client.send(request)
+        done, _ = wait(attempts, timeout=delay)
+        if not done and self._may_hedge(policy, auth):
+            self.logger.debug("Hedging %s after %.3fs", key, delay)
+            try:
+                attempts.append(executor.submit(self.client.send, request))
+            except RuntimeError:
+                policy.refund()
+        return first_response(attempts)
 
     def request(
         self,
@@ -184,18 +497,62 @@ class Client(BaseClient):
         query: Optional[Dict[Any, Any]] = None,
         body: Optional[Dict[Any, Any]] = None,
         auth: Optional[str] = None,
+        stream: bool = False,
+        timeout_ms: Optional[TimeoutMs] = None,
+        status_only: bool = False,
     ) -> Any:
-        """Send an HTTP request."""
-        request = self._build_request(method, path, query, body, auth)
+        """Send an HTTP request.
+
+        With `stream=True`, a list response is returned as a `StreamedList`,
+        whose results are decoded as the body arrives. `timeout_ms` overrides the
+        timeouts of the client for this request: a number of milliseconds for
+        every phase, or a dict of milliseconds by phase (`"connect"`, `"read"`,
+        `"write"` or `"pool"`).
+
+        With `status_only=True`, errors are raised as usual but a successful
+        response is returned as a `LazyResponse`, whose body is only decoded if
+        it is read: for writes whose caller only checks that they succeeded.
+        """
+        request = self._build_request(method, path, query, body, auth, timeout_ms)
+        breaker = self._check_circuit(path)
+        limiter = self._rate_limiter(auth)
+        concurrency = self.options.concurrency_limiter
+        ticket = None
+        response = None
+        cancelled = False
         try:
-            response = self.client.send(request)
+            if limiter is not None:
+                limiter.acquire()
+            if concurrency is not None:
+                ticket = concurrency.acquire()
+            response = self._send(request, path, auth, stream)
         except httpx.TimeoutException:
             raise RequestTimeoutError()
-        return self._parse_response(response)
+        except BaseException as error:
+            cancelled = not isinstance(error, Exception)
+            raise
+        finally:
+            if ticket is not None:
+                self._release_concurrency(ticket, response)
+            self._record_circuit(breaker, response, cancelled)
+            self._record_rate_limit(limiter, response)
+        if stream:
+            if response.is_success:
+                return StreamedList(response)
+            try:
+                response.read()
+            finally:
+                response.close()
+        return self._parse_response(response, status_only)
 
 
 class AsyncClient(BaseClient):
-    """Asynchronous client for Notion's API."""
+    """Asynchronous client for Notion's API.
+
+    Used as an async context manager, the client sends the requests of the block
+    through the `httpx.AsyncClient` it was given, or else through a new one sized
+    by the pool options, which is closed at the end of the block.
+    """
 
     client: httpx.AsyncClient
 
@@ -205,13 +562,17 @@ class AsyncClient(BaseClient):
         client: Optional[httpx.AsyncClient] = None,
         **kwargs: Any,
     ) -> None:
-        if client is None:
-            client = httpx.AsyncClient()
         super().__init__(client, options, **kwargs)
 
+    def _make_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(limits=self._limits())
+
     async def __aenter__(self) -> "AsyncClient":
-        self.client = httpx.AsyncClient()
-        await self.client.__aenter__()
+        if self._reuse_client:
+            self.client = self._clients[-1]
+        else:
+            self.client = self._make_client()
+            await self.client.__aenter__()
         return self
 
     async def __aexit__(
@@ -220,13 +581,38 @@ class AsyncClient(BaseClient):
         exc_value: BaseException,
         traceback: TracebackType,
     ) -> None:
-        await self.client.__aexit__(exc_type, exc_value, traceback)
+        if not self._reuse_client:
+            await self.client.__aexit__(exc_type, exc_value, traceback)
         del self._clients[-1]
 
     async def aclose(self) -> None:
         """Close the connection pool of the current inner client."""
         await self.client.aclose()
 
+    async def _send(
+        self, request: Request, path: str, auth: Optional[str], stream: bool = False
+    ) -> Response:
+        policy = self.options.hedging
+        if stream:
+            # Only one copy of a streamed response can be read
+            return await self.client.send(request, stream=True)
+        if policy is None or not policy.is_hedgeable(request.method, path):
+            return await self.client.send(request)
+        key = endpoint_key(request.method, path)
+        delay = policy.delay(key)
+        start = time.monotonic()
+        if delay is None:
+            response = await self.client.send(request)
+        else:
+            attempts = [asyncio.ensure_future(self.client.send(request))]
+            done, _ = await asyncio.wait(attempts, timeout=delay)
+            if not done and self._may_hedge(policy, auth):
+                self.logger.debug("Hedging %s after %.3fs", key, delay)
+                attempts.append(asyncio.ensure_future(self.client.send(request)))
+            response = await async_first_response(attempts)
+        policy.record(key, time.monotonic() - start)
+        return response
+
     async def request(
         self,
         path: str,
@@ -234,11 +620,47 @@ class AsyncClient(BaseClient):
         query: Optional[Dict[Any, Any]] = None,
         body: Optional[Dict[Any, Any]] = None,
         auth: Optional[str] = None,
+        stream: bool = False,
+        timeout_ms: Optional[TimeoutMs] = None,
+        status_only: bool = False,
     ) -> Any:
-        """Send an HTTP request asynchronously."""
-        request = self._build_request(method, path, query, body, auth)
+        """Send an HTTP request asynchronously.
+
+        With `stream=True`, a list response is returned as an
+        `AsyncStreamedList`, whose results are decoded as the body arrives.
+        `timeout_ms` and `status_only` work as for `Client.request`.
+        """
+        request = self._build_request(method, path, query, body, auth, timeout_ms)
+        breaker = self._check_circuit(path)
+        limiter = self._rate_limiter(auth)
+        concurrency = self.options.concurrency_limiter
+        ticket = None
+        response = None
+        cancelled = False
         try:
-            response = await self.client.send(request)
+            # Waiting for a slot is cancellable: a probe admitted by the breaker
+            # must then be handed back, which the finally clause does
+            if limiter is not None:
+                await limiter.async_acquire()
+            if concurrency is not None:
+                ticket = await concurrency.async_acquire()
+            response = await self._send(request, path, auth, stream)
         except httpx.TimeoutException:
             raise RequestTimeoutError()
-        return self._parse_response(response)
+        except BaseException as error:
+            # CancelledError is not an Exception: the caller gave up, not Notion
+            cancelled = not isinstance(error, Exception)
+            raise
+        finally:
+            if ticket is not None:
+                self._release_concurrency(ticket, response)
+            self._record_circuit(breaker, response, cancelled)
+            self._record_rate_limit(limiter, response)
+        if stream:
+            if response.is_success:
+                return AsyncStreamedList(response)
+            try:
+                await response.aread()
+            finally:
+                await response.aclose()
+        return self._parse_response(response, status_only)
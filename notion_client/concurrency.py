@@ -0,0 +1,139 @@
+"""Adaptive concurrency control for notion-sdk-py.
+
+The number of requests allowed in flight at once follows the additive-increase /
+multiplicative-decrease scheme of TCP congestion control: every successful response
+widens the window a little, every `rate_limited` or `service_unavailable` response
+halves it.
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, List, Optional, Tuple
+
+CONGESTION_STATUS_CODES = (429, 503)
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limit on the number of in-flight requests.
+
+    The same instance can be shared by threads using a `Client` and by tasks using
+    an `AsyncClient`. `history` holds `(timestamp, limit)` pairs, one per change of
+    the limit, so callers can see how the window evolved over a run.
+
+    Attributes:
+        minimum: The window never shrinks below this many slots.
+        maximum: The window never grows beyond this many slots.
+        increase: Slots added per window's worth of successful responses.
+        decrease: Factor applied to the window on congestion.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        minimum: int = 1,
+        maximum: int = 64,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        history_size: int = 1024,
+    ) -> None:
+        if not 1 <= minimum <= initial <= maximum:
+            raise ValueError("expected 1 <= minimum <= initial <= maximum")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self._limit = float(initial)
+        self._in_flight = 0
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, Any]] = []
+        self.history: Deque[Tuple[float, int]] = deque(maxlen=history_size)
+        self.history.append((time.time(), initial))
+
+    @property
+    def limit(self) -> int:
+        """Number of requests currently allowed in flight."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests currently in flight."""
+        return self._in_flight
+
+    def _try_acquire(self) -> Optional[int]:
+        if self._in_flight < int(self._limit):
+            self._in_flight += 1
+            return self._epoch
+        return None
+
+    def acquire(self) -> int:
+        """Block the current thread until a slot is free and take it.
+
+        Returns a ticket to hand back to `release`.
+        """
+        with self._condition:
+            ticket = self._try_acquire()
+            while ticket is None:
+                self._condition.wait()
+                ticket = self._try_acquire()
+            return ticket
+
+    async def async_acquire(self) -> int:
+        """Wait asynchronously until a slot is free and take it.
+
+        Returns a ticket to hand back to `release`.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                ticket = self._try_acquire()
+                if ticket is not None:
+                    return ticket
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                with self._lock:
+                    if (loop, waiter) in self._async_waiters:
+                        self._async_waiters.remove((loop, waiter))
+                raise
+
+    def release(self, ticket: int, status_code: Optional[int]) -> Optional[int]:
+        """Give a slot back and adapt the limit to the response it got.
+
+        `status_code` is `None` when no response arrived (e.g. a timeout), which
+        leaves the limit untouched. Returns the new limit if it changed.
+        """
+        with self._lock:
+            self._in_flight -= 1
+            previous = int(self._limit)
+            if status_code in CONGESTION_STATUS_CODES:
+                # Only the first response of a congestion episode cuts the window:
+                # requests already in flight when it was cut carry an older epoch.
+                if ticket == self._epoch:
+                    self._limit = max(self.minimum, self._limit * self.decrease)
+                    self._epoch += 1
+            elif status_code is not None and 200 <= status_code < 300:
+                self._limit = min(self.maximum, self._limit + self.increase / self._limit)
+            current = int(self._limit)
+            self._wake()
+        if current != previous:
+            self.history.append((time.time(), current))
+            return current
+        return None
+
+    def _wake(self) -> None:
+        self._condition.notify_all()
+        waiters, self._async_waiters = self._async_waiters, []
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(_set_result, waiter)
+
+
+def _set_result(waiter: Any) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
@@ -3,7 +3,7 @@
 This module defines the exceptions that can be raised when an error occurs.
 """
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
 
 import httpx
 
@@ -22,6 +22,43 @@ class RequestTimeoutError(Exception):
         super().__init__(message)
 
 
+class CircuitOpenError(Exception):
+    """Exception for requests refused because Notion looks unavailable.
+
+    After repeated server errors or timeouts on an endpoint family, requests to it
+    fail immediately instead of waiting for the API, until a probe request succeeds.
+    """
+
+    code = "notionhq_client_circuit_open"
+    family: str
+    retry_after: float
+
+    def __init__(self, family: str, retry_after: float) -> None:
+        super().__init__(
+            f"Requests to Notion API {family} endpoints are failing, "
+            f"next attempt in {retry_after:.1f}s"
+        )
+        self.family = family
+        self.retry_after = retry_after
+
+
+class SchemaValidationError(Exception):
+    """Exception for payloads that don't match the schema of their database.
+
+    Raised before sending anything, with every mismatch of the payload found at
+    once in `problems`, instead of one `validation_error` response at a time.
+    """
+
+    code = "notionhq_client_schema_validation_error"
+    problems: List[str]
+
+    def __init__(self, problems: List[str]) -> None:
+        super().__init__(
+            "Properties don't match the database schema: " + "; ".join(problems)
+        )
+        self.problems = problems
+
+
 class HTTPResponseError(Exception):
     """Exception for HTTP errors.
 
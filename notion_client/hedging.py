@@ -0,0 +1,145 @@
+"""Request hedging for notion-sdk-py.
+
+A hedged request is sent a second time when the first attempt is slower than most
+recent requests to the same endpoint; whichever attempt answers first is used.
+Only idempotent reads are hedged: `GET` requests and the `POST` endpoints that
+merely query (`databases/{id}/query`, `search`).
+"""
+import asyncio
+import re
+import threading
+from collections import deque
+from concurrent.futures import Future, as_completed
+from typing import Any, Deque, Dict, List, Optional
+
+_ID_SEGMENT = re.compile(r"^[0-9a-fA-F]{8}-?(?:[0-9a-fA-F]{4}-?){3}[0-9a-fA-F]{12}$")
+
+
+class HedgingPolicy:
+    """Decide when to send a hedge and keep hedges from amplifying load.
+
+    The hedge delay for an endpoint is the `percentile` of its recent latencies,
+    measured over the last `window` responses. Hedging starts once `min_samples`
+    latencies are known. Every hedgeable request earns `budget_ratio` of a hedge,
+    up to `max_budget`, and every hedge spends one: at most roughly `budget_ratio`
+    of the traffic is ever duplicated.
+
+    Attributes:
+        percentile: Percentile of recent latencies after which a hedge is sent.
+        min_delay: Lower bound of the hedge delay, in seconds.
+        min_samples: Number of latencies to collect before hedging an endpoint.
+        window: Number of recent latencies kept per endpoint.
+        budget_ratio: Fraction of requests that may be hedged.
+        max_budget: Maximum number of hedges that can be saved up.
+        max_workers: Threads running the attempts of a synchronous `Client`.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        min_delay: float = 0.05,
+        min_samples: int = 20,
+        window: int = 200,
+        budget_ratio: float = 0.1,
+        max_budget: float = 10.0,
+        max_workers: int = 32,
+    ) -> None:
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.window = window
+        self.budget_ratio = budget_ratio
+        self.max_budget = max_budget
+        self.max_workers = max_workers
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._budget = 0.0
+        self._lock = threading.Lock()
+
+    def is_hedgeable(self, method: str, path: str) -> bool:
+        """Return `True` if sending the request twice is harmless."""
+        if method == "GET":
+            return True
+        return method == "POST" and (path.endswith("/query") or path == "search")
+
+    def delay(self, key: str) -> Optional[float]:
+        """Return how long to wait before hedging, or `None` not to hedge yet."""
+        with self._lock:
+            self._budget = min(self.max_budget, self._budget + self.budget_ratio)
+            latencies = self._latencies.get(key)
+            if latencies is None or len(latencies) < self.min_samples:
+                return None
+            ordered = sorted(latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        return max(self.min_delay, ordered[index])
+
+    def try_spend(self) -> bool:
+        """Take one hedge out of the budget if there is one left."""
+        with self._lock:
+            if self._budget < 1:
+                return False
+            self._budget -= 1
+            return True
+
+    def refund(self) -> None:
+        """Give back a hedge taken by `try_spend` that was not sent after all."""
+        with self._lock:
+            self._budget = min(self.max_budget, self._budget + 1)
+
+    def record(self, key: str, latency: float) -> None:
+        """Remember how long a request to the endpoint `key` took, in seconds."""
+        with self._lock:
+            latencies = self._latencies.get(key)
+            if latencies is None:
+                latencies = self._latencies[key] = deque(maxlen=self.window)
+            latencies.append(latency)
+
+
+def endpoint_key(method: str, path: str) -> str:
+    """Return `path` with object ids masked, e.g. `POST databases/*/query`."""
+    segments = ["*" if _ID_SEGMENT.match(part) else part for part in path.split("/")]
+    return f"{method} {'/'.join(segments)}"
+
+
+def first_response(attempts: List["Future[Any]"]) -> Any:
+    """Return the result of the first attempt to succeed.
+
+    If every attempt fails, the error of the first one to fail is raised.
+    """
+    error: Optional[BaseException] = None
+    for attempt in as_completed(attempts):
+        if attempt.exception() is None:
+            return attempt.result()
+        error = error or attempt.exception()
+    assert error is not None
+    raise error
+
+
+async def async_first_response(attempts: List["asyncio.Future[Any]"]) -> Any:
+    """Return the result of the first attempt to succeed and cancel the others.
+
+    If every attempt fails, the error of the first one to fail is raised.
+    """
+    for attempt in attempts:
+        attempt.add_done_callback(_consume_error)
+    error: Optional[BaseException] = None
+    pending = set(attempts)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for attempt in done:
+                if attempt.exception() is None:
+                    return attempt.result()
+                error = error or attempt.exception()
+    finally:
+        for attempt in pending:
+            attempt.cancel()
+    assert error is not None
+    raise error
+
+
+def _consume_error(attempt: "asyncio.Future[Any]") -> None:
+    # Mark the error of a losing attempt as retrieved so it is not logged.
+    if not attempt.cancelled():
+        attempt.exception()
@@ -0,0 +1,41 @@
+"""Lazily decoded responses of notion-sdk-py."""
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+import httpx
+
+
+class LazyResponse(Mapping[str, Any]):
+    """Body of a successful response, decoded from JSON on first access.
+
+    Returned by requests made with `status_only=True`, whose caller usually only
+    needs to know that the request succeeded: a `LazyResponse` is always true,
+    and the body is only decoded if a member is read.
+    """
+
+    def __init__(self, response: httpx.Response) -> None:
+        self.response = response
+        self._body: Optional[Dict[str, Any]] = None
+
+    @property
+    def body(self) -> Dict[str, Any]:
+        """The decoded body."""
+        if self._body is None:
+            self._body = self.response.json()
+        return self._body
+
+    def __getitem__(self, key: str) -> Any:
+        return self.body[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.body)
+
+    def __len__(self) -> int:
+        return len(self.body)
+
+    def __bool__(self) -> bool:
+        return True
+
+    def __repr__(self) -> str:
+        if self._body is None:
+            return f"<LazyResponse [{self.response.status_code}], not decoded>"
+        return f"<LazyResponse {self._body!r}>"
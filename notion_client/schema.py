@@ -0,0 +1,320 @@
+"""Database schemas for notion-sdk-py.
+
+Page properties sent to a database have to match the types of its properties.
+A `SchemaCache` fetches the schema of a database once (with `databases.retrieve`)
+and keeps it for a while, so payloads can be checked, and coerced to the right
+shapes, before they are sent.
+"""
+import threading
+import time
+from datetime import date, datetime
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Tuple,
+)
+
+from notion_client.errors import SchemaValidationError
+
+if TYPE_CHECKING:  # pragma: no cover
+    from notion_client.client import AsyncClient, Client
+
+# Maximum length of the content of one rich text item
+MAX_TEXT_LENGTH = 2000
+
+TEXT_TYPES = ("title", "rich_text")
+
+# Property types whose values are computed by Notion
+READ_ONLY_TYPES = frozenset(
+    (
+        "button",
+        "created_by",
+        "created_time",
+        "formula",
+        "last_edited_by",
+        "last_edited_time",
+        "rollup",
+        "unique_id",
+        "verification",
+    )
+)
+
+
+def _plain_text(value: Dict[str, Any]) -> Optional[str]:
+    """Return the text of a title or rich text value, or `None`."""
+    for kind in TEXT_TYPES:
+        items = value.get(kind)
+        if isinstance(items, list):
+            return "".join(
+                item.get("text", {}).get("content", item.get("plain_text", ""))
+                for item in items
+                if isinstance(item, dict)
+            )
+    return None
+
+
+def _encode_text(value: Any, options: FrozenSet[str]) -> List[Dict[str, Any]]:
+    if isinstance(value, str):
+        # Long texts are split over several items
+        chunks = [
+            value[start : start + MAX_TEXT_LENGTH]
+            for start in range(0, len(value), MAX_TEXT_LENGTH)
+        ]
+        return [
+            {"type": "text", "text": {"content": chunk}} for chunk in chunks or [""]
+        ]
+    if not isinstance(value, list):
+        raise ValueError(f"expected text, got {type(value).__name__}")
+    for item in value:
+        if not isinstance(item, dict):
+            raise ValueError(f"expected rich text items, got {type(item).__name__}")
+        content = item.get("text", {}).get("content", "")
+        if len(content) > MAX_TEXT_LENGTH:
+            raise ValueError(
+                f"text items hold at most {MAX_TEXT_LENGTH} characters, "
+                f"got {len(content)}"
+            )
+    return value
+
+
+def _encode_option(value: Any, options: FrozenSet[str]) -> Optional[Dict[str, Any]]:
+    if value is None:
+        return None
+    name = value.get("name") if isinstance(value, dict) else value
+    if not isinstance(name, str):
+        raise ValueError(f"expected an option name, got {type(name).__name__}")
+    if "," in name:
+        raise ValueError(f"option names can't contain commas, got {name!r}")
+    return {"name": name}
+
+
+def _encode_status(value: Any, options: FrozenSet[str]) -> Optional[Dict[str, Any]]:
+    encoded = _encode_option(value, options)
+    # Unlike select options, statuses are never created on the fly
+    if encoded is not None and encoded["name"] not in options:
+        raise ValueError(
+            f"{encoded['name']!r} is not one of the statuses "
+            + ", ".join(repr(option) for option in sorted(options))
+        )
+    return encoded
+
+
+def _encode_options(value: Any, options: FrozenSet[str]) -> List[Dict[str, Any]]:
+    if isinstance(value, (str, dict)):
+        value = [value]
+    if not isinstance(value, (list, tuple)):
+        raise ValueError(f"expected option names, got {type(value).__name__}")
+    return [_encode_option(name, options) for name in value]
+
+
+def _encode_number(value: Any, options: FrozenSet[str]) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        try:
+            number = float(value)
+        except ValueError:
+            raise ValueError(f"expected a number, got {value!r}")
+        return int(number) if number.is_integer() else number
+    raise ValueError(f"expected a number, got {type(value).__name__}")
+
+
+def _encode_checkbox(value: Any, options: FrozenSet[str]) -> bool:
+    if isinstance(value, bool):
+        return value
+    raise ValueError(f"expected a boolean, got {type(value).__name__}")
+
+
+def _iso_date(value: Any) -> str:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, str):
+        try:
+            if len(value) == 10:
+                date.fromisoformat(value)
+            else:
+                datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            raise ValueError(f"expected an ISO 8601 date, got {value!r}")
+        return value
+    raise ValueError(f"expected a date, got {type(value).__name__}")
+
+
+def _encode_date(value: Any, options: FrozenSet[str]) -> Optional[Dict[str, Any]]:
+    if value is None:
+        return None
+    if isinstance(value, dict):
+        encoded = dict(value, start=_iso_date(value.get("start")))
+        if encoded.get("end") is not None:
+            encoded["end"] = _iso_date(encoded["end"])
+        return encoded
+    return {"start": _iso_date(value)}
+
+
+def _encode_string(value: Any, options: FrozenSet[str]) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    raise ValueError(f"expected a string, got {type(value).__name__}")
+
+
+# How to build the value of each property type that can be set from plain values
+_ENCODERS: Dict[str, Callable[[Any, FrozenSet[str]], Any]] = {
+    "title": _encode_text,
+    "rich_text": _encode_text,
+    "select": _encode_option,
+    "status": _encode_status,
+    "multi_select": _encode_options,
+    "number": _encode_number,
+    "checkbox": _encode_checkbox,
+    "date": _encode_date,
+    "url": _encode_string,
+    "email": _encode_string,
+    "phone_number": _encode_string,
+}
+
+
+class DatabaseSchema:
+    """Types of the properties of a database, from its `databases.retrieve` object.
+
+    Attributes:
+        properties: Property types by property name.
+    """
+
+    def __init__(self, database: Dict[str, Any]) -> None:
+        self.properties: Dict[str, str] = {}
+        self._names: Dict[str, str] = {}
+        self._options: Dict[str, FrozenSet[str]] = {}
+        for name, schema in database["properties"].items():
+            kind = schema["type"]
+            self.properties[name] = kind
+            self._names[schema.get("id", name)] = name
+            options = (schema.get(kind) or {}).get("options")
+            if options is not None:
+                self._options[name] = frozenset(option["name"] for option in options)
+
+    def _encode_value(self, name: str, kind: str, value: Any) -> Dict[str, Any]:
+        encoder = _ENCODERS.get(kind)
+        if isinstance(value, dict) and kind in value:
+            # Already shaped for this type: only check it
+            if encoder is None or value[kind] is None:
+                return value
+            value = value[kind]
+        elif isinstance(value, dict):
+            # Shaped for another type (say rich text for a select): use its text
+            text = _plain_text(value)
+            if text is None:
+                raise ValueError(f"expected a {kind} value, got {sorted(value)}")
+            value = text
+        if encoder is None:
+            raise ValueError(
+                f"{kind} values can't be built from {type(value).__name__}"
+            )
+        return {kind: encoder(value, self._options.get(name, frozenset()))}
+
+    def encode(self, properties: Dict[str, Any]) -> Dict[str, Any]:
+        """Return `properties` shaped for this database, or raise every mismatch.
+
+        Values can be given already shaped (`{"rich_text": [...]}`), shaped for
+        another type, or as plain Python values: strings, numbers, booleans,
+        dates, and lists of option names.
+        """
+        encoded = {}
+        problems = []
+        for key, value in properties.items():
+            name = key if key in self.properties else self._names.get(key)
+            if name is None:
+                problems.append(f"{key!r} is not a property of the database")
+                continue
+            kind = self.properties[name]
+            if kind in READ_ONLY_TYPES:
+                problems.append(f"{name!r} is a {kind} property, which can't be set")
+                continue
+            try:
+                encoded[key] = self._encode_value(name, kind, value)
+            except ValueError as error:
+                problems.append(f"{name!r} ({kind}): {error}")
+        if problems:
+            raise SchemaValidationError(problems)
+        return encoded
+
+
+class SchemaCache:
+    """Schemas of databases, each fetched at most once every `ttl` seconds.
+
+    The same instance can be shared by threads using a `Client` and by tasks using
+    an `AsyncClient`. Call `invalidate` after a `validation_error` response: the
+    schema of the database may have changed.
+    """
+
+    def __init__(self, ttl: float = 300.0) -> None:
+        self.ttl = ttl
+        self._schemas: Dict[str, Tuple[float, DatabaseSchema]] = {}
+        self._lock = threading.Lock()
+
+    def cached(self, database_id: str) -> Optional[DatabaseSchema]:
+        """Return the schema of a database if it is cached, without fetching it."""
+        entry = self._schemas.get(database_id)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    def _store(self, database_id: str, database: Dict[str, Any]) -> DatabaseSchema:
+        schema = DatabaseSchema(database)
+        with self._lock:
+            self._schemas[database_id] = (time.monotonic() + self.ttl, schema)
+        return schema
+
+    def get(
+        self, client: "Client", database_id: str, auth: Optional[str] = None
+    ) -> DatabaseSchema:
+        """Return the schema of a database, fetching it if needed."""
+        schema = self.cached(database_id)
+        if schema is None:
+            database = client.databases.retrieve(database_id, auth=auth)
+            schema = self._store(database_id, database)
+        return schema
+
+    async def async_get(
+        self, client: "AsyncClient", database_id: str, auth: Optional[str] = None
+    ) -> DatabaseSchema:
+        """Return the schema of a database, fetching it asynchronously if needed."""
+        schema = self.cached(database_id)
+        if schema is None:
+            database = await client.databases.retrieve(database_id, auth=auth)
+            schema = self._store(database_id, database)
+        return schema
+
+    def encode(
+        self,
+        client: "Client",
+        database_id: str,
+        properties: Dict[str, Any],
+        auth: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Return `properties` shaped for a database, as `DatabaseSchema.encode`."""
+        return self.get(client, database_id, auth).encode(properties)
+
+    async def async_encode(
+        self,
+        client: "AsyncClient",
+        database_id: str,
+        properties: Dict[str, Any],
+        auth: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Return `properties` shaped for a database (async)."""
+        return (await self.async_get(client, database_id, auth)).encode(properties)
+
+    def invalidate(self, database_id: Optional[str] = None) -> None:
+        """Forget the schema of a database, or of every database."""
+        with self._lock:
+            if database_id is None:
+                self._schemas.clear()
+            else:
+                self._schemas.pop(database_id, None)
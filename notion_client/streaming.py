@@ -0,0 +1,329 @@
+"""Incremental decoding of paginated responses.
+
+A list response (`"object": "list"`) holds up to 100 full page or block objects
+in its `results` array. Instead of buffering the whole body and decoding it into
+one dict, the results can be decoded one by one as the body arrives, so that
+only one result at a time has to be held as text.
+"""
+import codecs
+import json
+import re
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List
+
+import httpx
+
+from notion_client.errors import RequestTimeoutError
+
+_whitespace = re.compile(r"[ \t\n\r]*")
+_delimiters = (" ", "\t", "\n", "\r", ",", "]", "}")
+
+# Where ResultsScanner is in the top-level object
+_OBJECT_START = "object start"
+_KEY = "key"
+_FIRST_KEY = "first key"
+_VALUE = "value"
+_AFTER_VALUE = "after value"
+_RESULTS = "results"
+_FIRST_RESULT = "first result"
+_RESULT = "result"
+_AFTER_RESULT = "after result"
+_END = "end"
+
+_missing = object()
+
+
+class ResultsScanner:
+    """Incremental decoder of a list response.
+
+    Bytes are fed as they arrive. Each element of the top-level `results` array
+    is returned as soon as it is complete, and its text is then dropped. The
+    other members of the top-level object are collected into `fields`.
+    Malformed or truncated JSON raises `json.JSONDecodeError`, as
+    `response.json()` does.
+    """
+
+    def __init__(self) -> None:
+        self.fields: Dict[str, Any] = {}
+        self.done = False
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._text = ""
+        self._position = 0
+        self._state = _OBJECT_START
+        self._key = ""
+
+    def feed(self, data: bytes, final: bool = False) -> List[Any]:
+        """Decode the next bytes of the body, returning the completed results.
+
+        Pass `final=True` with the last bytes (or `b""`) once the body ended.
+        """
+        self._text = self._text[self._position :] + self._decoder.decode(data, final)
+        self._position = 0
+        results: List[Any] = []
+        while self._step(results, final):
+            pass
+        if final:
+            if self._state != _END:
+                raise json.JSONDecodeError(
+                    "Unterminated response", self._text, self._position
+                )
+            self.done = True
+        return results
+
+    def _next_char(self) -> str:
+        self._position = _whitespace.match(self._text, self._position).end()
+        return self._text[self._position : self._position + 1]
+
+    def _decode(self, final: bool) -> Any:
+        """Decode the JSON value at the current position, or return _missing.
+
+        A number is only complete once a delimiter follows it (or the body
+        ended): "1" might still be the beginning of "1.5".
+        """
+        try:
+            value, end = self._json.raw_decode(self._text, self._position)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return _missing
+        if (
+            not final
+            and isinstance(value, (int, float))
+            and self._text[end : end + 1] not in _delimiters
+        ):
+            return _missing
+        self._position = end
+        return value
+
+    def _unexpected(self, expected: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(f"Expecting {expected}", self._text, self._position)
+
+    def _step(self, results: List[Any], final: bool) -> bool:
+        state = self._state
+        char = self._next_char()
+        if not char:
+            return False
+
+        if state == _OBJECT_START:
+            if char != "{":
+                raise self._unexpected("'{'")
+            self._position += 1
+            self._state = _FIRST_KEY
+        elif state in (_KEY, _FIRST_KEY):
+            if state == _FIRST_KEY and char == "}":
+                self._position += 1
+                self._state = _END
+                return True
+            start = self._position
+            key = self._decode(final)
+            if key is _missing:
+                return False
+            if not isinstance(key, str):
+                self._position = start
+                raise self._unexpected("property name enclosed in double quotes")
+            if not self._next_char():
+                self._position = start
+                return False
+            if self._text[self._position] != ":":
+                raise self._unexpected("':' delimiter")
+            self._position += 1
+            self._key = key
+            self._state = _RESULTS if key == "results" else _VALUE
+        elif state == _RESULTS and char == "[":
+            self._position += 1
+            self._state = _FIRST_RESULT
+        elif state in (_VALUE, _RESULTS):
+            value = self._decode(final)
+            if value is _missing:
+                return False
+            self.fields[self._key] = value
+            self._state = _AFTER_VALUE
+        elif state == _AFTER_VALUE:
+            if char not in ",}":
+                raise self._unexpected("',' delimiter")
+            self._position += 1
+            self._state = _KEY if char == "," else _END
+        elif state in (_RESULT, _FIRST_RESULT):
+            if state == _FIRST_RESULT and char == "]":
+                self._position += 1
+                self._state = _AFTER_VALUE
+                return True
+            value = self._decode(final)
+            if value is _missing:
+                return False
+            results.append(value)
+            self._state = _AFTER_RESULT
+        elif state == _AFTER_RESULT:
+            if char not in ",]":
+                raise self._unexpected("',' delimiter")
+            self._position += 1
+            self._state = _RESULT if char == "," else _AFTER_VALUE
+        else:
+            raise json.JSONDecodeError("Extra data", self._text, self._position)
+        return True
+
+
+class BaseStreamedList:
+    def __init__(self, response: httpx.Response) -> None:
+        self.response = response
+        self._scanner = ResultsScanner()
+        self._pending: Deque[Any] = deque()
+
+    @property
+    def is_complete(self) -> bool:
+        """Whether the whole response has been read."""
+        return self._scanner.done
+
+    def _feed(self, chunk: bytes, final: bool) -> None:
+        self._pending.extend(self._scanner.feed(chunk, final))
+
+    def __contains__(self, key: str) -> bool:
+        return key == "results" or key in self._scanner.fields
+
+
+class StreamedList(BaseStreamedList):
+    """A list response whose results are decoded as they arrive.
+
+    `get("results")` returns an iterator over the result objects. The other
+    members of the response (`next_cursor`, `has_more`...) come after the
+    results, so they are available once the results have been iterated. Asking
+    for one earlier reads the rest of the response, keeping the results that
+    were not iterated yet for later.
+
+    The response is closed once it has been read to the end. Use the streamed
+    list as a context manager, or call `close()`, to stop reading early.
+    """
+
+    def __init__(self, response: httpx.Response) -> None:
+        super().__init__(response)
+        self._chunks = response.iter_bytes()
+
+    def _read(self) -> bool:
+        """Read and decode the next chunk, returning False at the end."""
+        if self._scanner.done:
+            return False
+        try:
+            chunk = next(self._chunks, None)
+            self._feed(chunk or b"", final=chunk is None)
+        except httpx.TimeoutException:
+            self.close()
+            raise RequestTimeoutError()
+        except BaseException:
+            self.close()
+            raise
+        if chunk is None:
+            self.close()
+        return True
+
+    def _results(self) -> Iterator[Any]:
+        while True:
+            while self._pending:
+                yield self._pending.popleft()
+            if not self._read():
+                return
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a member of the response, as `dict.get` would."""
+        if key == "results":
+            return self._results()
+        fields = self._scanner.fields
+        while key not in fields and self._read():
+            pass
+        return fields.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _missing)
+        if value is _missing:
+            raise KeyError(key)
+        return value
+
+    def close(self) -> None:
+        """Close the underlying response."""
+        self.response.close()
+
+    def __enter__(self) -> "StreamedList":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class AsyncStreamedList(BaseStreamedList):
+    """A list response whose results are decoded as they arrive (async).
+
+    `get("results")` returns an async iterator over the result objects. The
+    other members of the response are available once the results have been
+    iterated, or after `await aread()`, which reads the rest of the response
+    and keeps the results that were not iterated yet for later.
+    """
+
+    def __init__(self, response: httpx.Response) -> None:
+        super().__init__(response)
+        self._chunks = response.aiter_bytes()
+
+    async def _read(self) -> bool:
+        """Read and decode the next chunk, returning False at the end."""
+        if self._scanner.done:
+            return False
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            chunk = None
+        except httpx.TimeoutException:
+            await self.aclose()
+            raise RequestTimeoutError()
+        except BaseException:
+            await self.aclose()
+            raise
+        try:
+            self._feed(chunk or b"", final=chunk is None)
+        except BaseException:
+            await self.aclose()
+            raise
+        if chunk is None:
+            await self.aclose()
+        return True
+
+    async def _results(self) -> AsyncIterator[Any]:
+        while True:
+            while self._pending:
+                yield self._pending.popleft()
+            if not await self._read():
+                return
+
+    async def aread(self) -> None:
+        """Read the rest of the response."""
+        while await self._read():
+            pass
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a member of the response, as `dict.get` would.
+
+        Members other than `results` that were not read yet raise a
+        `RuntimeError`: iterate the results or `await aread()` first.
+        """
+        if key == "results":
+            return self._results()
+        fields = self._scanner.fields
+        if key not in fields and not self._scanner.done:
+            raise RuntimeError(
+                f"{key!r} has not been read yet: iterate the results first"
+            )
+        return fields.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _missing)
+        if value is _missing:
+            raise KeyError(key)
+        return value
+
+    async def aclose(self) -> None:
+        """Close the underlying response."""
+        await self.response.aclose()
+
+    async def __aenter__(self) -> "AsyncStreamedList":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
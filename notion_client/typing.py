@@ -1,5 +1,9 @@
 """Custom type definitions for notion-sdk-py."""
-from typing import Awaitable, TypeVar, Union
+from typing import Awaitable, Dict, Optional, TypeVar, Union
 
 T = TypeVar("T")
 SyncAsync = Union[T, Awaitable[T]]
+
+# Milliseconds for every phase of a request, or for some of "connect", "read",
+# "write" and "pool" (`None` to wait forever)
+TimeoutMs = Union[int, float, Dict[str, Optional[float]]]
@@ -18,7 +18,8 @@ from pytz.exceptions import NonExistentTimeError
 from pytz.exceptions import UnknownTimeZoneError
 from pytz.lazy import LazyDict, LazyList, LazySet  # noqa
 from pytz.tzinfo import unpickler, BaseTzInfo
-from pytz.tzfile import build_tzinfo
+from pytz.tzfile import build_tzinfo, build_frozen_tzinfo
+from pytz._frozen_zones import FROZEN_ZONES
 
 
 # The IANA (nee Olson) database is updated several times a year.
@@ -170,6 +171,14 @@ def timezone(zone):
     if zone.upper() == 'UTC':
         return utc
 
+    # Zones frozen into _frozen_zones are built from memory, skipping both the
+    # zoneinfo file and the all_timezones scan of the zoneinfo directory.
+    if zone in _tzinfo_cache:
+        return _tzinfo_cache[zone]
+    if zone in FROZEN_ZONES:
+        _tzinfo_cache[zone] = build_frozen_tzinfo(zone, FROZEN_ZONES[zone])
+        return _tzinfo_cache[zone]
+
     try:
         zone = ascii(zone)
     except UnicodeEncodeError:
@@ -1,5 +1,6 @@
 '''Base classes and helpers for building zone specific tzinfo classes'''
 
+from array import array
 from datetime import datetime, timedelta, tzinfo
 from bisect import bisect_right
 try:
@@ -59,6 +60,7 @@ def memorized_ttinfo(*args):
 
 
 _notime = memorized_timedelta(0)
+_one_day = memorized_timedelta(24 * 60 * 60)
 
 
 def _to_seconds(td):
@@ -66,6 +68,11 @@ def _to_seconds(td):
     return td.seconds + td.days * 24 * 60 * 60
 
 
+def _epoch_seconds(utc_dts):
+    '''POSIX timestamps of naive UTC datetimes, as an array of floats'''
+    return array('d', [(dt - _epoch).total_seconds() for dt in utc_dts])
+
+
 class BaseTzInfo(tzinfo):
     # Overridden in subclass
     _utcoffset = None
@@ -75,6 +82,29 @@ class BaseTzInfo(tzinfo):
     def __str__(self):
         return self.zone
 
+    def localize_many(self, dts, is_dst=False, epoch=False):
+        '''Convert naive times to local times, as localize() does each
+
+        With epoch=True, the POSIX timestamps of the local times are
+        returned instead, as an array of floats.
+        '''
+        localized = [self.localize(dt, is_dst) for dt in dts]
+        if epoch:
+            return array('d', [dt.timestamp() for dt in localized])
+        return localized
+
+    def normalize_many(self, dts, epoch=False):
+        '''Correct the timezone information of datetimes, as normalize()
+        does each
+
+        With epoch=True, the POSIX timestamps are returned instead, as an
+        array of floats.
+        '''
+        normalized = [self.normalize(dt) for dt in dts]
+        if epoch:
+            return array('d', [dt.timestamp() for dt in normalized])
+        return normalized
+
 
 class StaticTzInfo(BaseTzInfo):
     '''A timezone that has a constant offset from UTC
@@ -396,6 +426,106 @@ class DstTzInfo(BaseTzInfo):
             dates[utc_time] = local_dt
         return dates[[min, max][not is_dst](dates)]
 
+    def localize_many(self, dts, is_dst=False, epoch=False):
+        '''Convert naive times to local times, as localize() does each
+
+        The datetimes are sorted once and _utc_transition_times is walked
+        alongside them, instead of being bisected twice per datetime. Only
+        datetimes within a day of a transition go through localize() itself,
+        so is_dst, ambiguous and non-existent times are handled there.
+
+        With epoch=True, the POSIX timestamps of the local times are
+        returned instead, as an array of floats.
+
+        >>> from pytz import timezone
+        >>> amdam = timezone('Europe/Amsterdam')
+        >>> dts = [datetime(2004, 10, 31, 2, 0, 0), datetime(2004, 6, 1, 12)]
+        >>> [str(dt) for dt in amdam.localize_many(dts)]
+        ['2004-10-31 02:00:00+01:00', '2004-06-01 12:00:00+02:00']
+        >>> [str(dt) for dt in amdam.localize_many(dts, is_dst=True)]
+        ['2004-10-31 02:00:00+02:00', '2004-06-01 12:00:00+02:00']
+        >>> list(amdam.localize_many(dts, epoch=True))
+        [1099184400.0, 1086084000.0]
+        '''
+        dts = list(dts)
+        for dt in dts:
+            if dt.tzinfo is not None:
+                raise ValueError('Not naive datetime (tzinfo is already set)')
+
+        times = self._utc_transition_times
+        count = len(times)
+        localized = [None] * len(dts)
+        utc_dts = [None] * len(dts)
+        # bisect_right(times, dt - 1 day) and bisect_right(times, dt + 1 day)
+        # for the last datetime seen, which only move forwards
+        before = after = 0
+        for index in sorted(range(len(dts)), key=dts.__getitem__):
+            dt = dts[index]
+            try:
+                earliest = dt - _one_day
+                latest = dt + _one_day
+            except OverflowError:
+                # localize() raises the same error
+                earliest = latest = None
+            if earliest is not None:
+                while before < count and times[before] <= earliest:
+                    before += 1
+                while after < count and times[after] <= latest:
+                    after += 1
+            if earliest is None or max(0, before - 1) != max(0, after - 1):
+                loc_dt = self.localize(dt, is_dst)
+                utc_dts[index] = (
+                    loc_dt.replace(tzinfo=None) - loc_dt.tzinfo._utcoffset)
+            else:
+                # No transition within a day: the only possible offset is
+                # the one in force, and the time exists and is unambiguous.
+                inf = self._transition_info[max(0, before - 1)]
+                utc_dts[index] = utc_dt = dt - inf[0]
+                loc_dt = (utc_dt + inf[0]).replace(tzinfo=self._tzinfos[inf])
+            localized[index] = loc_dt
+
+        if epoch:
+            return _epoch_seconds(utc_dts)
+        return localized
+
+    def normalize_many(self, dts, epoch=False):
+        '''Correct the timezone information of datetimes, as normalize()
+        does each
+
+        The datetimes are converted to UTC, sorted once and matched against
+        _utc_transition_times in a single pass.
+
+        With epoch=True, the POSIX timestamps are returned instead, as an
+        array of floats.
+
+        >>> from pytz import timezone
+        >>> eastern = timezone('US/Eastern')
+        >>> loc_dt = eastern.localize(datetime(2002, 10, 27, 1, 0, 0), False)
+        >>> before = loc_dt - timedelta(minutes=10)
+        >>> [str(dt) for dt in eastern.normalize_many([loc_dt, before])]
+        ['2002-10-27 01:00:00-05:00', '2002-10-27 01:50:00-04:00']
+        '''
+        utc_dts = []
+        for dt in dts:
+            if dt.tzinfo is None:
+                raise ValueError('Naive time - no tzinfo set')
+            utc_dts.append(dt.replace(tzinfo=None) - dt.tzinfo._utcoffset)
+        if epoch:
+            return _epoch_seconds(utc_dts)
+
+        times = self._utc_transition_times
+        count = len(times)
+        normalized = [None] * len(utc_dts)
+        position = 0
+        for index in sorted(range(len(utc_dts)), key=utc_dts.__getitem__):
+            utc_dt = utc_dts[index]
+            while position < count and times[position] <= utc_dt:
+                position += 1
+            inf = self._transition_info[max(0, position - 1)]
+            normalized[index] = (utc_dt + inf[0]).replace(
+                tzinfo=self._tzinfos[inf])
+        return normalized
+
     def utcoffset(self, dt, is_dst=None):
         '''See datetime.tzinfo.utcoffset
 